@@ -0,0 +1,189 @@
+# Copyright (c) 2021, QuantStack and ipycytoscape Contributors
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""Helpers shared by the benchmarks."""
+
+import json
+
+from ipykernel.comm import Comm
+from ipywidgets import Widget
+from ipywidgets import comm as widget_comm
+
+from ipycytoscape import Edge, Graph, Node
+
+SIZES = [10**3, 10**4, 10**5, 10**6]
+# benchmarks whose input is made of widgets stop short of a million
+# elements, which would take about 5 GB
+WIDGET_SIZES = SIZES[:-1]
+
+
+class CountingComm(Comm):
+    """
+    A comm that doesn't send anything but counts the messages it would have
+    sent, and their size in bytes, across all comms. Opening a comm counts
+    as a message.
+    """
+
+    comm_id = "a-b-c-d"
+    kernel = "Truthy"
+    messages = 0
+    bytes = 0
+
+    def open(self, data=None, metadata=None, buffers=None):
+        # widgets send their whole state when opening their comm
+        self.send(data, metadata, buffers)
+
+    def send(self, data=None, metadata=None, buffers=None):
+        CountingComm.messages += 1
+        CountingComm.bytes += len(json.dumps(data, default=str))
+        CountingComm.bytes += sum(memoryview(b).nbytes for b in buffers or ())
+
+    def close(self, *args, **kwargs):
+        pass
+
+    @classmethod
+    def reset(cls):
+        cls.messages = 0
+        cls.bytes = 0
+
+
+def patch_comms():
+    """
+    Makes new widgets use a CountingComm, as if they were in a kernel with a
+    frontend. Returns a function undoing it.
+    """
+    comm_default = Widget.__dict__.get("_comm_default")
+    create_comm = getattr(widget_comm, "create_comm", None)
+    Widget._comm_default = lambda self: CountingComm()
+    widget_comm.create_comm = lambda *args, **kwargs: CountingComm(*args, **kwargs)
+
+    def undo():
+        if comm_default is None:
+            del Widget._comm_default
+        else:
+            Widget._comm_default = comm_default
+        if create_comm is None:
+            del widget_comm.create_comm
+        else:
+            widget_comm.create_comm = create_comm
+
+    return undo
+
+
+def displayed_graph():
+    """A Graph that behaves as if a frontend displays it."""
+    graph = Graph()
+    graph._handle_custom_msg({"name": "materialize"}, [])
+    return graph
+
+
+def ring(n):
+    """Pairs of node ids connecting n nodes in a ring."""
+    return [(str(i), str((i + 1) % n)) for i in range(n)]
+
+
+def node_widgets(n):
+    return [Node(data={"id": str(i), "weight": i}) for i in range(n)]
+
+
+def edge_widgets(n):
+    return [
+        Edge(data={"source": source, "target": target}) for source, target in ring(n)
+    ]
+
+
+def graph_json(n):
+    return {
+        "nodes": [{"data": {"id": str(i), "weight": i}} for i in range(n)],
+        "edges": [
+            {"data": {"source": source, "target": target}} for source, target in ring(n)
+        ],
+    }
+
+
+def write_ndjson(file_path, n):
+    elements = graph_json(n)
+    with open(file_path, "w") as f:
+        for group in ("nodes", "edges"):
+            for element in elements[group]:
+                f.write(json.dumps({"group": group, **element}) + "\n")
+
+
+class FakeNeo4jNode(dict):
+    """Stand-in for a py2neo Node: a dict of properties with labels."""
+
+    def __init__(self, identity, labels, **properties):
+        super().__init__(properties)
+        self.identity = identity
+        self.labels = labels
+
+
+class KNOWS(dict):
+    """Stand-in for a py2neo relationship, its type is the class name."""
+
+    def __init__(self, identity, start_node, end_node, **properties):
+        super().__init__(properties)
+        self.identity = identity
+        self.start_node = start_node
+        self.end_node = end_node
+
+
+class FakeNeo4jSubgraph:
+    def __init__(self, nodes, relationships):
+        self.nodes = nodes
+        self.relationships = relationships
+
+
+def neo4j_subgraph(n):
+    nodes = [
+        FakeNeo4jNode(i, ["Person", "Actor" if i % 2 else "Director"], name=str(i))
+        for i in range(n)
+    ]
+    relationships = [KNOWS(i, nodes[i], nodes[(i + 1) % n], since=i) for i in range(n)]
+    return FakeNeo4jSubgraph(nodes, relationships)
+
+
+class _GraphBenchmark:
+    """
+    Base class of the benchmarks of one graph operation. Subclasses prepare
+    the graph and input in ``prepare`` and run the operation in ``run``,
+    which is timed, measured for peak memory and for the messages that the
+    widgets send to the frontend. asv skips classes starting with an
+    underscore, so that the base classes aren't run as benchmarks.
+    """
+
+    params = [SIZES]
+    param_names = ["n"]
+    # every sample needs a fresh graph
+    number = 1
+    repeat = (1, 5, 60.0)
+    timeout = 600
+
+    def setup(self, *params):
+        self.undo_patch = patch_comms()
+        self.prepare(*params)
+        CountingComm.reset()
+
+    def teardown(self, *params):
+        self.undo_patch()
+
+    def time_run(self, *params):
+        self.run()
+
+    def peakmem_run(self, *params):
+        self.run()
+
+    def track_messages(self, *params):
+        self.run()
+        return CountingComm.messages
+
+    track_messages.unit = "messages"
+
+    def track_bytes(self, *params):
+        self.run()
+        return CountingComm.bytes
+
+    track_bytes.unit = "bytes"
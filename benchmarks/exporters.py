@@ -0,0 +1,79 @@
+# Copyright (c) 2021, QuantStack and ipycytoscape Contributors
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""
+Benchmarks of the Graph exporters. The "loop" variants do the same work by
+walking the element widgets, the way it had to be done without them.
+"""
+
+import networkx as nx
+import pandas as pd
+
+from ipycytoscape import Graph
+
+from .common import SIZES, WIDGET_SIZES, _GraphBenchmark, graph_json
+
+
+class _Exporter(_GraphBenchmark):
+    """Exports a ring of n nodes made by an importer."""
+
+    params = [WIDGET_SIZES, ["exporter", "loop"]]
+    param_names = ["n", "how"]
+
+    def prepare(self, n, how):
+        self.graph = Graph()
+        self.graph.add_graph_from_json(graph_json(n))
+        self.run = getattr(self, how)
+
+
+class ToNetworkx(_Exporter):
+    def exporter(self):
+        self.graph.to_networkx()
+
+    def loop(self):
+        g = nx.Graph()
+        for node in self.graph.nodes:
+            attributes = {k: v for k, v in node.data.items() if k != "id"}
+            g.add_node(node.data["id"], classes=node.classes, **attributes)
+        for edge in self.graph.edges:
+            g.add_edge(edge.data["source"], edge.data["target"], classes=edge.classes)
+
+
+class ToJSON(_Exporter):
+    def exporter(self):
+        self.graph.to_json()
+
+    def loop(self):
+        {
+            "nodes": [
+                {"data": dict(node.data), "classes": node.classes}
+                for node in self.graph.nodes
+            ],
+            "edges": [
+                {"data": dict(edge.data), "classes": edge.classes}
+                for edge in self.graph.edges
+            ],
+        }
+
+
+class ToDataFrame(_Exporter):
+    def exporter(self):
+        self.graph.to_dataframe()
+
+    def loop(self):
+        pd.DataFrame(
+            [{"classes": node.classes, **node.data} for node in self.graph.nodes]
+        )
+        pd.DataFrame(
+            [{"classes": edge.classes, **edge.data} for edge in self.graph.edges]
+        )
+
+
+class ToSparse(_Exporter):
+    params = [SIZES, ["exporter"]]
+
+    def exporter(self):
+        self.graph.to_sparse()
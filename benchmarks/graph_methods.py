@@ -0,0 +1,175 @@
+# Copyright (c) 2021, QuantStack and ipycytoscape Contributors
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""Benchmarks of the methods editing a Graph."""
+
+import numpy as np
+
+from ipycytoscape import CytoscapeWidget, Graph
+
+from .common import (
+    SIZES,
+    WIDGET_SIZES,
+    _GraphBenchmark,
+    displayed_graph,
+    edge_widgets,
+    graph_json,
+    node_widgets,
+)
+
+
+class AddNodes(_GraphBenchmark):
+    params = [WIDGET_SIZES, [False, True]]
+    param_names = ["n", "displayed"]
+
+    def prepare(self, n, displayed):
+        self.graph = displayed_graph() if displayed else Graph()
+        self.nodes = node_widgets(n)
+
+    def run(self):
+        self.graph.add_nodes(self.nodes)
+
+
+class AddEdges(_GraphBenchmark):
+    params = [WIDGET_SIZES, [False, True], [False, True]]
+    param_names = ["n", "directed", "multiple_edges"]
+
+    def prepare(self, n, directed, multiple_edges):
+        self.graph = Graph()
+        self.edges = edge_widgets(n)
+        self.directed = directed
+        self.multiple_edges = multiple_edges
+
+    def run(self):
+        self.graph.add_edges(self.edges, self.directed, self.multiple_edges)
+
+
+class _ImportedGraph(_GraphBenchmark):
+    """Operations on a ring of n nodes made by an importer."""
+
+    def prepare(self, n):
+        self.n = n
+        self.graph = Graph()
+        self.graph.add_graph_from_json(graph_json(n))
+
+
+class RemoveNode(_ImportedGraph):
+    """
+    Removing 100 nodes of a ring, or 100 leaves of a star whose hub is
+    connected to every other node.
+    """
+
+    params = [SIZES, ["ring", "star"]]
+    param_names = ["n", "shape"]
+
+    def prepare(self, n, shape):
+        if shape == "ring":
+            super().prepare(n)
+            return
+        self.n = n
+        self.graph = Graph()
+        self.graph.add_graph_from_json(
+            {
+                "nodes": [{"data": {"id": str(i)}} for i in range(n)],
+                "edges": [
+                    {"data": {"source": "0", "target": str(i)}} for i in range(1, n)
+                ],
+            }
+        )
+
+    def run(self):
+        for i in range(1, self.n, self.n // 100):
+            self.graph.remove_node_by_id(str(i))
+
+
+class RemoveEdgeById(_ImportedGraph):
+    def run(self):
+        for i in range(0, self.n, self.n // 100):
+            self.graph.remove_edge_by_id(str(i), str(i + 1))
+
+
+class Clear(_ImportedGraph):
+    def run(self):
+        self.graph.clear()
+
+
+class Materialize(_ImportedGraph):
+    """Creating the widgets of imported elements, e.g. on display."""
+
+    params = [WIDGET_SIZES]
+
+    def run(self):
+        self.graph.nodes
+
+
+class UpsertNodes(_GraphBenchmark):
+    """
+    Updating the data of every node of a displayed graph, with upsert_nodes
+    or node by node on the widgets.
+    """
+
+    params = [WIDGET_SIZES, ["upsert", "loop"]]
+    param_names = ["n", "how"]
+
+    def prepare(self, n, how):
+        self.graph = displayed_graph()
+        self.graph.add_graph_from_json(graph_json(n))
+        self.updates = [{"data": {"id": str(i), "score": i / n}} for i in range(n)]
+        self.run = getattr(self, how)
+
+    def upsert(self):
+        self.graph.upsert_nodes(self.updates)
+
+    def loop(self):
+        nodes = {node.data["id"]: node for node in self.graph.nodes}
+        for update in self.updates:
+            nodes[update["data"]["id"]].data.update(update["data"])
+
+
+class SetPositions(_GraphBenchmark):
+    """
+    Moving every node of a displayed graph, with set_positions or node by
+    node on the widgets.
+    """
+
+    params = [WIDGET_SIZES, ["array", "loop"]]
+    param_names = ["n", "how"]
+
+    def prepare(self, n, how):
+        graph = displayed_graph()
+        graph.add_graph_from_json(graph_json(n))
+        self.widget = CytoscapeWidget(graph)
+        self.ids = np.arange(n).astype(str)
+        self.xy = np.random.rand(n, 2)
+        self.run = getattr(self, how)
+
+    def array(self):
+        self.widget.set_positions(self.ids, self.xy)
+
+    def loop(self):
+        for node, (x, y) in zip(self.widget.graph.nodes, self.xy.tolist()):
+            node.position = {"x": x, "y": y}
+
+
+class UpdateNodeData(_GraphBenchmark):
+    """Changing one data key of every node of a displayed graph."""
+
+    params = [WIDGET_SIZES]
+
+    def prepare(self, n):
+        graph = displayed_graph()
+        graph.add_graph_from_json(
+            {
+                "nodes": [
+                    {"data": {"id": str(i), "tooltip": "x" * 1000}} for i in range(n)
+                ]
+            }
+        )
+        self.nodes = graph.nodes
+
+    def run(self):
+        for i, node in enumerate(self.nodes):
+            node.data["score"] = i
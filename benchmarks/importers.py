@@ -0,0 +1,259 @@
+# Copyright (c) 2021, QuantStack and ipycytoscape Contributors
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""Benchmarks of the Graph importers."""
+
+import asyncio
+import json
+import os
+import tempfile
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import scipy.sparse
+
+from ipycytoscape import ArrayGraph, Graph
+
+from .common import (
+    SIZES,
+    FakeNeo4jSubgraph,
+    _GraphBenchmark,
+    graph_json,
+    neo4j_subgraph,
+    write_ndjson,
+)
+
+
+class _Importer(_GraphBenchmark):
+    """Imports into an empty graph the input made by ``prepare_input``."""
+
+    def prepare(self, n):
+        self.graph = Graph()
+        self.prepare_input(n)
+
+
+class _FileImporter(_Importer):
+    def setup(self, *params):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        super().setup(*params)
+
+    def teardown(self, *params):
+        super().teardown(*params)
+        self.tmp_dir.cleanup()
+
+    def file_path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+
+class FromNetworkx(_Importer):
+    def prepare_input(self, n):
+        self.g = nx.cycle_graph(n)
+
+    def run(self):
+        self.graph.add_graph_from_networkx(self.g)
+
+
+class FromMultiDiGraph(_Importer):
+    params = [SIZES, [None, 4]]
+    param_names = ["n", "processes"]
+
+    def prepare(self, n, processes):
+        super().prepare(n)
+        self.processes = processes
+
+    def prepare_input(self, n):
+        self.g = nx.MultiDiGraph(nx.gnm_random_graph(n, 2 * n, seed=0, directed=True))
+        self.g.add_edges_from(list(self.g.edges())[: n // 10])
+
+    def run(self):
+        self.graph.add_graph_from_networkx(self.g, processes=self.processes)
+
+
+class FromJSON(_Importer):
+    def prepare_input(self, n):
+        self.elements = graph_json(n)
+
+    def run(self):
+        self.graph.add_graph_from_json(self.elements)
+
+
+class FromAsyncIterable(_Importer):
+    params = [SIZES, [0, 0.1]]
+    param_names = ["n", "flush_interval"]
+
+    def prepare(self, n, flush_interval):
+        super().prepare(n)
+        self.flush_interval = flush_interval
+
+    def prepare_input(self, n):
+        elements = graph_json(n)
+        self.elements = [{"group": "nodes", **node} for node in elements["nodes"]]
+        self.elements += [{"group": "edges", **edge} for edge in elements["edges"]]
+
+    async def source(self):
+        for element in self.elements:
+            yield element
+
+    def run(self):
+        asyncio.run(
+            self.graph.add_from_async_iterable(
+                self.source(), flush_interval=self.flush_interval
+            )
+        )
+
+
+class FromJSONFile(_FileImporter):
+    params = [SIZES, [None, 10**4]]
+    param_names = ["n", "chunk_size"]
+
+    def prepare(self, n, chunk_size):
+        super().prepare(n)
+        self.chunk_size = chunk_size
+
+    def prepare_input(self, n):
+        self.path = self.file_path("graph.json")
+        with open(self.path, "w") as f:
+            json.dump(graph_json(n), f)
+
+    def run(self):
+        self.graph.add_graph_from_json(self.path, chunk_size=self.chunk_size)
+
+
+class FromNDJSON(_FileImporter):
+    def prepare_input(self, n):
+        self.path = self.file_path("graph.ndjson")
+        write_ndjson(self.path, n)
+
+    def run(self):
+        self.graph.add_graph_from_json(self.path)
+
+
+class FromEdgeList(_FileImporter):
+    def prepare_input(self, n):
+        self.path = self.file_path("graph.edgelist")
+        with open(self.path, "w") as f:
+            for i in range(n):
+                f.write(f"{i} {(i + 1) % n} {i / n}\n")
+
+    def run(self):
+        self.graph.add_graph_from_edgelist(self.path, names=["source", "target", "w"])
+
+
+class FromGraphML(_FileImporter):
+    """Streams the file, or reads it with networkx first as it used to be."""
+
+    params = [SIZES, ["stream", "networkx"]]
+    param_names = ["n", "how"]
+
+    def prepare(self, n, how):
+        super().prepare(n)
+        self.how = how
+
+    def prepare_input(self, n):
+        self.path = self.file_path("graph.graphml")
+        g = nx.cycle_graph(n)
+        nx.set_node_attributes(g, {i: i / n for i in range(n)}, "score")
+        nx.write_graphml(g, self.path)
+
+    def run(self):
+        if self.how == "stream":
+            self.graph.add_graph_from_graphml(self.path)
+        else:
+            self.graph.add_graph_from_networkx(nx.read_graphml(self.path))
+
+
+class FromGEXF(_FileImporter):
+    def prepare_input(self, n):
+        self.path = self.file_path("graph.gexf")
+        nx.write_gexf(nx.cycle_graph(n), self.path)
+
+    def run(self):
+        self.graph.add_graph_from_gexf(self.path)
+
+
+class FromDataFrame(_Importer):
+    def prepare_input(self, n):
+        self.df = pd.DataFrame(
+            {"name": [str(i) for i in range(n)], "group": [i % 10 for i in range(n)]}
+        )
+
+    def run(self):
+        self.graph.add_graph_from_df(
+            self.df, groupby_cols=["group"], attribute_list=["name"]
+        )
+
+
+class _ArrowImporter(_Importer):
+    def prepare_input(self, n):
+        ids = np.arange(n).astype(str)
+        self.nodes = pa.table(
+            {"id": ids, "group": np.arange(n) % 10, "score": np.random.rand(n)}
+        )
+        self.edges = pa.table(
+            {"source": ids, "target": np.roll(ids, 1), "weight": np.random.rand(n)}
+        )
+
+
+class FromArrow(_ArrowImporter):
+    def run(self):
+        self.graph.add_graph_from_arrow(self.nodes, self.edges)
+
+
+class ArrayGraphFromArrow(_ArrowImporter):
+    def run(self):
+        ArrayGraph.from_arrow(self.nodes, self.edges)
+
+
+class FromSparse(_Importer):
+    """A random directed multigraph with 5 edges per node."""
+
+    def prepare_input(self, n):
+        rng = np.random.default_rng(0)
+        self.matrix = scipy.sparse.csr_array(
+            (
+                rng.integers(1, 3, 5 * n),
+                (rng.integers(0, n, 5 * n), rng.integers(0, n, 5 * n)),
+            ),
+            shape=(n, n),
+        )
+
+    def run(self):
+        self.graph.add_graph_from_sparse(self.matrix, directed=True)
+
+
+class FromNeo4j(_Importer):
+    def prepare_input(self, n):
+        self.subgraph = neo4j_subgraph(n)
+
+    def run(self):
+        self.graph.add_graph_from_neo4j(self.subgraph)
+
+
+class FromNeo4jCursor(_Importer):
+    """Consumes one subgraph per relationship, like the records of a cursor."""
+
+    def prepare_input(self, n):
+        subgraph = neo4j_subgraph(n)
+        self.records = [
+            FakeNeo4jSubgraph([rel.start_node, rel.end_node], [rel])
+            for rel in subgraph.relationships
+        ]
+
+    def run(self):
+        self.graph.add_graph_from_neo4j(iter(self.records))
+
+
+class Load(_FileImporter):
+    def prepare_input(self, n):
+        self.path = self.file_path("graph.cyto")
+        source = Graph()
+        source.add_graph_from_json(graph_json(n))
+        source.save(self.path)
+
+    def run(self):
+        Graph.load(self.path)
@@ -10,10 +10,12 @@ from ._version import __version__, version_info
 from .cytoscape import (
     MONITORED_USER_INTERACTIONS,
     MONITORED_USER_TYPES,
+    ArrayGraph,
     CytoscapeWidget,
     Edge,
     Graph,
     Node,
+    register_serializer,
 )
 from .nbextension import _jupyter_nbextension_paths
 
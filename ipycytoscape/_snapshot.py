@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2021, QuantStack and ipycytoscape Contributors
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""
+Compact columnar snapshots of graphs, used by ``Graph.save``/``Graph.load``.
+
+A snapshot file is made of a magic string, the length of a JSON header and
+the header itself, followed by the raw column buffers, each aligned to 64
+bytes so they can be memory-mapped and viewed as NumPy arrays in place. The
+header describes a table of columns for the nodes and one for the edges.
+Columns are either numeric arrays, or strings stored as offsets into a
+UTF-8 blob. Values that are neither are stored as JSON strings. Columns with
+missing values carry a mask of the rows that have one.
+"""
+
+import json
+import struct
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+MAGIC = b"IPYCYTO\x01"
+_ALIGNMENT = 64
+_HEADER_LENGTH = struct.Struct("<Q")
+
+# marks the rows of a column that don't have a value
+MISSING = object()
+
+
+class StringColumn:
+    """A column of strings (or JSON values) decoded on access."""
+
+    def __init__(self, offsets, blob, is_json=False):
+        self._offsets = offsets
+        self._blob = blob
+        self.is_json = is_json
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def tolist(self):
+        blob = self._blob.tobytes()
+        offsets = self._offsets.tolist()
+        text = blob.decode("utf-8")
+        if len(text) == len(blob):
+            # ASCII only: the byte offsets are also offsets into the text
+            values = [text[start:end] for start, end in zip(offsets, offsets[1:])]
+        else:
+            values = [
+                blob[start:end].decode("utf-8")
+                for start, end in zip(offsets[:-1], offsets[1:])
+            ]
+        if self.is_json:
+            return [json.loads(value) for value in values]
+        return values
+
+
+def _infer_kind(values):
+    present = [value for value in values if value is not MISSING]
+    types = set(map(type, present))
+    if types and types <= {bool, np.bool_}:
+        return "bool"
+    if types and types <= {int, np.int64, np.int32}:
+        if all(-(2**63) <= value < 2**63 for value in present):
+            return "int"
+    if types and types <= {float, np.float64, np.float32}:
+        return "float"
+    if types <= {str, np.str_}:
+        return "str"
+    return "json"
+
+
+def _encode_column(values):
+    """Returns (description, buffers) for a list of values or a NumPy array."""
+    if isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+        return {"kind": "array", "dtype": values.dtype.newbyteorder("<").str}, [
+            np.ascontiguousarray(values, dtype=values.dtype.newbyteorder("<"))
+        ]
+    if isinstance(values, np.ndarray):
+        values = values.tolist()
+
+    mask = None
+    if any(value is MISSING for value in values):
+        mask = np.array([value is not MISSING for value in values], dtype="<u1")
+    kind = _infer_kind(values)
+    if kind in ("str", "json"):
+        filler = "" if kind == "str" else "null"
+        if kind == "json":
+            values = [
+                filler if value is MISSING else json.dumps(value) for value in values
+            ]
+        encoded = [
+            filler.encode("utf-8") if value is MISSING else value.encode("utf-8")
+            for value in values
+        ]
+        offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        description = {"kind": kind}
+        buffers = [offsets, np.frombuffer(b"".join(encoded), dtype="<u1")]
+    else:
+        dtype = {"bool": "<u1", "int": "<i8", "float": "<f8"}[kind]
+        description = {"kind": "array", "dtype": "|b1" if kind == "bool" else dtype}
+        array = np.array(
+            [0 if value is MISSING else value for value in values], dtype=dtype
+        )
+        buffers = [array.view("|b1") if kind == "bool" else array]
+    if mask is not None:
+        description["masked"] = True
+        buffers.append(mask)
+    return description, buffers
+
+
+def write(file_path, tables):
+    """
+    Writes a snapshot.
+
+    Parameters
+    ----------
+    file_path : str or path-like
+    tables : dict
+        ``{table_name: (length, {column_name: values})}`` where values is a
+        NumPy array or a list using ``MISSING`` for absent values.
+    """
+    header = {"version": 1, "tables": {}}
+    buffers = []
+    offset = 0
+    for table_name, (length, columns) in tables.items():
+        table = header["tables"][table_name] = {"length": length, "columns": {}}
+        for column_name, values in columns.items():
+            description, column_buffers = _encode_column(values)
+            description["buffers"] = []
+            for buffer in column_buffers:
+                description["buffers"].append([buffer.dtype.str, offset, len(buffer)])
+                buffers.append((offset, buffer))
+                offset += -(-buffer.nbytes // _ALIGNMENT) * _ALIGNMENT
+            table["columns"][column_name] = description
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    start = len(MAGIC) + _HEADER_LENGTH.size + len(header_bytes)
+    start = -(-start // _ALIGNMENT) * _ALIGNMENT
+    with open(file_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(header_bytes)))
+        f.write(header_bytes)
+        for buffer_offset, buffer in buffers:
+            f.seek(start + buffer_offset)
+            f.write(buffer.tobytes())
+        f.truncate(start + offset)
+
+
+def read(file_path):
+    """
+    Memory-maps a snapshot.
+
+    Returns
+    -------
+    dict
+        ``{table_name: (length, {column_name: (values, mask)})}`` where values
+        is a read only NumPy array backed by the file or a StringColumn, and
+        mask is None or a boolean array of the rows that have a value.
+    """
+    with open(file_path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{file_path} is not an ipycytoscape graph snapshot.")
+        (header_length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+        header = json.loads(f.read(header_length).decode("utf-8"))
+    start = len(MAGIC) + _HEADER_LENGTH.size + header_length
+    start = -(-start // _ALIGNMENT) * _ALIGNMENT
+    data = np.memmap(file_path, mode="r", dtype="u1")
+
+    def view(dtype, offset, length):
+        dtype = np.dtype(dtype)
+        buffer = data[start + offset : start + offset + length * dtype.itemsize]
+        return buffer.view(dtype)
+
+    tables = {}
+    for table_name, table in header["tables"].items():
+        columns = {}
+        for column_name, description in table["columns"].items():
+            buffers = [view(*buffer) for buffer in description["buffers"]]
+            mask = buffers.pop().view(bool) if description.get("masked") else None
+            if description["kind"] == "array":
+                values = buffers[0]
+            else:
+                values = StringColumn(*buffers, is_json=description["kind"] == "json")
+            columns[column_name] = (values, mask)
+        tables[table_name] = (table["length"], columns)
+    return tables
+
+
+def column_lists(table):
+    """
+    Returns ``{column_name: (values, present)}`` for a table, where values
+    is a list and present is None or a list of whether each row has a value.
+    """
+    _length, columns = table
+    return {
+        name: (values.tolist(), None if mask is None else mask.tolist())
+        for name, (values, mask) in columns.items()
+    }
@@ -6,9 +6,20 @@
 #
 # The full license is in the file LICENSE, distributed with this software.
 
+import asyncio
 import copy
+import csv
+import datetime
+import gc
 import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from decimal import Decimal
+from functools import partial
+from itertools import chain, islice
 from os import path
+from xml.etree.ElementTree import iterparse
 
 from ipywidgets import CallbackDispatcher, DOMWidget, Widget, widget_serialization
 from spectate import mvc
@@ -26,8 +37,21 @@ from traitlets import (
     Union,
 )
 
+from . import _snapshot
 from ._frontend import module_name, module_version
 
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ModuleNotFoundError:
+    _json_loads = json.loads
+
 try:
     import networkx as nx
 except ModuleNotFoundError:
@@ -39,6 +63,18 @@ try:
 except ModuleNotFoundError:
     pd = None
 
+try:
+    import pyarrow as pa
+
+except ModuleNotFoundError:
+    pa = None
+
+try:
+    import scipy.sparse
+
+except ModuleNotFoundError:
+    scipy = None
+
 try:
     import py2neo
 
@@ -56,6 +92,7 @@ __all__ = [
     "Node",
     "Edge",
     "Graph",
+    "ArrayGraph",
     "CytoscapeWidget",
 ]
 
@@ -144,25 +181,142 @@ interaction_serialization = {
 }
 
 
+def _column_to_json(column):
+    """Serializes a single NumPy column into a binary buffer description."""
+    if column.dtype.kind in "USOM":
+        values = column.tolist() if column.dtype.kind == "U" else list(map(str, column))
+        text = "".join(values)
+        blob = text.encode("utf-8")
+        offsets = np.zeros(len(values) + 1, dtype="<u4")
+        if len(blob) == len(text):
+            # ASCII only: the lengths in characters are the lengths in bytes
+            np.cumsum(
+                np.fromiter(map(len, values), "<u4", len(values)), out=offsets[1:]
+            )
+        else:
+            np.cumsum([len(value.encode("utf-8")) for value in values], out=offsets[1:])
+        return {
+            "dtype": "str",
+            "offsets": memoryview(offsets),
+            "buffer": memoryview(blob),
+        }
+    if column.dtype.kind == "b":
+        return {"dtype": "bool", "buffer": memoryview(column.astype("<u1"))}
+    # javascript has no typed array for 64 bit integers that cytoscape.js
+    # understands, and none at all for half floats
+    if column.dtype.kind in "iu" and column.dtype.itemsize > 4:
+        column = column.astype("<f8")
+    elif column.dtype.kind == "f" and column.dtype.itemsize < 4:
+        column = column.astype("<f4")
+    column = np.ascontiguousarray(column, dtype=column.dtype.newbyteorder("<"))
+    return {"dtype": column.dtype.name, "buffer": memoryview(column)}
+
+
+def _columns_to_json(columns, _widget):
+    return {
+        name: (
+            {k: _column_to_json(v) for k, v in column.items()}
+            if name == "data"
+            else _column_to_json(column)
+        )
+        for name, column in columns.items()
+    }
+
+
+def _columns_from_json(js, widget):
+    raise ValueError(
+        "Do not set the columns of an ArrayGraph from the client. "
+        "Widget %s received JSON: %s" % (widget, js)
+    )
+
+
+column_serialization = {
+    "to_json": _columns_to_json,
+    "from_json": _columns_from_json,
+}
+
+
+def _notify_mutable(obj, name, event_type="change"):
+    """
+    Notifies a change of a mutable trait, unless notifications are being
+    held by a batch, in which case the change is emitted when it ends.
+    """
+    held = getattr(obj, "_held_mutable_changes", None)
+    if held is not None:
+        held.add(name)
+    else:
+        change = dict(
+            new=getattr(obj, name),
+            name=name,
+            type=event_type,
+        )
+        obj.notify_change(change)
+
+
+def _send_mutable_patch(obj, name, events):
+    """
+    Sends the keys of a mutable dict trait changed by events to the frontend
+    as a "patch" message of the changed and deleted keys, and notifies the
+    change without syncing the whole dict. Returns False, without sending
+    anything, when the change has to be synced as usual.
+    """
+    comm = getattr(obj, "comm", None)
+    if (
+        comm is None
+        or getattr(comm, "kernel", True) is None
+        or obj._holding_sync
+        or name in obj._property_lock
+        or getattr(obj, "_held_mutable_changes", None) is not None
+    ):
+        return False
+    changed = dict()
+    deleted = dict()
+    for event in events:
+        if event["new"] is mvc.Undefined:
+            changed.pop(event["key"], None)
+            deleted[event["key"]] = None
+        else:
+            deleted.pop(event["key"], None)
+            changed[event["key"]] = event["new"]
+    obj.send({"name": "patch", "trait": name, "set": changed, "unset": list(deleted)})
+    obj._patched_trait = name
+    try:
+        _notify_mutable(obj, name)
+    finally:
+        obj._patched_trait = None
+    return True
+
+
 class Mutable(TraitType):
-    """A base class for mutable traits using Spectate"""
+    """
+    A base class for mutable traits using Spectate. Changes to the keys of
+    a dict trait tagged with patch=True are sent as patches rather than as
+    a whole, see _send_mutable_patch.
+    """
 
     _model_type = None
     _event_type = "change"
 
     def instance_init(self, obj):
-        default = self._model_type()
-
-        @mvc.view(default)
-        def callback(default, events):
-            change = dict(
-                new=getattr(obj, self.name),
-                name=self.name,
-                type=self._event_type,
-            )
-            obj.notify_change(change)
+        setattr(obj, self.name, self._model_type())
 
-        setattr(obj, self.name, default)
+    def validate(self, obj, value):
+        # assigned values are copied into a model that is watched for changes,
+        # so that e.g. Node(data={...}) is synced like the default value
+        model = self._model_type(value)
+
+        @mvc.view(model)
+        def callback(model, events):
+            # models that were replaced since are no longer synced
+            if obj._trait_values.get(self.name) is not model:
+                return
+            if self.metadata.get("patch") and _send_mutable_patch(
+                obj, self.name, events
+            ):
+                return
+            _notify_mutable(obj, self.name, self._event_type)
+
+        return model
 
 
 class MutableDict(Mutable):
@@ -189,7 +343,8 @@ class Element(Widget):
     selected = Bool().tag(sync=True)
     selectable = Bool().tag(sync=True)
     classes = Unicode().tag(sync=True)
-    data = MutableDict().tag(sync=True)
+    # changing keys of the data only sends the changed keys
+    data = MutableDict().tag(sync=True, patch=True)
     pannable = Bool().tag(sync=True)
     _base_cyto_attrs = [
         "removed",
@@ -199,6 +354,13 @@ class Element(Widget):
         "data",
         "pannable",
     ]
+    # the trait whose change is being notified after being sent as a patch
+    _patched_trait = None
+
+    def _should_send_property(self, key, value):
+        if key == self._patched_trait:
+            return False
+        return super()._should_send_property(key, value)
 
 
 class Edge(Element):
@@ -236,13 +398,775 @@ class Node(Element):
     _cyto_attrs = ["position", "locked", "grabbable"]
 
 
+class _ElementRecord:
+    """
+    Compact record of a node or edge, which the Graph uses for its
+    bookkeeping. The importers create these instead of widgets, and the Node
+    or Edge widget of an element is only created once the elements of the
+    graph are accessed or displayed. The widget is then a view of the record:
+    changes of its data or classes are written back to the record.
+    """
+
+    __slots__ = ("data", "classes", "attrs", "widget")
+    _widget_class = None
+
+    def __init__(self, data=None, classes="", attrs=None):
+        self.data = dict() if data is None else data
+        self.classes = classes
+        # other attributes of the element, e.g. position, None when unset
+        self.attrs = attrs
+        self.widget = None
+
+    def set(self, name, value):
+        """Sets an attribute of the element, like setattr on its widget."""
+        if name in ("data", "classes"):
+            setattr(self, name, value)
+        elif self.attrs is None:
+            self.attrs = {name: value}
+        else:
+            self.attrs[name] = value
+
+    def __getattr__(self, name):
+        if not name.startswith("_") and self.attrs and name in self.attrs:
+            return self.attrs[name]
+        raise AttributeError(name)
+
+    @property
+    def _cyto_attrs(self):
+        return self._widget_class._cyto_attrs
+
+    @property
+    def _base_cyto_attrs(self):
+        return self._widget_class._base_cyto_attrs
+
+    @classmethod
+    def of(cls, element):
+        """Returns element if it is a record, or a record viewed by it."""
+        if isinstance(element, _ElementRecord):
+            return element
+        record = cls()
+        record.attach(element)
+        return record
+
+    def materialize(self):
+        """Returns the widget of the element, creating it if needed."""
+        if self.widget is None:
+            self.attach(
+                self._widget_class(
+                    data=self.data, classes=self.classes, **(self.attrs or {})
+                )
+            )
+        return self.widget
+
+    def attach(self, widget):
+        self.data = widget.data
+        self.classes = widget.classes
+        self.attrs = None
+        self.widget = widget
+        widget.observe(self._widget_changed, names=["data", "classes"])
+
+    def detach(self):
+        if self.widget is not None:
+            self.widget.unobserve(self._widget_changed, names=["data", "classes"])
+
+    def view(self):
+        """The widget of the element if there is one, or else the record."""
+        return self if self.widget is None else self.widget
+
+    def _widget_changed(self, change):
+        setattr(self, change["name"], change["new"])
+
+
+class _NodeRecord(_ElementRecord):
+    __slots__ = ()
+    _widget_class = Node
+
+
+class _EdgeRecord(_ElementRecord):
+    __slots__ = ()
+    _widget_class = Edge
+
+
+# types that are sent to the frontend as they are
+_JSON_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _json_list(value):
+    return [_json_value(v) for v in value]
+
+
+def _json_tuple(value):
+    return tuple(_json_value(v) for v in value)
+
+
+def _json_dict(value):
+    return {k: _json_value(v) for k, v in value.items()}
+
+
+def _json_data(data):
+    """Returns the data of an element with serializable values, copied if
+    any had to be converted."""
+    for v in data.values():
+        if type(v) not in _JSON_TYPES:
+            return _json_dict(data)
+    return data
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+# serializers of the attribute values that can't be sent as they are, by type
+_SERIALIZERS = {
+    list: _json_list,
+    tuple: _json_tuple,
+    set: _json_list,
+    frozenset: _json_list,
+    dict: _json_dict,
+    datetime.date: _isoformat,
+    datetime.time: _isoformat,
+    Decimal: float,
+}
+
+if np is not None:
+
+    def _numpy_array(value):
+        if value.dtype.kind == "M":
+            value = np.datetime_as_string(value)
+        return _json_value(value.tolist())
+
+    _SERIALIZERS[np.generic] = lambda value: _json_value(value.item())
+    _SERIALIZERS[np.datetime64] = lambda value: str(np.datetime_as_string(value))
+    _SERIALIZERS[np.ndarray] = _numpy_array
+
+# serializer of every type met so far, None for the ones sent as they are
+_serializer_cache = dict()
+
+
+def _find_serializer(cls):
+    """
+    Returns the serializer of the closest registered base class of cls.
+    Types with an iso_format method, like the Neo4j temporal types, are
+    serialized with it, other unknown types as strings.
+    """
+    for base in cls.__mro__:
+        if base in _SERIALIZERS:
+            return _SERIALIZERS[base]
+        if base in _JSON_TYPES:
+            return None
+    if hasattr(cls, "iso_format"):
+        return lambda value: value.iso_format()
+    return str
+
+
+def _json_value(value):
+    """Converts an attribute value to a value that can be sent as JSON."""
+    cls = type(value)
+    if cls in _JSON_TYPES:
+        return value
+    try:
+        serializer = _serializer_cache[cls]
+    except KeyError:
+        serializer = _serializer_cache[cls] = _find_serializer(cls)
+    return value if serializer is None else serializer(value)
+
+
+def register_serializer(cls, serializer):
+    """
+    Registers how the importers convert the node and edge attribute values of
+    type cls, and of its subclasses, to values that can be sent as JSON.
+
+    Parameters
+    ----------
+    cls : type
+    serializer : callable
+        Takes a value of type cls and returns a str, int, float, bool, None,
+        or a list or dict of them.
+    """
+    _SERIALIZERS[cls] = serializer
+    _serializer_cache.clear()
+
+
 def _set_attributes(instance, data):
     cyto_attrs = instance._cyto_attrs + instance._base_cyto_attrs
+    set_attribute = partial(setattr, instance)
+    if isinstance(instance, _ElementRecord):
+        set_attribute = instance.set
     for k, v in data.items():
-        if k in cyto_attrs:
-            setattr(instance, k, v)
+        if k == "data":
+            set_attribute(k, _json_data(v))
+        elif k in cyto_attrs:
+            set_attribute(k, v)
+        else:
+            instance.data[k] = _json_value(v)
+
+
+_NODE_ATTRS = frozenset(Node._cyto_attrs + Node._base_cyto_attrs)
+_EDGE_ATTRS = frozenset(Edge._cyto_attrs + Edge._base_cyto_attrs)
+# number of nodes or edges converted at once by each worker process
+_NETWORKX_CHUNK_SIZE = 1 << 14
+
+
+def _attributes_payload(cyto_attrs, attributes, data):
+    """
+    Splits attributes the way _set_attributes sets them on an element, whose
+    data starts as data. Returns the (data, classes, attrs) arguments of an
+    element record.
+    """
+    classes = ""
+    attrs = None
+    for k, v in attributes.items():
+        if k not in cyto_attrs:
+            data[k] = _json_value(v)
+        elif k == "data":
+            data = _json_dict(v)
+        elif k == "classes":
+            classes = v
+        elif attrs is None:
+            attrs = {k: v}
         else:
-            instance.data[k] = v
+            attrs[k] = v
+    return data, classes, attrs
+
+
+def _networkx_id(node):
+    return node.data["id"] if isinstance(node, Node) else str(node)
+
+
+def _networkx_node_payloads(nodes):
+    """
+    Converts networkx (node, attributes) pairs to element record payloads,
+    nodes that are Node widgets are kept as they are.
+    """
+    payloads = list()
+    for node, attributes in nodes:
+        if isinstance(node, Node):
+            payloads.append(node)
+            continue
+        data, classes, attrs = _attributes_payload(_NODE_ATTRS, attributes, {})
+        if "id" not in attributes:
+            data["id"] = str(node)
+        payloads.append((data, classes, attrs))
+    return payloads
+
+
+def _networkx_edge_payloads(edges, directed, multiple_edges):
+    """Converts networkx (source, target, attributes) to element record payloads."""
+    payloads = list()
+    for source, target, attributes in edges:
+        data = {"source": _networkx_id(source), "target": _networkx_id(target)}
+        data, classes, attrs = _attributes_payload(_EDGE_ATTRS, attributes, data)
+        if directed and "directed" not in classes:
+            classes += " directed "
+        if multiple_edges and "multiple_edges" not in classes:
+            classes += " multiple_edges "
+        payloads.append((data, classes, attrs))
+    return payloads
+
+
+def _map_chunks(function, items, processes):
+    """
+    Applies function, which takes and returns a list, to chunks of items in
+    a pool of processes, and concatenates the results.
+    """
+    chunks = [
+        items[i : i + _NETWORKX_CHUNK_SIZE]
+        for i in range(0, len(items), _NETWORKX_CHUNK_SIZE)
+    ]
+    with ProcessPoolExecutor(processes) as pool:
+        return [
+            payload for payloads in pool.map(function, chunks) for payload in payloads
+        ]
+
+
+# number of cursor items added at once by add_graph_from_neo4j
+_NEO4J_CHUNK_SIZE = 1 << 12
+
+
+def _is_neo4j_subgraph(g):
+    return hasattr(g, "nodes") and hasattr(g, "relationships")
+
+
+def _neo4j_pages(g, chunk_size):
+    """
+    Yields (nodes, relationships) lists out of a py2neo subgraph or an
+    iterable of records or subgraphs, chunk_size at a time.
+    """
+    if _is_neo4j_subgraph(g):
+        nodes = list(g.nodes)
+        relationships = list(g.relationships)
+        if chunk_size is None:
+            yield nodes, relationships
+            return
+        for i in range(0, len(nodes), chunk_size):
+            yield nodes[i : i + chunk_size], []
+        for i in range(0, len(relationships), chunk_size):
+            yield [], relationships[i : i + chunk_size]
+        return
+
+    items = iter(g)
+    while True:
+        page = list(islice(items, chunk_size or _NEO4J_CHUNK_SIZE))
+        if not page:
+            return
+        nodes = list()
+        relationships = list()
+        for item in page:
+            if hasattr(item, "to_subgraph"):
+                # a py2neo Record
+                item = item.to_subgraph()
+            if item is None:
+                continue
+            nodes.extend(item.nodes)
+            relationships.extend(item.relationships)
+        yield nodes, relationships
+
+
+def _neo4j_label_ranks(nodes):
+    """Ranks the labels of nodes from the least to the most frequent."""
+    counts = dict()
+    for node in nodes:
+        for label in node.labels:
+            counts[label] = counts.get(label, 0) + 1
+    return {label: rank for rank, label in enumerate(sorted(counts, key=counts.get))}
+
+
+def _neo4j_node_record(node, label_ranks):
+    node_attributes = dict(node)
+
+    # create tooltip text string
+    if "tooltip" not in node_attributes:
+        labels = ",".join(label for label in node.labels)
+        attributes = "\n".join(k + ":" + str(v) for k, v in node_attributes.items())
+        node_attributes["tooltip"] = labels + "\n" + attributes
+
+    # assign unique id to node
+    node_attributes["id"] = node.identity
+
+    # assign class label with the highest priority
+    if node.labels:
+        last = len(label_ranks)
+        node_attributes["label"] = min(
+            node.labels, key=lambda label: label_ranks.get(label, last)
+        )
+
+    node_instance = _NodeRecord()
+    _set_attributes(node_instance, node_attributes)
+    return node_instance
+
+
+def _neo4j_edge_record(rel):
+    rel_attributes = dict(rel)
+
+    # assign name of the relationship
+    if "name" not in rel_attributes:
+        rel_attributes["name"] = rel.__class__.__name__
+
+    # assign unique node ids
+    edge_instance = _EdgeRecord()
+    edge_instance.data["source"] = rel.start_node.identity
+    edge_instance.data["target"] = rel.end_node.identity
+    _set_attributes(edge_instance, rel_attributes)
+    return edge_instance
+
+
+_JSON_READ_SIZE = 1 << 16
+_NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _JSONStream:
+    """
+    Incremental reader of a JSON document, decoding one value at a time
+    without holding more of the file in memory than the value being read.
+    """
+
+    def __init__(self, f):
+        self._file = f
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read(self):
+        chunk = self._file.read(max(_JSON_READ_SIZE, len(self._buffer)))
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        self._eof = not chunk
+        return not self._eof
+
+    def peek(self):
+        """Returns the next non whitespace character, or '' at the end."""
+        while True:
+            self._pos = _JSON_WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._read():
+                return self._buffer[self._pos : self._pos + 1]
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(
+                f"Expected one of {chars!r} in the JSON file, found {char!r}."
+            )
+        self._pos += 1
+        return char
+
+    def value(self):
+        """Decodes the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # a number at the end of the buffer may continue in the file
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._read()
+
+
+def _iter_json_elements(f):
+    """
+    Yields ("nodes" | "edges", element) pairs from the top level "nodes" and
+    "edges" arrays of a cytoscape JSON file, in file order.
+    """
+    stream = _JSONStream(f)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key in ("nodes", "edges") and stream.peek() == "[":
+            stream.expect("[")
+            if stream.peek() != "]":
+                while True:
+                    yield key, stream.value()
+                    if stream.expect(",]") == "]":
+                        break
+            else:
+                stream.expect("]")
+        else:
+            stream.value()
+        if stream.expect(",}") == "}":
+            return
+
+
+def _iter_ndjson_elements(f):
+    """
+    Yields ("nodes" | "edges", element) pairs from a file with one cytoscape
+    element per line. The group of an element is taken from its "group" key,
+    or inferred from the presence of a source in its data.
+    """
+    for line in f:
+        if not line.strip():
+            continue
+        element = _json_loads(line)
+        group = element.pop("group", None)
+        if group is None:
+            group = "edges" if "source" in element.get("data", {}) else "nodes"
+        yield group, element
+
+
+# number of GraphML or GEXF elements added to the graph at once
+_XML_CHUNK_SIZE = 1 << 14
+
+
+def _xml_boolean(text):
+    return text.strip().lower() in ("true", "1")
+
+
+# converters of the GraphML and GEXF attribute types, other types are strings
+_XML_TYPES = {
+    "boolean": _xml_boolean,
+    "int": int,
+    "integer": int,
+    "long": int,
+    "float": float,
+    "double": float,
+}
+
+
+def _xml_tag(element):
+    """Returns the tag of an element without its namespace."""
+    return element.tag.rpartition("}")[2]
+
+
+def _graphml_data(element, keys, data):
+    """Adds the <data> of a GraphML node or edge to data."""
+    for child in element:
+        if _xml_tag(child) == "data" and child.get("key") in keys:
+            name, convert = keys[child.get("key")]
+            data[name] = convert(child.text or "")
+    return data
+
+
+def _iter_graphml(source):
+    """
+    Yields ("nodes" | "edges", element) pairs in the format of
+    add_graph_from_json from a GraphML file, as it is parsed. Data is typed
+    according to the <key> declarations, and takes their defaults. Nodes of
+    nested graphs have the enclosing node as their parent, which is yielded
+    before them, and again with all its data once it ends.
+    """
+    keys = dict()
+    defaults = {"node": dict(), "edge": dict()}
+    # the edgedefault of the enclosing graphs, and the enclosing nodes
+    directed = list()
+    node_ids = list()
+    parents = list()
+    for event, element in iterparse(source, events=("start", "end")):
+        tag = _xml_tag(element)
+        if event == "start":
+            if tag == "graph":
+                directed.append(element.get("edgedefault") == "directed")
+                if node_ids and _xml_tag(parents[-1]) == "node":
+                    data = _graphml_data(parents[-1], keys, dict(defaults["node"]))
+                    data["id"] = node_ids[-1]
+                    if len(node_ids) > 1:
+                        data["parent"] = node_ids[-2]
+                    yield "nodes", {"data": data}
+            elif tag == "node":
+                node_ids.append(element.get("id"))
+            parents.append(element)
+            continue
+        parents.pop()
+
+        if tag == "key":
+            convert = _XML_TYPES.get(element.get("attr.type"), str)
+            name = element.get("attr.name", element.get("id"))
+            keys[element.get("id")] = (name, convert)
+            for child in element:
+                if _xml_tag(child) == "default":
+                    for group in ("node", "edge"):
+                        if element.get("for", "all") in (group, "all"):
+                            defaults[group][name] = convert(child.text or "")
+        elif tag == "graph":
+            directed.pop()
+        elif tag in ("node", "edge"):
+            data = _graphml_data(element, keys, dict(defaults[tag]))
+            if tag == "node":
+                data["id"] = node_ids.pop()
+                if node_ids:
+                    data["parent"] = node_ids[-1]
+                yield "nodes", {"data": data}
+            else:
+                data["source"] = element.get("source")
+                data["target"] = element.get("target")
+                if element.get("directed") is None:
+                    is_directed = directed[-1]
+                else:
+                    is_directed = _xml_boolean(element.get("directed"))
+                yield "edges", {
+                    "data": data,
+                    "classes": " directed " if is_directed else "",
+                }
+            # free the parsed elements
+            element.clear()
+            if parents:
+                parents[-1].clear()
+
+
+def _gexf_node(element, node_ids, attributes, defaults):
+    """
+    Returns a GEXF <node> in the format of add_graph_from_json, with the
+    enclosing node of node_ids as its parent.
+    """
+    data = _gexf_data(element, attributes, dict(defaults))
+    data["id"] = node_ids[-1]
+    if element.get("pid") is not None:
+        data["parent"] = element.get("pid")
+    elif len(node_ids) > 1:
+        data["parent"] = node_ids[-2]
+    node = {"data": data}
+    for child in element:
+        if _xml_tag(child) == "position":
+            position = {
+                axis: float(child.get(axis))
+                for axis in ("x", "y")
+                if child.get(axis) is not None
+            }
+            if position:
+                node["position"] = position
+    return node
+
+
+def _gexf_data(element, attributes, data):
+    """Adds the <attvalues> and label of a GEXF node or edge to data."""
+    for child in element:
+        if _xml_tag(child) == "attvalues":
+            for attvalue in child:
+                key = attvalue.get("for", attvalue.get("id"))
+                if key in attributes:
+                    name, convert = attributes[key]
+                    data[name] = convert(attvalue.get("value", ""))
+    if element.get("label") is not None:
+        data["label"] = element.get("label")
+    return data
+
+
+def _iter_gexf(source):
+    """
+    Yields ("nodes" | "edges", element) pairs in the format of
+    add_graph_from_json from a GEXF file, as it is parsed. Data is typed
+    according to the <attribute> declarations, and takes their defaults.
+    Node labels are stored as the "label" data and viz:position as their
+    position. Nodes of nested <nodes> have the enclosing node as their
+    parent, or the node of their pid. The enclosing node is yielded before
+    them, and again with all its data once it ends.
+    """
+    attributes = {"node": dict(), "edge": dict()}
+    defaults = {"node": dict(), "edge": dict()}
+    attribute_class = "node"
+    directed = False
+    node_ids = list()
+    parents = list()
+    for event, element in iterparse(source, events=("start", "end")):
+        tag = _xml_tag(element)
+        if event == "start":
+            if tag == "graph":
+                directed = element.get("defaultedgetype") == "directed"
+            elif tag == "attributes":
+                attribute_class = element.get("class", "node")
+            elif tag == "node":
+                node_ids.append(element.get("id"))
+            elif tag == "nodes" and node_ids and _xml_tag(parents[-1]) == "node":
+                yield "nodes", _gexf_node(
+                    parents[-1], node_ids, attributes["node"], defaults["node"]
+                )
+            parents.append(element)
+            continue
+        parents.pop()
+
+        if tag == "attribute":
+            convert = _XML_TYPES.get(element.get("type"), str)
+            name = element.get("title", element.get("id"))
+            attributes[attribute_class][element.get("id")] = (name, convert)
+            for child in element:
+                if _xml_tag(child) == "default":
+                    defaults[attribute_class][name] = convert(child.text or "")
+        elif tag in ("node", "edge"):
+            if tag == "node":
+                yield "nodes", _gexf_node(
+                    element, node_ids, attributes["node"], defaults["node"]
+                )
+                node_ids.pop()
+            else:
+                data = _gexf_data(element, attributes["edge"], dict(defaults["edge"]))
+                data["source"] = element.get("source")
+                data["target"] = element.get("target")
+                if element.get("weight") is not None:
+                    data["weight"] = float(element.get("weight"))
+                if element.get("type") is None:
+                    is_directed = directed
+                else:
+                    is_directed = element.get("type") == "directed"
+                yield "edges", {
+                    "data": data,
+                    "classes": " directed " if is_directed else "",
+                }
+            # free the parsed elements
+            element.clear()
+            if parents:
+                parents[-1].clear()
+
+
+def _element_delta(record, element):
+    """
+    Returns the changes that element, in the format of add_graph_from_json,
+    makes to a node or edge record: its changed attributes, and under
+    "data" the data keys whose value changed.
+    """
+    view = record.view()
+    cyto_attrs = record._cyto_attrs + record._base_cyto_attrs
+    data = dict()
+    delta = dict()
+    for name, value in element.items():
+        if name == "data":
+            data.update(_json_dict(value))
+        elif name not in cyto_attrs:
+            data[name] = _json_value(value)
+        elif getattr(view, name, None) != value:
+            delta[name] = value
+    current = view.data
+    data = {k: v for k, v in data.items() if k not in current or current[k] != v}
+    if data:
+        delta["data"] = data
+    return delta
+
+
+def _async_element_group(element):
+    """
+    Returns the group of an element given to add_from_async_iterable, and
+    the element as a widget, a record or a cytoscape JSON dict without its
+    "group" key.
+    """
+    if isinstance(element, (Node, _NodeRecord)):
+        return "nodes", element
+    if isinstance(element, (Edge, _EdgeRecord)):
+        return "edges", element
+    if "group" in element:
+        element = dict(element)
+        return element.pop("group"), element
+    return ("edges" if "source" in element.get("data", {}) else "nodes"), element
+
+
+def _node_from_json(node):
+    node_instance = _NodeRecord()
+    _set_attributes(node_instance, node)
+    return node_instance
+
+
+def _edge_from_json(edge, directed, multiple_edges):
+    edge_instance = _EdgeRecord()
+    _set_attributes(edge_instance, edge)
+    if directed and "directed" not in edge_instance.classes:
+        edge_instance.classes += " directed "
+    if multiple_edges and "multiple_edges" not in edge_instance.classes:
+        edge_instance.classes += " multiple_edges "
+    return edge_instance
+
+
+# number of lines of an edge list added to the graph at once
+_EDGELIST_CHUNK_SIZE = 1 << 16
+
+
+def _edgelist_rows(lines, delimiter, comments):
+    """Yields the fields of the lines of an edge list, skipping comments."""
+    if comments:
+        lines = (line.partition(comments)[0] for line in lines)
+    if delimiter is None:
+        for line in lines:
+            fields = line.split()
+            if fields:
+                yield fields
+    else:
+        for fields in csv.reader(lines, delimiter=delimiter):
+            if fields:
+                yield fields
+
+
+def _edgelist_value(text):
+    """Converts an edge list field to a number if it is one."""
+    for parse in (int, float):
+        try:
+            return parse(text)
+        except ValueError:
+            pass
+    return text
+
+
+class _ElementList(MutableList):
+    """
+    The nodes or edges of a Graph. Pending elements are turned into widgets
+    whenever the list is accessed.
+    """
+
+    def get(self, obj, cls=None):
+        obj._materialize()
+        return super().get(obj, cls)
 
 
 class Graph(Widget):
@@ -254,10 +1178,77 @@ class Graph(Widget):
     _view_module = Unicode(module_name).tag(sync=True)
     _view_module_version = Unicode(module_version).tag(sync=True)
 
-    nodes = MutableList(Instance(Node)).tag(sync=True, **widget_serialization)
-    edges = MutableList(Instance(Edge)).tag(sync=True, **widget_serialization)
-    # dictionary for syncing graph structure
-    _adj = MutableDict().tag(sync=True)
+    nodes = _ElementList(Instance(Node)).tag(sync=True, **widget_serialization)
+    edges = _ElementList(Instance(Edge)).tag(sync=True, **widget_serialization)
+    # dictionary for syncing graph structure, the full dictionary is only sent
+    # when the widget is opened or cleared, afterwards the frontend is kept up
+    # to date with patches (see _patch_adj)
+    _adj = Dict().tag(sync=True)
+
+    # elements that were added but aren't in nodes and edges yet, see _materialize
+    _pending_nodes = ()
+    _pending_edges = ()
+
+    def __init__(self, **kwargs):
+        self._pending_nodes = list()
+        self._pending_edges = list()
+        # whether a frontend displays the graph, in which case elements are
+        # materialized as soon as they are added
+        self._live = False
+        super().__init__(**kwargs)
+        self.on_msg(self._handle_graph_msg)
+        # kernel side indexes of element records (see _ElementRecord), these
+        # are kept in step with nodes, edges and _adj so that lookups and
+        # removals don't have to scan the whole graph
+        self._node_index = dict()  # id -> node record
+        # edge records are kept as the keys of dicts, so that removing one
+        # doesn't have to scan the edges of its nodes
+        self._out_edges = dict()  # source id -> {edge record: None}
+        self._in_edges = dict()  # target id -> {edge record: None}
+        self._edge_index = dict()  # id -> record of the edges with an id
+        self._radj = dict()  # reverse of _adj: target -> {source: count}
+        self._held_mutable_changes = None
+        # pending patches of _adj, None when the whole of it will be synced
+        self._adj_patches = list()
+        # whether _adj changed before a frontend displays the graph, it is
+        # then sent whole once one does
+        self._adj_deferred = False
+        # pending [model_id, delta] changes of element widgets, see _update
+        self._element_deltas = list()
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager that groups several changes to the graph into one
+        sync with the frontend. Inside of it changes to nodes, edges and the
+        graph structure are not sent, on exit they are sent together in a
+        single message. Batches can be nested, only the outermost one syncs.
+
+        Examples
+        --------
+        >>> with graph.batch():
+        ...     graph.add_nodes(nodes)
+        ...     graph.add_edges(edges)
+        """
+        if self._held_mutable_changes is not None:
+            yield
+            return
+        try:
+            with self.hold_sync():
+                self._held_mutable_changes = set()
+                try:
+                    yield
+                finally:
+                    if self._live:
+                        self._materialize()
+                    changed = self._held_mutable_changes
+                    self._held_mutable_changes = None
+                    for name in ("nodes", "edges"):
+                        if name in changed:
+                            _notify_mutable(self, name)
+        finally:
+            self._flush_adj_patches()
+            self._flush_element_deltas()
 
     def add_node(self, node):
         """
@@ -277,12 +1268,13 @@ class Graph(Widget):
         ----------
         nodes : list of ipycytoscape.Node
         """
-        node_list = list()
-        for node in nodes:
-            if node.data["id"] not in self._adj:
-                self._adj[node.data["id"]] = dict()
-                node_list.append(node)
-        self.nodes.extend(node_list)
+        adj = self._adj
+        with self.batch():
+            for node in nodes:
+                if node.data["id"] not in adj:
+                    record = _NodeRecord.of(node)
+                    self._add_node_to_index(record)
+                    self._pending_nodes.append(record)
 
     def remove_node(self, node):
         """
@@ -292,17 +1284,18 @@ class Graph(Widget):
         ----------
         node : ipycytoscape.Node
         """
-        try:
-            self.nodes.remove(node)
-            for target in list(self._adj[node.data["id"]]):
-                self.remove_edge_by_id(node.data["id"], target)
-            for source in list(self._adj):
-                for target in list(self._adj[source]):
-                    if target == node.data["id"]:
-                        self.remove_edge_by_id(source, node.data["id"])
-            del self._adj[node.data["id"]]
-        except ValueError:
-            raise ValueError(f'{node.data["id"]} is not present in the graph.')
+        node_id = node.data["id"]
+        record = self._node_index.get(node_id)
+        if record is None or node not in (record, record.widget):
+            raise ValueError(f"{node_id} is not present in the graph.")
+        with self.batch():
+            self._remove_from("nodes", [record])
+            edges = self._incident_edges(node_id)
+            if edges:
+                self._remove_from("edges", edges)
+            for edge in edges:
+                self._remove_edge_from_index(edge)
+            self._remove_node_from_index(node_id)
 
     def remove_node_by_id(self, node_id):
         """
@@ -312,14 +1305,9 @@ class Graph(Widget):
         ----------
         node_id : numeric or string
         """
-        node_list_id = -1
-        for i, node in enumerate(self.nodes):
-            if node.data["id"] == node_id:
-                node_list_id = i
-        if node_list_id != -1:
-            self.remove_node(self.nodes[node_list_id])
-        else:
+        if node_id not in self._node_index:
             raise ValueError(f"{node_id} is not present in the graph.")
+        self.remove_node(self._node_index[node_id])
 
     def add_edge(self, edge, directed=False, multiple_edges=False):
         """
@@ -345,59 +1333,151 @@ class Graph(Widget):
         directed : bool
         multiple_edges : boolean
         """
-        node_list = list()
-        edge_list = list()
-        for edge in edges:
-            source, target = edge.data["source"], edge.data["target"]
-
-            if directed and "directed" not in edge.classes:
-                edge.classes += " directed "
-            if multiple_edges and "multiple_edges" not in edge.classes:
-                edge.classes += " multiple_edges "
-
-            # If multiple edges are allowed, it's okay to add more
-            # edges between the source and target
-            if multiple_edges:
-                new_edge = True
-            # Check to see if the edge source -> target exists in the graph
-            # If it does then don't add it again
-            elif source in self._adj and target in self._adj[source]:
-                new_edge = False
-            # Check to see if the edge target-> source exists in an
-            # undirected graph (don't add it again)
-            elif not directed and target in self._adj and source in self._adj[target]:
-                new_edge = False
-            # If the edge doesn't exist already
-            else:
-                new_edge = True
-            if new_edge:  # if the edge is not present in the graph
-                edge_list.append(edge)
-                if source not in self._adj:
-                    node_instance = Node()
-                    # setting the id, according to current spec should be only int/str
-                    node_instance.data = {"id": source}
-                    node_list.append(node_instance)
-                    self._adj[source] = dict()
-                if target not in self._adj:
-                    node_instance = Node()
-                    # setting the id, according to current spec should be only int/str
-                    node_instance.data = {"id": target}
-                    node_list.append(node_instance)
-                    self._adj[target] = dict()
-
-                if multiple_edges and target in self._adj[source]:
-                    self._adj[source][target] += 1
+        adj = self._adj
+        with self.batch():
+            for edge in edges:
+                source, target = edge.data["source"], edge.data["target"]
+
+                if directed and "directed" not in edge.classes:
+                    edge.classes += " directed "
+                if multiple_edges and "multiple_edges" not in edge.classes:
+                    edge.classes += " multiple_edges "
+
+                # If multiple edges are allowed, it's okay to add more
+                # edges between the source and target
+                if multiple_edges:
+                    new_edge = True
+                # Check to see if the edge source -> target exists in the graph
+                # If it does then don't add it again
+                elif source in adj and target in adj[source]:
+                    new_edge = False
+                # Check to see if the edge target-> source exists in an
+                # undirected graph (don't add it again)
+                elif not directed and target in adj and source in adj[target]:
+                    new_edge = False
+                # If the edge doesn't exist already
                 else:
-                    self._adj[source][target] = 1
-                if not (directed or "directed" in edge.classes):
-                    if multiple_edges and source in self._adj[target]:
-                        self._adj[target][source] += 1
-                    else:
-                        self._adj[target][source] = 1
-            else:  # Don't add this edge, already present
-                pass
-        self.nodes.extend(node_list)
-        self.edges.extend(edge_list)
+                    new_edge = True
+                if new_edge:  # if the edge is not present in the graph
+                    record = _EdgeRecord.of(edge)
+                    self._pending_edges.append(record)
+                    self._add_edge_to_index(record)
+                    if source not in adj:
+                        # setting the id, according to current spec should be
+                        # only int/str
+                        node_instance = _NodeRecord(data={"id": source})
+                        self._pending_nodes.append(node_instance)
+                        self._add_node_to_index(node_instance)
+                    if target not in adj:
+                        # setting the id, according to current spec should be
+                        # only int/str
+                        node_instance = _NodeRecord(data={"id": target})
+                        self._pending_nodes.append(node_instance)
+                        self._add_node_to_index(node_instance)
+
+                    self._add_adjacency(source, target, multiple_edges)
+                    # self loops are only counted once
+                    if not (directed or "directed" in edge.classes):
+                        if source != target:
+                            self._add_adjacency(target, source, multiple_edges)
+                else:  # Don't add this edge, already present
+                    pass
+
+    def upsert_nodes(self, nodes):
+        """
+        Adds nodes, or updates the nodes of the graph with the same id: data
+        keys are merged into their data and other attributes replaced. The
+        changes made to nodes that have a widget are sent to the frontend in
+        a single message, and only the changed keys are sent.
+
+        Parameters
+        ----------
+        nodes : list of dict
+            Nodes in the format of add_graph_from_json.
+        """
+        new_nodes = dict()
+        with self.batch():
+            for node in nodes:
+                node_id = node["data"]["id"]
+                record = self._node_index.get(node_id, new_nodes.get(node_id))
+                if record is None:
+                    new_nodes[node_id] = _node_from_json(node)
+                else:
+                    self._update(record, node)
+            self.add_nodes(list(new_nodes.values()))
+
+    def upsert_edges(self, edges, directed=False, multiple_edges=False):
+        """
+        Adds edges, or updates the edges of the graph with the same id (in
+        their data), like upsert_nodes. Edges without an id are added.
+
+        Parameters
+        ----------
+        edges : list of dict
+            Edges in the format of add_graph_from_json.
+        directed : bool
+            If True added edges will be given 'directed' as a class.
+        multiple_edges : bool
+            If True, repeated edges between the same nodes are all added.
+        """
+        index = self._edge_index
+        # the added edges, and the ones with an id by id
+        new_edges = list()
+        new_index = dict()
+        with self.batch():
+            for edge in edges:
+                edge_id = edge["data"].get("id")
+                record = index.get(edge_id, new_index.get(edge_id))
+                if record is None:
+                    record = _edge_from_json(edge, directed, multiple_edges)
+                    new_edges.append(record)
+                    if edge_id is not None:
+                        new_index[edge_id] = record
+                    continue
+                for key in ("source", "target"):
+                    if edge["data"].get(key, record.data[key]) != record.data[key]:
+                        raise ValueError(
+                            f"The {key} of edge {edge_id} can't be changed."
+                        )
+                self._update(record, edge)
+            self.add_edges(new_edges, directed, multiple_edges)
+
+    def _update(self, record, element):
+        """
+        Applies the changes of element, in the format of add_graph_from_json,
+        to a node or edge record. When it has a widget, the widget is updated
+        without syncing and the delta is queued to be sent with the others.
+        """
+        delta = _element_delta(record, element)
+        if not delta:
+            return
+        widget = record.widget
+        if widget is None:
+            for name, value in delta.items():
+                if name == "data":
+                    record.data.update(value)
+                else:
+                    record.set(name, value)
+            return
+
+        # the widget state matches the frontend once the delta is applied
+        state = {name: value for name, value in delta.items() if name != "data"}
+        if "data" in delta:
+            state["data"] = {**widget.data, **delta["data"]}
+        with widget._lock_property(**state):
+            for name, value in delta.items():
+                if name == "data":
+                    widget.data.update(value)
+                else:
+                    setattr(widget, name, value)
+        self._element_deltas.append([widget.model_id, delta])
+        if self._held_mutable_changes is None:
+            self._flush_element_deltas()
+
+    def _flush_element_deltas(self):
+        if self._element_deltas:
+            self.send({"name": "element_deltas", "deltas": self._element_deltas})
+        self._element_deltas = list()
 
     def remove_edge(self, edge):
         """
@@ -407,25 +1487,17 @@ class Graph(Widget):
         ----------
         edge : ipcytoscape.Edge
         """
-        source = edge.data["source"]
-        target = edge.data["target"]
-
-        try:
-            self.edges.remove(edge)
-            if self._adj[source][target] == 1:
-                del self._adj[source][target]
-            else:
-                self._adj[source][target] -= 1
-            if "directed" not in edge.classes:
-                if self._adj[target][source] == 1:
-                    del self._adj[target][source]
-                else:
-                    self._adj[target][source] -= 1
-        except ValueError:
+        for record in self._out_edges.get(edge.data["source"], ()):
+            if edge is record or edge is record.widget:
+                break
+        else:
             raise ValueError(
                 f"Edge from {edge.data['source']} to {edge.data['target']} "
                 "is not present in the graph."
             )
+        with self.batch():
+            self._remove_from("edges", [record])
+            self._remove_edge_from_index(record)
 
     def remove_edge_by_id(self, source_id, target_id):
         """
@@ -436,23 +1508,25 @@ class Graph(Widget):
         source_id : numeric or string
         target_id : numeric or string
         """
-        contains_edge = False
-        edges = copy.copy(self.edges)
-
-        for edge in edges:
-            if (
-                edge.data["source"] == source_id and edge.data["target"] == target_id
-            ) or (
-                "directed" not in edge.classes
-                and edge.data["source"] == target_id
-                and edge.data["target"] == source_id
-            ):
-                self.remove_edge(edge)
-                contains_edge = True
-        if not contains_edge:
+        edges = [
+            edge
+            for edge in self._out_edges.get(source_id, ())
+            if edge.data["target"] == target_id
+        ]
+        if source_id != target_id:
+            edges.extend(
+                edge
+                for edge in self._out_edges.get(target_id, ())
+                if edge.data["target"] == source_id and "directed" not in edge.classes
+            )
+        if not edges:
             raise ValueError(
                 f"Edge between {source_id} and {target_id} is not present in the graph."
             )
+        with self.batch():
+            self._remove_from("edges", edges)
+            for edge in edges:
+                self._remove_edge_from_index(edge)
 
     def clear(self):
         """
@@ -461,11 +1535,169 @@ class Graph(Widget):
         ----------
         self: cytoscape graph
         """
-        self.nodes.clear()
-        self.edges.clear()
-        self._adj.clear()
+        with self.batch():
+            self._pending_nodes = list()
+            self._pending_edges = list()
+            self.nodes.clear()
+            self.edges.clear()
+            self._adj = dict()
+            self._adj_patches = None
+            self._node_index.clear()
+            self._out_edges.clear()
+            self._in_edges.clear()
+            self._edge_index.clear()
+            self._radj.clear()
+
+    def _remove_from(self, name, records):
+        """
+        Removes the elements of records from the nodes or edges list with a
+        single change notification. Spectate emits an event for every shifted
+        index on removal, which would make each removal cost O(V+E). Elements
+        that are still pending are removed without materializing the others.
+        """
+        pending = getattr(self, f"_pending_{name}")
+        element_list = self._trait_values[name]
+        changed = False
+        for record in records:
+            record.detach()
+            try:
+                list.remove(element_list, record.widget)
+                changed = True
+            except ValueError:
+                pending.remove(record)
+        if changed:
+            _notify_mutable(self, name)
+
+    def _elements(self, name):
+        """
+        Returns the nodes or edges of the graph without materializing them,
+        pending ones that don't have a widget are returned as records.
+        """
+        pending = getattr(self, f"_pending_{name}")
+        return [*self._trait_values[name], *(record.view() for record in pending)]
+
+    def _materialize(self):
+        """
+        Turns the pending elements into widgets and appends them to nodes and
+        edges. This happens when either list is accessed, or whenever elements
+        are added once the graph is displayed.
+        """
+        if not (self._pending_nodes or self._pending_edges):
+            return
+        nodes, self._pending_nodes = self._pending_nodes, list()
+        edges, self._pending_edges = self._pending_edges, list()
+        with self.batch():
+            if nodes:
+                self.nodes.extend([record.materialize() for record in nodes])
+            if edges:
+                self.edges.extend([record.materialize() for record in edges])
+
+    def _handle_graph_msg(self, _widget, content, _buffers):
+        if content.get("name") == "materialize":
+            # sent by the frontend when the graph is rendered
+            self._live = True
+            if self._adj_deferred:
+                self._adj_deferred = False
+                self.send_state("_adj")
+            self._materialize()
+
+    def _should_send_property(self, key, value):
+        if key == "_adj" and not self._live:
+            self._adj_deferred = True
+            return False
+        return super()._should_send_property(key, value)
+
+    def _add_edge_to_index(self, edge):
+        source, target = edge.data["source"], edge.data["target"]
+        self._out_edges.setdefault(source, dict())[edge] = None
+        self._in_edges.setdefault(target, dict())[edge] = None
+        if "id" in edge.data:
+            self._edge_index[edge.data["id"]] = edge
+
+    def _remove_edge_from_index(self, edge):
+        source, target = edge.data["source"], edge.data["target"]
+        for index, node_id in ((self._out_edges, source), (self._in_edges, target)):
+            edges = index[node_id]
+            del edges[edge]
+            if not edges:
+                del index[node_id]
+        edge_id = edge.data.get("id")
+        if edge_id is not None and self._edge_index.get(edge_id) is edge:
+            del self._edge_index[edge_id]
+        self._remove_adjacency(source, target)
+        if "directed" not in edge.classes and source != target:
+            self._remove_adjacency(target, source)
+
+    # the index helpers run once per element, they read _adj from the trait
+    # values directly rather than through the (slow) trait descriptor
+
+    def _add_node_to_index(self, node):
+        node_id = node.data["id"]
+        self._node_index[node_id] = node
+        self._trait_values["_adj"][node_id] = dict()
+        self._radj[node_id] = dict()
+        self._patch_adj("add", node_id)
+
+    def _remove_node_from_index(self, node_id):
+        del self._node_index[node_id]
+        del self._trait_values["_adj"][node_id]
+        del self._radj[node_id]
+        self._patch_adj("remove", node_id)
+
+    def _add_adjacency(self, source, target, multiple_edges):
+        targets = self._trait_values["_adj"][source]
+        count = targets.get(target, 0)
+        if multiple_edges and target in targets:
+            targets[target] += 1
+        else:
+            targets[target] = 1
+        self._radj[target][source] = targets[target]
+        if targets[target] != count:
+            self._patch_adj("increment", source, target, targets[target] - count)
+
+    def _remove_adjacency(self, source, target):
+        targets = self._trait_values["_adj"][source]
+        if targets[target] == 1:
+            del targets[target]
+            del self._radj[target][source]
+        else:
+            targets[target] -= 1
+            self._radj[target][source] -= 1
+        self._patch_adj("increment", source, target, -1)
+
+    def _patch_adj(self, *patch):
+        """
+        Records a change of _adj to be sent to the frontend, one of:
 
-    def add_graph_from_networkx(self, g, directed=None, multiple_edges=None):
+        - ``["add", node_id]``
+        - ``["remove", node_id]``
+        - ``["increment", source, target, delta]``, entries whose count
+          drops to zero are removed.
+        """
+        if self._adj_patches is not None:
+            self._adj_patches.append(patch)
+        if self._held_mutable_changes is None:
+            self._flush_adj_patches()
+
+    def _flush_adj_patches(self):
+        if self._adj_patches and not self._live:
+            self._adj_deferred = True
+        elif self._adj_patches:
+            self.send({"name": "adj_patch", "patches": self._adj_patches})
+        self._adj_patches = list()
+
+    def _incident_edges(self, node_id):
+        """
+        Returns the records of the edges going out of or coming into a node,
+        in O(degree).
+        """
+        edges = dict(self._out_edges.get(node_id, ()))
+        edges.update(self._in_edges.get(node_id, ()))
+        return list(edges)
+
+    def add_graph_from_networkx(
+        self, g, directed=None, multiple_edges=None, processes=None
+    ):
         """
         Converts a NetworkX graph in to a Cytoscape graph.
 
@@ -478,6 +1710,10 @@ class Graph(Widget):
             If true all edges will be given directed as class if
             they do not already have it. Equivalent to adding
             'directed' to the 'classes' attribute of edge.data for all edges
+        processes : int, optional
+            Number of worker processes converting the node and edge attributes
+            of large graphs. By default they are converted in this process.
+            Graphs whose nodes are Node widgets are always converted here.
         """
         # override type infering if directed is provided by the user
         if isinstance(g, nx.DiGraph) and directed is None:
@@ -486,42 +1722,33 @@ class Graph(Widget):
         if isinstance(g, nx.MultiGraph) and multiple_edges is None:
             multiple_edges = True
 
-        node_list = list()
-        for node, data in g.nodes(data=True):
-            if issubclass(type(node), Node):
-                node_instance = node
-            else:
-                node_instance = Node()
-                _set_attributes(node_instance, data)
-                if "id" not in data:
-                    node_instance.data["id"] = str(node)
-            node_list.append(node_instance)
-        self.add_nodes(node_list)
-
-        edge_list = list()
-        for source, target, data in g.edges(data=True):
-            edge_instance = Edge()
-
-            if issubclass(type(source), Node):
-                edge_instance.data["source"] = source.data["id"]
-            else:
-                edge_instance.data["source"] = str(source)
-
-            if issubclass(type(target), Node):
-                edge_instance.data["target"] = target.data["id"]
-            else:
-                edge_instance.data["target"] = str(target)
+        edge_payloads = partial(
+            _networkx_edge_payloads, directed=directed, multiple_edges=multiple_edges
+        )
+        if processes and processes > 1 and not any(isinstance(n, Node) for n in g):
+            node_payloads = _map_chunks(
+                _networkx_node_payloads, list(g.nodes(data=True)), processes
+            )
+            edge_payloads = _map_chunks(
+                edge_payloads, list(g.edges(data=True)), processes
+            )
+        else:
+            node_payloads = _networkx_node_payloads(g.nodes(data=True))
+            edge_payloads = edge_payloads(g.edges(data=True))
 
-            _set_attributes(edge_instance, data)
+        node_list = [
+            payload if isinstance(payload, Node) else _NodeRecord(*payload)
+            for payload in node_payloads
+        ]
+        edge_list = [_EdgeRecord(*payload) for payload in edge_payloads]
 
-            if directed and "directed" not in edge_instance.classes:
-                edge_instance.classes += " directed "
-            if multiple_edges and "multiple_edges" not in edge_instance.classes:
-                edge_instance.classes += " multiple_edges "
-            edge_list.append(edge_instance)
-        self.add_edges(edge_list, directed, multiple_edges)
+        with self.batch():
+            self.add_nodes(node_list)
+            self.add_edges(edge_list, directed, multiple_edges)
 
-    def add_graph_from_json(self, json_file, directed=False, multiple_edges=False):
+    def add_graph_from_json(
+        self, json_file, directed=False, multiple_edges=False, chunk_size=None
+    ):
         """
         Converts a JSON Cytoscape graph in to a ipycytoscape graph.
         (This method only allows the conversion from a JSON that's already
@@ -533,31 +1760,299 @@ class Graph(Widget):
             If a dict is passed, it will be parsed as a JSON object,
             a file path (to the json graph file) can also be passed as a
             string, the file will be loaded it's content parsed as JSON an
-            object.
+            object. Files ending in .ndjson or .jsonl are read as one
+            element per line and are always streamed.
         directed : bool
             If True all edges will be given 'directed' as a class if
             they do not already have it.
+        chunk_size : int, optional
+            If json_file is a path, parse the "nodes" and "edges" arrays
+            incrementally and add their elements to the graph chunk_size at
+            a time, instead of loading the whole file first. Edges found
+            before any node are held back until the nodes are added, and
+            the data of a node found after an edge that references it is
+            merged into the node created for the edge.
         """
         if path.isfile(str(json_file)):
-            with open(json_file) as f:
-                json_file = json.load(f)
+            if str(json_file).endswith(_NDJSON_EXTENSIONS):
+                with open(json_file, "rb") as f:
+                    self._add_json_elements(
+                        _iter_ndjson_elements(f),
+                        chunk_size or _JSON_READ_SIZE,
+                        directed,
+                        multiple_edges,
+                    )
+                return
+            if chunk_size is not None:
+                with open(json_file, encoding="utf-8") as f:
+                    self._add_json_elements(
+                        _iter_json_elements(f), chunk_size, directed, multiple_edges
+                    )
+                return
+            with open(json_file, "rb") as f:
+                json_file = _json_loads(f.read())
+
+        node_list = [_node_from_json(node) for node in json_file["nodes"]]
+        edge_list = [
+            _edge_from_json(edge, directed, multiple_edges)
+            for edge in json_file.get("edges", [])
+        ]
+
+        with self.batch():
+            self.add_nodes(node_list)
+            if "edges" in json_file:
+                self.add_edges(edge_list, directed, multiple_edges)
+
+    def _add_json_elements(self, elements, chunk_size, directed, multiple_edges):
+        """
+        Adds ("nodes" | "edges", element) pairs to the graph, one batch per
+        chunk_size elements.
+        """
+        node_list = list()
+        edge_list = list()
+        seen_nodes = False
+        # edges are held back until they follow the nodes, otherwise the
+        # nodes they reference would be created without their data
+        nodes_done = False
+        # ids of the nodes created by this import: a node found again, or
+        # after an edge that created it, is merged into the existing node
+        created = set()
+        while True:
+            chunk = list(islice(elements, chunk_size))
+            late_nodes = list()
+            for group, element in chunk:
+                if group == "nodes":
+                    seen_nodes = True
+                    node_id = element["data"]["id"]
+                    if node_id in created:
+                        late_nodes.append(element)
+                    else:
+                        created.add(node_id)
+                        node_list.append(_node_from_json(element))
+                else:
+                    nodes_done = seen_nodes
+                    edge_list.append(_edge_from_json(element, directed, multiple_edges))
+            commit_edges = nodes_done or not chunk
+            with self.batch():
+                self.add_nodes(node_list)
+                for element in late_nodes:
+                    self._update(self._node_index[element["data"]["id"]], element)
+                if commit_edges:
+                    created.update(
+                        node_id
+                        for edge in edge_list
+                        for node_id in (edge.data["source"], edge.data["target"])
+                        if node_id not in self._node_index
+                    )
+                    self.add_edges(edge_list, directed, multiple_edges)
+            node_list = list()
+            if commit_edges:
+                edge_list = list()
+            if not chunk:
+                return
+
+    def add_graph_from_edgelist(
+        self,
+        file_path,
+        directed=False,
+        multiple_edges=False,
+        delimiter=None,
+        comments="#",
+        names=None,
+        header=False,
+        chunk_size=None,
+    ):
+        """
+        Reads an edge list (or CSV) file into the graph, one edge per line:
+        its source, its target, then optionally other values stored in the
+        edge data. Nodes are created for the ids found in the edges.
+
+        The file is read and added to the graph chunk_size lines at a time,
+        and node ids are shared by all the edges that reference them, so
+        large files don't have to be held in memory.
+
+        Parameters
+        ----------
+        file_path : str or path-like
+        directed : bool
+            If True all edges will be given 'directed' as a class.
+        multiple_edges : bool
+            If True, repeated edges between the same nodes are all added.
+        delimiter : str, optional
+            Separator of the values of a line, parsed as CSV. By default
+            values are separated by whitespace.
+        comments : str, optional
+            Marks the start of a comment, the rest of the line is ignored.
+        names : list of str, optional
+            Names of the columns, the first two are the source and target and
+            the next ones are the keys of the edge data. Values are converted
+            to int or float when possible. Columns without a name are ignored.
+        header : bool
+            If True the first line holds the names of the columns, unless
+            names is given.
+        chunk_size : int, optional
+            Number of lines added to the graph at once. Defaults to 65536.
+        """
+        chunk_size = chunk_size or _EDGELIST_CHUNK_SIZE
+        classes = ""
+        if directed:
+            classes += " directed "
+        if multiple_edges:
+            classes += " multiple_edges "
+        # the ids already read, so that the data of every edge references a
+        # single string per node
+        ids = dict()
+        with open(file_path, encoding="utf-8", newline="") as f:
+            rows = _edgelist_rows(f, delimiter, comments)
+            if header:
+                columns = next(rows, [])
+                names = names or columns
+            keys = list(enumerate(names[2:] if names else (), 2))
+            while True:
+                edge_list = list()
+                for row in islice(rows, chunk_size):
+                    if len(row) < 2:
+                        raise ValueError(
+                            f"Edge list row {row} doesn't have a source and a target."
+                        )
+                    source = ids.setdefault(row[0], row[0])
+                    target = ids.setdefault(row[1], row[1])
+                    data = {"source": source, "target": target}
+                    for i, key in keys:
+                        if i < len(row):
+                            data[key] = _edgelist_value(row[i])
+                    edge_list.append(_EdgeRecord(data, classes))
+                if not edge_list:
+                    return
+                self.add_edges(edge_list, directed, multiple_edges)
+
+    def add_graph_from_graphml(
+        self, file_path, directed=False, multiple_edges=False, chunk_size=None
+    ):
+        """
+        Reads a GraphML file into the graph. The file is parsed incrementally
+        and its elements are added chunk_size at a time, so the whole
+        document is never held in memory.
+
+        Node and edge data are typed according to the <key> declarations of
+        the file, and take their default values. Nodes of nested graphs have
+        the node that contains them as their parent. Edge ids are left out,
+        as cytoscape requires ids to be unique among nodes and edges.
+
+        Parameters
+        ----------
+        file_path : str, path-like or file object
+        directed : bool
+            If True all edges will be given 'directed' as a class, otherwise
+            edges are directed as declared in the file.
+        multiple_edges : bool
+            If True, repeated edges between the same nodes are all added.
+        chunk_size : int, optional
+            Number of elements added to the graph at once. Defaults to 16384.
+        """
+        self._add_json_elements(
+            _iter_graphml(file_path),
+            chunk_size or _XML_CHUNK_SIZE,
+            directed,
+            multiple_edges,
+        )
+
+    def add_graph_from_gexf(
+        self, file_path, directed=False, multiple_edges=False, chunk_size=None
+    ):
+        """
+        Reads a GEXF file into the graph. The file is parsed incrementally
+        and its elements are added chunk_size at a time, so the whole
+        document is never held in memory.
+
+        Node and edge data are typed according to the <attribute>
+        declarations of the file, and take their default values. Labels are
+        stored as the "label" data, edge weights as the "weight" data, and
+        viz:position elements as node positions. Dynamic attributes are not
+        supported, the last value of an attribute is kept. Edge ids are left
+        out, as cytoscape requires ids to be unique among nodes and edges.
+
+        Parameters
+        ----------
+        file_path : str, path-like or file object
+        directed : bool
+            If True all edges will be given 'directed' as a class, otherwise
+            edges are directed as declared in the file.
+        multiple_edges : bool
+            If True, repeated edges between the same nodes are all added.
+        chunk_size : int, optional
+            Number of elements added to the graph at once. Defaults to 16384.
+        """
+        self._add_json_elements(
+            _iter_gexf(file_path),
+            chunk_size or _XML_CHUNK_SIZE,
+            directed,
+            multiple_edges,
+        )
 
+    async def add_from_async_iterable(
+        self,
+        aiter,
+        chunk_size=1024,
+        flush_interval=0.1,
+        directed=False,
+        multiple_edges=False,
+    ):
+        """
+        Adds the nodes and edges of an async iterator to the graph without
+        blocking the event loop: elements are converted chunk_size at a time,
+        control is given back to the event loop after every chunk, and the
+        elements received so far are added to the graph (and sent to the
+        frontend) once flush_interval seconds have passed since the last
+        time.
+
+        Awaiting it in a cell keeps the cell busy until the iterator is
+        exhausted. Run it as a task to keep executing other cells meanwhile:
+
+        >>> task = asyncio.ensure_future(graph.add_from_async_iterable(source))
+
+        Parameters
+        ----------
+        aiter : async iterable
+            Yields Node and Edge widgets, or elements in the format of
+            add_graph_from_json with their "group" ("nodes" or "edges"), or
+            with a "source" in the data of edges. Nodes should come before
+            the edges that reference them.
+        chunk_size : int
+            Number of elements converted between two yields to the event loop.
+        flush_interval : float
+            Minimum number of seconds between two additions to the graph.
+        directed : bool
+            If True all edges will be given 'directed' as a class.
+        multiple_edges : bool
+            If True, repeated edges between the same nodes are all added.
+        """
+        loop = asyncio.get_running_loop()
         node_list = list()
-        for node in json_file["nodes"]:
-            node_instance = Node()
-            _set_attributes(node_instance, node)
-            node_list.append(node_instance)
-        self.add_nodes(node_list)
         edge_list = list()
-        if "edges" in json_file:
-            for edge in json_file["edges"]:
-                edge_instance = Edge()
-                _set_attributes(edge_instance, edge)
-                if directed and "directed" not in edge_instance.classes:
-                    edge_instance.classes += " directed "
-                if multiple_edges and "multiple_edges" not in edge_instance.classes:
-                    edge_instance.classes += " multiple_edges "
-                edge_list.append(edge_instance)
+        converted = 0
+        last_flush = loop.time()
+        async for element in aiter:
+            group, element = _async_element_group(element)
+            if isinstance(element, dict):
+                if group == "nodes":
+                    element = _node_from_json(element)
+                else:
+                    element = _edge_from_json(element, directed, multiple_edges)
+            (node_list if group == "nodes" else edge_list).append(element)
+            if loop.time() - last_flush >= flush_interval:
+                with self.batch():
+                    self.add_nodes(node_list)
+                    self.add_edges(edge_list, directed, multiple_edges)
+                node_list = list()
+                edge_list = list()
+                last_flush = loop.time()
+            converted += 1
+            if converted == chunk_size:
+                converted = 0
+                await asyncio.sleep(0)
+        with self.batch():
+            self.add_nodes(node_list)
             self.add_edges(edge_list, directed, multiple_edges)
 
     def add_graph_from_df(
@@ -586,62 +2081,55 @@ class Graph(Widget):
             they do not already have it.
         """
         grouped = df.groupby(groupby_cols)
-        group_nodes = {}
+        group_nodes = list()
         for i, name in enumerate(grouped.groups):
             if not isinstance(name, tuple):
                 name = (name,)
-            group_nodes[name] = Node(data={"id": f"parent-{i}", "name": name})
-
-        graph_nodes = []
-        graph_edges = []
-        for index, row in df.iterrows():
-            parent = group_nodes[tuple(row[groupby_cols])]
-
-            # Includes content to tips
-            tip_content = ""
-            for attribute in attribute_list:
-                tip_content += f"{attribute}: {row[attribute]}\n"
-
-            # Creates a list with all nodes adding them in the correct node parents
-            graph_nodes.append(
-                Node(
-                    data={"id": index, "parent": parent.data["id"], "name": tip_content}
-                )
+            group_nodes.append(
+                _NodeRecord(data={"id": f"parent-{i}", "name": _json_value(name)})
             )
 
-            if not all(edges):
-                # Creates a list with all nodes adding them in the correct node parents
-                graph_nodes.append(
-                    Node(
-                        data={
-                            "id": index,
-                            "parent": parent.data["id"],
-                            "name": tip_content,
-                        }
-                    )
-                )
+        # group codes follow the order of grouped.groups, rows with a missing
+        # value in groupby_cols are not part of any group
+        codes = grouped.ngroup().fillna(-1).astype(int)
+        parents = ("parent-" + codes.astype(str)).astype(object).where(codes >= 0, None)
 
-                if directed:
-                    classes = "directed "
-                else:
-                    classes = ""
-                graph_edges.append(
-                    Edge(
-                        data={
-                            "id": index,
-                            "source": edges[0],
-                            "target": edges[1],
-                            "classes": classes,
-                        }
-                    )
+        # Includes content to tips, one column at a time
+        tips = pd.Series("", index=df.index, dtype=object)
+        for attribute in attribute_list:
+            tips = tips + f"{attribute}: " + df[attribute].astype(str) + "\n"
+
+        # Creates a list with all nodes adding them in the correct node parents
+        graph_nodes = list()
+        for index, parent, tip_content in zip(
+            df.index.tolist(), parents.tolist(), tips.tolist()
+        ):
+            data = {"id": _json_value(index), "name": tip_content}
+            if parent is not None:
+                data["parent"] = parent
+            graph_nodes.append(_NodeRecord(data=data))
+
+        graph_edges = list()
+        if not all(edges):
+            classes = "directed " if directed else ""
+            graph_edges = [
+                _EdgeRecord(
+                    data={
+                        "id": index,
+                        "source": edges[0],
+                        "target": edges[1],
+                        "classes": classes,
+                    }
                 )
+                for index in map(_json_value, df.index.tolist())
+            ]
 
         # Adds group nodes and regular nodes to the graph object
-        all_nodes = list(group_nodes.values()) + graph_nodes
-        self.add_edges(graph_edges, directed, multiple_edges)
-        self.add_nodes(all_nodes)
+        with self.batch():
+            self.add_edges(graph_edges, directed, multiple_edges)
+            self.add_nodes(group_nodes + graph_nodes)
 
-    def add_graph_from_neo4j(self, g):
+    def add_graph_from_neo4j(self, g, chunk_size=None, label_ranks=None):
         """
         Converts a py2neo Neo4j subgraph into a Cytoscape graph. It also adds
         a 'tooltip' node attribute to the Cytoscape graph if it is not present
@@ -649,127 +2137,979 @@ class Graph(Widget):
         set_tooltip_source('tooltip'). The tooltip then displays the node
         properties from the Neo4j nodes.
 
+        Each node gets its most distinctive (least frequently occurring)
+        label as its 'label' attribute. Example: five nodes have the labels
+        (Person|Actor) and five nodes have the labels (Person|Director). In
+        this case the Actor and Director labels have priority over the Person
+        label.
+
         Parameters
         ----------
-        g : py2neo Neo4j subgraph object
+        g : py2neo Neo4j subgraph object or iterable
             See https://py2neo.org/v4/data.html#subgraph-objects
+            g can also be a cursor, or any iterable, of records or subgraphs
+            (nodes, relationships, paths...), which is consumed page by page
+            so the whole result never has to be in memory.
+        chunk_size : int, optional
+            Number of nodes and of relationships of a subgraph, or of items of
+            a cursor, added to the graph at once. Defaults to the whole
+            subgraph, or to 4096 cursor items.
+        label_ranks : dict, optional
+            Priority of the node labels, from label to rank, lowest first.
+            Labels that aren't in it come last. Defaults to ranking the labels
+            by how often they occur in the subgraph, or in the first page of
+            a cursor.
         """
+        if label_ranks is None and _is_neo4j_subgraph(g):
+            label_ranks = _neo4j_label_ranks(g.nodes)
+        seen_relationships = set()
+        for nodes, relationships in _neo4j_pages(g, chunk_size):
+            if label_ranks is None:
+                label_ranks = _neo4j_label_ranks(nodes)
+            node_list = [
+                _neo4j_node_record(node, label_ranks)
+                for node in nodes
+                if node.identity not in self._node_index
+            ]
+            edge_list = list()
+            for rel in relationships:
+                identity = getattr(rel, "identity", None)
+                if identity is not None:
+                    if identity in seen_relationships:
+                        continue
+                    seen_relationships.add(identity)
+                edge_list.append(_neo4j_edge_record(rel))
+
+            # Neo4j graphs are directed and may have multiple edges
+            with self.batch():
+                self.add_nodes(node_list)
+                self.add_edges(edge_list, directed=True, multiple_edges=True)
+
+    def add_graph_from_arrow(
+        self, nodes_table=None, edges_table=None, directed=False, multiple_edges=False
+    ):
+        """
+        Adds the rows of Apache Arrow tables, e.g. read from Parquet files,
+        to the graph. Columns are converted to Python values one at a time
+        rather than row by row, and keep their types.
 
-        def convert_types_to_string(node_attributes):
-            """
-            Converts types not compatible with cytoscape to strings.
-
-            Parameters
-            ----------
-            node_attributes : dictionary of node attributes
-            """
-            for k, v in node_attributes.items():
-                try:
-                    json.dumps(v)
-                except TypeError:
-                    node_attributes[k] = str(v)
-
-            return node_attributes
-
-        def get_node_labels_by_priority(g):
-            """
-            Returns a list of Neo4j node labels in priority order.
-            If a Neo4j node has multiple labels, the most distinctive
-            (least frequently occuring) label will appear first in this list.
-            Example: five nodes have the labels (Person|Actor) and five nodes
-            have the labels (Person|Director). In this case the Actor and Director
-            labels have priority over the Person label.
-
-            Parameters
-            ----------
-            g : py2neo Neo4j subgraph object
-                See https://py2neo.org/v4/data.html#subgraph-objects
-            """
-            counts = dict()
-
-            # This counts the number of instances that a node has a particular
-            # label (a node can have multiple labels in Neo4j).
-            # counts.get(label, 0) initializes the count with zero, and then
-            # increments the value if more of the same labels are encountered.
-            for node in g.nodes:
-                for label in node.labels:
-                    counts[label] = counts.get(label, 0) + 1
-
-            return sorted(counts, key=counts.get)
-
-        def create_tooltip(node_attributes, node_labels):
-            """
-            Returns a string of node labels and node attributes to be used as a tooltip.
-
-            Parameters
-            ----------
-            node_attributes : dictionary of node attributes
-            node_labels : list of node labels
-            """
-            labels = ",".join(label for label in node_labels)
-            attributes = "\n".join(k + ":" + str(v) for k, v in node_attributes.items())
-            return labels + "\n" + attributes
-
-        # select labels to be displayed as node labels
-        priority_labels = get_node_labels_by_priority(g)
-
-        # convert Neo4j nodes to cytoscape nodes
+        Parameters
+        ----------
+        nodes_table : pyarrow.Table, optional
+            Has an "id" column, optionally "classes", "position.x" and
+            "position.y" columns, every other column is node data.
+        edges_table : pyarrow.Table, optional
+            Has "source" and "target" columns, optionally a "classes" column,
+            every other column is edge data.
+        directed : bool
+            If True all edges will be given 'directed' as a class.
+        multiple_edges : bool
+            If True, repeated edges between the same nodes are all added.
+        """
         node_list = list()
-        for node in g.nodes:
-            node_attributes = dict(node)
+        if nodes_table is not None:
+            for row in _arrow_rows(nodes_table):
+                position = {
+                    axis: row.pop(f"position.{axis}")
+                    for axis in ("x", "y")
+                    if f"position.{axis}" in row
+                }
+                classes = row.pop("classes", "")
+                node_list.append(
+                    _NodeRecord(
+                        row, classes, {"position": position} if position else None
+                    )
+                )
+        edge_list = list()
+        if edges_table is not None:
+            for row in _arrow_rows(edges_table):
+                classes = row.pop("classes", "")
+                if directed and "directed" not in classes:
+                    classes += " directed "
+                if multiple_edges and "multiple_edges" not in classes:
+                    classes += " multiple_edges "
+                edge_list.append(_EdgeRecord(row, classes))
+
+        with self.batch():
+            self.add_nodes(node_list)
+            self.add_edges(edge_list, directed, multiple_edges)
 
-            # convert Neo4j specific types to string
-            node_attributes = convert_types_to_string(node_attributes)
+    def to_arrow(self):
+        """
+        Returns the nodes and the edges of the graph as Apache Arrow tables,
+        in the format read by add_graph_from_arrow.
+
+        Returns
+        -------
+        (pyarrow.Table, pyarrow.Table)
+            The nodes and the edges. Data values that don't fit the type of
+            their column are stored as JSON strings.
+        """
+        if pa is None:
+            raise ModuleNotFoundError(
+                "Graph.to_arrow requires pyarrow to be installed."
+            )
+        nodes, edges = self._element_tables()
+        return _arrow_table(nodes), _arrow_table(edges)
 
-            # create tooltip text string
-            if "tooltip" not in node_attributes:
-                tooltip_text = create_tooltip(node_attributes, node.labels)
-                node_attributes["tooltip"] = tooltip_text
+    def to_dataframe(self):
+        """
+        Returns the nodes and the edges of the graph as Pandas DataFrames,
+        with the same columns as the tables of to_arrow.
 
-            # assign unique id to node
-            node_attributes["id"] = node.identity
+        Returns
+        -------
+        (pandas.DataFrame, pandas.DataFrame)
+            The nodes and the edges, with nulls for missing data values.
+        """
+        if pd is None:
+            raise ModuleNotFoundError(
+                "Graph.to_dataframe requires Pandas to be installed."
+            )
+        nodes, edges = self._element_tables()
+        return _dataframe(nodes), _dataframe(edges)
 
-            # assign class label with the highest priority
-            index = len(priority_labels)
-            for label in node.labels:
-                index = min(index, priority_labels.index(label))
+    def to_json(self):
+        """
+        Returns the graph as a Cytoscape JSON graph, the format read by
+        add_graph_from_json.
+
+        Returns
+        -------
+        dict
+            ``{"nodes": [...], "edges": [...]}`` where each element has its
+            "data", and its "classes" and "position" when they are set.
+        """
+        return {
+            "nodes": [_element_json(node) for node in self._elements("nodes")],
+            "edges": [_element_json(edge) for edge in self._elements("edges")],
+        }
 
-            node_attributes["label"] = priority_labels[index]
+    def to_networkx(self, directed=None, multiple_edges=None):
+        """
+        Returns the graph as a networkx graph, the format read by
+        add_graph_from_networkx. Nodes are keyed by their id and have the
+        rest of their data as attributes, as well as their classes and
+        position when they are set.
 
-            # create node
-            node_instance = Node()
-            _set_attributes(node_instance, node_attributes)
-            node_list.append(node_instance)
+        Parameters
+        ----------
+        directed : bool, optional
+            Whether to return a directed graph, by default if any edge of the
+            graph is directed.
+        multiple_edges : bool, optional
+            Whether to return a multigraph, by default if any edge of the
+            graph is one of multiple edges.
+
+        Returns
+        -------
+        networkx.Graph, DiGraph, MultiGraph or MultiDiGraph
+        """
+        if nx is None:
+            raise ModuleNotFoundError(
+                "Graph.to_networkx requires networkx to be installed."
+            )
+        node_list = self._elements("nodes")
+        edge_list = self._elements("edges")
+        if directed is None:
+            directed = any("directed" in edge.classes for edge in edge_list)
+        if multiple_edges is None:
+            multiple_edges = any("multiple_edges" in edge.classes for edge in edge_list)
+        if multiple_edges:
+            g = nx.MultiDiGraph() if directed else nx.MultiGraph()
+        else:
+            g = nx.DiGraph() if directed else nx.Graph()
+        g.add_nodes_from(
+            (node.data["id"], _networkx_attributes(node, ("id",))) for node in node_list
+        )
+        g.add_edges_from(
+            (
+                edge.data["source"],
+                edge.data["target"],
+                _networkx_attributes(edge, ("source", "target")),
+            )
+            for edge in edge_list
+        )
+        return g
 
-        self.add_nodes(node_list)
+    def _element_tables(self):
+        """
+        Returns the columns of the nodes and the edges, see _element_columns.
+        Node positions are in "position.x" and "position.y" columns.
+        """
+        node_list = self._elements("nodes")
+        nodes = _element_columns(node_list, ("id",))
+        for axis in ("x", "y"):
+            position = [
+                getattr(node, "position", {}).get(axis, _snapshot.MISSING)
+                for node in node_list
+            ]
+            if any(value is not _snapshot.MISSING for value in position):
+                nodes[f"position.{axis}"] = position
+        edges = _element_columns(self._elements("edges"), ("source", "target"))
+        return nodes, edges
+
+    def add_graph_from_sparse(self, matrix, ids=None, directed=False):
+        """
+        Adds the graph of a square adjacency matrix: node i is connected to
+        node j by as many edges as the value of the (i, j) entry.
 
-        # convert Neo4j relationships to cytoscape edges
-        edge_list = list()
-        for rel in g.relationships:
-            edge_instance = Edge()
+        Parameters
+        ----------
+        matrix : scipy sparse array or matrix
+            Entries are the number of edges between two nodes, so they must
+            be positive integers. If the graph is not directed, only the
+            upper triangle (including the diagonal) is read.
+        ids : array_like, optional
+            Id of the node of every row and column. Defaults to the row
+            numbers as strings. Every node is added, including the ones
+            without edges.
+        directed : bool
+            If True all edges will be given 'directed' as a class.
+        """
+        if np is None:
+            raise ModuleNotFoundError(
+                "Graph.add_graph_from_sparse requires NumPy to be installed."
+            )
+        matrix = matrix.tocoo()
+        length = matrix.shape[0]
+        if matrix.shape != (length, length):
+            raise ValueError(f"Adjacency matrix should be square, got {matrix.shape}.")
+        if ids is None:
+            ids = [str(i) for i in range(length)]
+        # NumPy ids are converted to Python values that can be synced
+        id_list = [_json_value(node_id) for node_id in ids]
+        if len(id_list) != length:
+            raise ValueError(f"Expected {length} ids, got {len(id_list)}.")
+        ids = np.empty(length, dtype=object)
+        ids[:] = id_list
+        if len(set(id_list)) != length:
+            raise ValueError("Adjacency matrix ids should be unique.")
+        rows, cols, counts = matrix.row, matrix.col, matrix.data
+        if not directed:
+            upper = rows <= cols
+            rows, cols, counts = rows[upper], cols[upper], counts[upper]
+        present = counts != 0
+        rows, cols, counts = rows[present], cols[present], counts[present]
+        if np.any(counts < 0) or np.any(counts != np.round(counts)):
+            raise ValueError("Adjacency matrix entries should be positive integers.")
+        counts = counts.astype(np.intp)
+        multiple_edges = bool(len(counts)) and counts.max() > 1
+
+        classes = ""
+        if directed:
+            classes += " directed "
+        if multiple_edges:
+            classes += " multiple_edges "
+        sources = ids[np.repeat(rows, counts)].tolist()
+        targets = ids[np.repeat(cols, counts)].tolist()
+        with _gc_paused():
+            node_list = [_NodeRecord({"id": node_id}) for node_id in id_list]
+            edge_list = [
+                _EdgeRecord({"source": source, "target": target}, classes)
+                for source, target in zip(sources, targets)
+            ]
+        if self._node_index:
+            with self.batch():
+                self.add_nodes(node_list)
+                self.add_edges(edge_list, directed, multiple_edges)
+            return
+
+        # the graph is empty, so its adjacency is the matrix itself, counted
+        # the way _add_adjacency does: edges that aren't directed count in
+        # both directions, self loops once, and only once per pair without
+        # multiple edges
+        if not directed:
+            off = rows != cols
+            rows, cols = (
+                np.concatenate([rows, cols[off]]),
+                np.concatenate([cols, rows[off]]),
+            )
+            counts = np.concatenate([counts, counts[off]])
+        adjacency = scipy.sparse.csr_array(
+            (counts, (rows, cols)), shape=(length, length)
+        )
+        if not multiple_edges:
+            adjacency.data[:] = 1
+        with self.batch(), _gc_paused():
+            self._node_index.update(zip(id_list, node_list))
+            self._radj.update(_sparse_dicts(adjacency.T.tocsr(), id_list))
+            for edge in edge_list:
+                self._add_edge_to_index(edge)
+            # sent whole rather than as patches
+            self._adj_patches = None
+            self._adj = _sparse_dicts(adjacency, id_list)
+            self._pending_nodes.extend(node_list)
+            self._pending_edges.extend(edge_list)
+
+    def to_sparse(self):
+        """
+        Returns the adjacency matrix of the graph: the (i, j) entry is the
+        number of edges from node i to node j, edges that aren't directed
+        count in both directions, and self loops once.
+
+        Returns
+        -------
+        (scipy.sparse.csr_array, numpy.ndarray)
+            The adjacency matrix, and the id of the node of every row and
+            column.
+        """
+        if scipy is None:
+            raise ModuleNotFoundError("Graph.to_sparse requires SciPy to be installed.")
+        adj = self._adj
+        ids = np.array(list(adj), dtype=object)
+        index = dict(zip(adj, range(len(ids))))
+        lengths = np.fromiter(map(len, adj.values()), dtype=np.intp, count=len(ids))
+        size = int(lengths.sum())
+        rows = np.repeat(np.arange(len(ids)), lengths)
+        cols = np.fromiter(
+            (index[target] for targets in adj.values() for target in targets),
+            dtype=np.intp,
+            count=size,
+        )
+        counts = np.fromiter(
+            (count for targets in adj.values() for count in targets.values()),
+            dtype=np.intp,
+            count=size,
+        )
+        matrix = scipy.sparse.csr_array(
+            (counts, (rows, cols)), shape=(len(ids), len(ids))
+        )
+        return matrix, ids
 
-            # create dictionaries of relationship
-            rel_attributes = dict(rel)
+    def save(self, file_path):
+        """
+        Saves the graph to a compact binary snapshot: node ids, edge
+        endpoints, classes, node positions and data are stored column by
+        column. Data values that aren't numbers or strings are stored as JSON.
 
-            # convert Neo4j specific types to string
-            rel_attributes = convert_types_to_string(rel_attributes)
+        Parameters
+        ----------
+        file_path : str or path-like
+        """
+        if np is None:
+            raise ModuleNotFoundError("Graph.save requires NumPy to be installed.")
+        nodes, edges = self._element_tables()
+        _snapshot.write(
+            file_path,
+            {
+                "nodes": (len(nodes["classes"]), nodes),
+                "edges": (len(edges["classes"]), edges),
+            },
+        )
 
-            # assign name of the relationship
-            if "name" not in rel_attributes:
-                rel_attributes["name"] = rel.__class__.__name__
+    @classmethod
+    def load(cls, file_path, **kwargs):
+        """
+        Creates a graph from a snapshot written by Graph.save. The file is
+        memory-mapped and the elements are built straight from its columns.
 
-            # assign unique node ids
-            edge_instance.data["source"] = rel.start_node.identity
-            edge_instance.data["target"] = rel.end_node.identity
-            _set_attributes(edge_instance, rel_attributes)
+        Graph keeps a Python record per element, which takes about 3 seconds
+        for a million elements. ArrayGraph.load reads the same snapshots in
+        under a second and is better suited to graphs of that size.
 
-            edge_list.append(edge_instance)
+        Parameters
+        ----------
+        file_path : str or path-like
+        kwargs : passed to the Graph constructor.
+        """
+        if np is None:
+            raise ModuleNotFoundError("Graph.load requires NumPy to be installed.")
+        tables = _snapshot.read(file_path)
+        with _gc_paused():
+            node_list = _snapshot_records(tables["nodes"], ("id",), _NodeRecord)
+            edge_list = _snapshot_records(
+                tables["edges"], ("source", "target"), _EdgeRecord
+            )
+        graph = cls(**kwargs)
+        graph._insert_elements(node_list, edge_list)
+        return graph
 
-        # Neo4j graphs are directed and may have multiple edges
-        directed = True
-        multiple_edges = True
+    def _insert_elements(self, nodes, edges):
+        """
+        Adds nodes and edges that are known to form a valid graph, e.g. read
+        back from a snapshot, without checking them for duplicates. Whether
+        an edge is directed or one of multiple edges is read from its classes.
+        """
+        if not self._node_index:
+            self._insert_into_empty(nodes, edges)
+            return
+        with self.batch():
+            for node in nodes:
+                self._add_node_to_index(node)
+            for edge in edges:
+                source, target = edge.data["source"], edge.data["target"]
+                multiple_edges = "multiple_edges" in edge.classes
+                self._add_edge_to_index(edge)
+                self._add_adjacency(source, target, multiple_edges)
+                if "directed" not in edge.classes and source != target:
+                    self._add_adjacency(target, source, multiple_edges)
+            self._pending_nodes.extend(nodes)
+            self._pending_edges.extend(edges)
+
+    def _insert_into_empty(self, nodes, edges):
+        """
+        _insert_elements for an empty graph: the indexes are built in one
+        pass, the way the index helpers would, and _adj is sent whole.
+        """
+        out_edges = self._out_edges
+        in_edges = self._in_edges
+        edge_index = self._edge_index
+        with _gc_paused():
+            adj = {node.data["id"]: dict() for node in nodes}
+            radj = {node_id: dict() for node_id in adj}
+            for edge in edges:
+                data = edge.data
+                source, target = data["source"], data["target"]
+                out_edges.setdefault(source, dict())[edge] = None
+                in_edges.setdefault(target, dict())[edge] = None
+                if "id" in data:
+                    edge_index[data["id"]] = edge
+                multiple_edges = "multiple_edges" in edge.classes
+                targets = adj[source]
+                if multiple_edges and target in targets:
+                    targets[target] += 1
+                else:
+                    targets[target] = 1
+                radj[target][source] = targets[target]
+                if "directed" not in edge.classes and source != target:
+                    sources = adj[target]
+                    if multiple_edges and source in sources:
+                        sources[source] += 1
+                    else:
+                        sources[source] = 1
+                    radj[source][target] = sources[source]
+        with self.batch():
+            self._node_index.update(zip(adj, nodes))
+            self._radj.update(radj)
+            # sent whole rather than as patches
+            self._adj_patches = None
+            self._adj = adj
+            self._pending_nodes.extend(nodes)
+            self._pending_edges.extend(edges)
+
+
+def _element_columns(elements, keys):
+    """
+    Splits nodes or edges into snapshot columns: one for each of keys and
+    for the classes, and a "data." prefixed one for every other data key.
+    """
+    columns = {key: [element.data[key] for element in elements] for key in keys}
+    columns["classes"] = [element.classes for element in elements]
+    names = dict.fromkeys(
+        name for element in elements for name in element.data if name not in keys
+    )
+    for name in names:
+        columns[f"data.{name}"] = [
+            element.data.get(name, _snapshot.MISSING) for element in elements
+        ]
+    return columns
+
+
+def _snapshot_records(table, keys, record_class):
+    """
+    Inverse of _element_columns: builds the element records of a snapshot
+    table column by column. The data of every row is zipped out of the
+    columns without missing values, and the other columns are only set on
+    the rows that have a value.
+    """
+    columns = _snapshot.column_lists(table)
+    names = list()
+    full_columns = list()
+    partial_columns = list()
+    for name, (values, present) in columns.items():
+        if name.startswith("data."):
+            name = name[len("data.") :]
+        elif name not in keys:
+            continue
+        if present is None:
+            names.append(name)
+            full_columns.append(values)
+        else:
+            partial_columns.append((name, values, present))
+    datas = [dict(zip(names, row)) for row in zip(*full_columns)]
+    for name, values, present in partial_columns:
+        for data, value, has_value in zip(datas, values, present):
+            if has_value:
+                data[name] = value
+
+    classes = columns["classes"][0] if "classes" in columns else [""] * len(datas)
+    records = [record_class(data, c) for data, c in zip(datas, classes)]
+    for axis in ("x", "y"):
+        if f"position.{axis}" not in columns:
+            continue
+        values, present = columns[f"position.{axis}"]
+        if present is None:
+            present = [True] * len(values)
+        for record, value, has_value in zip(records, values, present):
+            if has_value:
+                if record.attrs is None:
+                    record.attrs = {"position": dict()}
+                record.attrs["position"][axis] = value
+    return records
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pauses the cyclic garbage collector, which would otherwise run over and
+    over while millions of element records are allocated.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _sparse_dicts(matrix, keys):
+    """Converts a CSR matrix to a dict of dicts of its non zero entries."""
+    cols = [keys[col] for col in matrix.indices.tolist()]
+    values = matrix.data.tolist()
+    bounds = matrix.indptr.tolist()
+    return {
+        key: dict(zip(cols[start:end], values[start:end]))
+        for key, start, end in zip(keys, bounds[:-1], bounds[1:])
+    }
+
+
+def _arrow_rows(table):
+    """
+    Yields the rows of an Arrow table as dicts, leaving out null values.
+    Data columns are named without the "data." prefix of _element_columns.
+    """
+    names = table.column_names
+    columns = [column.to_pylist() for column in table.columns]
+    # temporal, decimal, binary... values aren't sent as they are
+    for i, column in enumerate(table.columns):
+        if not _arrow_is_json(column.type):
+            columns[i] = [_json_value(value) for value in columns[i]]
+    for values in zip(*columns):
+        yield {name: value for name, value in zip(names, values) if value is not None}
+
+
+def _arrow_is_json(arrow_type):
+    return (
+        pa.types.is_string(arrow_type)
+        or pa.types.is_large_string(arrow_type)
+        or pa.types.is_integer(arrow_type)
+        or pa.types.is_floating(arrow_type)
+        or pa.types.is_boolean(arrow_type)
+        or pa.types.is_null(arrow_type)
+    )
+
+
+def _table_columns(columns):
+    """
+    Yields the (name, values) of the output of _element_columns, without
+    the "data." prefix and with None for missing values.
+    """
+    for name, values in columns.items():
+        if name.startswith("data."):
+            name = name[len("data.") :]
+        yield name, [None if value is _snapshot.MISSING else value for value in values]
+
+
+def _dataframe(columns):
+    return pd.DataFrame(dict(_table_columns(columns)))
 
-        self.add_edges(edge_list, directed, multiple_edges)
+
+def _element_json(element):
+    """Returns a node or edge in the format read by add_graph_from_json."""
+    json_element = {"data": dict(element.data)}
+    if element.classes:
+        json_element["classes"] = element.classes
+    position = getattr(element, "position", None)
+    if position:
+        json_element["position"] = dict(position)
+    return json_element
+
+
+def _networkx_attributes(element, keys):
+    """Inverse of _attributes_payload for the data, classes and position."""
+    attributes = {k: v for k, v in element.data.items() if k not in keys}
+    if element.classes:
+        attributes["classes"] = element.classes
+    position = getattr(element, "position", None)
+    if position:
+        attributes["position"] = dict(position)
+    return attributes
+
+
+def _arrow_table(columns):
+    """Inverse of _arrow_rows for the output of _element_columns."""
+    arrays = dict()
+    for name, values in _table_columns(columns):
+        try:
+            arrays[name] = pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays[name] = pa.array(
+                [None if value is None else json.dumps(value) for value in values]
+            )
+    return pa.table(arrays)
+
+
+def _arrow_arrays(table, keys):
+    """
+    Returns the columns of an Arrow table as NumPy arrays, gathering the
+    ones that aren't keys or classes under "data". Numeric columns without
+    nulls are not copied, nulls are read as NaN or as empty strings.
+    """
+    arrays = {"data": dict()}
+    for name, column in zip(table.column_names, table.columns):
+        if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            column = column.fill_null("")
+        values = column.to_numpy(zero_copy_only=False)
+        if values.dtype.kind == "O":
+            values = values.astype(str)
+        if name in keys or name == "classes":
+            arrays[name] = values
+        else:
+            arrays["data"][name] = values
+    return arrays
+
+
+def _as_id_array(ids):
+    return np.asarray(ids).astype(str).ravel()
+
+
+def _as_column(values, length, name):
+    column = np.asarray(values).ravel()
+    if len(column) != length:
+        raise ValueError(
+            f"Column {name!r} has {len(column)} values, expected {length}."
+        )
+    return column
+
+
+def _pad_column(column, length):
+    """Extends a column up to length with empty values."""
+    if column.dtype.kind in "iu":
+        column = column.astype(float)
+    if column.dtype.kind in "fc":
+        fill = np.full(length - len(column), np.nan, dtype=column.dtype)
+    elif column.dtype.kind in "US":
+        fill = np.full(length - len(column), "", dtype=column.dtype)
+    else:
+        fill = np.zeros(length - len(column), dtype=column.dtype)
+    return np.concatenate([column, fill])
+
+
+def _snapshot_arrays(table):
+    """
+    Returns the columns of a snapshot table as arrays, the "data." prefixed
+    ones being gathered under "data". Missing numbers are read as NaN.
+    """
+    _length, columns = table
+    arrays = {"data": dict()}
+    for name, (values, mask) in columns.items():
+        if isinstance(values, _snapshot.StringColumn):
+            values = np.array(values.tolist(), dtype=object if values.is_json else str)
+        elif mask is not None:
+            values = np.where(mask, values, np.nan)
+        if name.startswith("data."):
+            arrays["data"][name[len("data.") :]] = values
+        elif name in ("id", "source", "target", "classes"):
+            arrays[name] = values
+    return arrays
+
+
+class ArrayGraph(Widget):
+    """Columnar Graph Widget
+
+    Unlike Graph, nodes and edges are not widgets. Ids, edge endpoints,
+    classes and data columns are stored in NumPy arrays and synced to the
+    frontend as binary buffers, which makes it suitable for large graphs.
+    """
+
+    _model_name = Unicode("ArrayGraphModel").tag(sync=True)
+    _model_module = Unicode(module_name).tag(sync=True)
+    _model_module_version = Unicode(module_version).tag(sync=True)
+    _view_module = Unicode(module_name).tag(sync=True)
+    _view_module_version = Unicode(module_version).tag(sync=True)
+
+    # {"id": ids, "classes": classes, "data": {name: column}}
+    _nodes = Dict().tag(sync=True, **column_serialization)
+    # {"source": ids, "target": ids, "classes": classes, "data": {name: column}}
+    _edges = Dict().tag(sync=True, **column_serialization)
+
+    def __init__(
+        self,
+        node_ids=None,
+        edge_sources=None,
+        edge_targets=None,
+        directed=False,
+        **kwargs,
+    ):
+        """
+        Initializes the columnar graph.
+
+        Parameters
+        ----------
+        node_ids : array_like, optional
+        edge_sources : array_like, optional
+        edge_targets : array_like, optional
+            Must have the same length as edge_sources.
+        directed : bool
+            If True all edges will be given 'directed' as a class.
+        """
+        if np is None:
+            raise ModuleNotFoundError("ArrayGraph requires NumPy to be installed.")
+        super().__init__(**kwargs)
+        with self.hold_sync():
+            self.clear()
+            if node_ids is not None:
+                self.set_nodes(node_ids)
+            if edge_sources is not None or edge_targets is not None:
+                self.set_edges(edge_sources, edge_targets, directed=directed)
+
+    @property
+    def node_ids(self):
+        return self._nodes["id"]
+
+    @property
+    def node_classes(self):
+        return self._nodes["classes"]
+
+    @property
+    def node_data(self):
+        return self._nodes["data"]
+
+    @property
+    def edge_sources(self):
+        return self._edges["source"]
+
+    @property
+    def edge_targets(self):
+        return self._edges["target"]
+
+    @property
+    def edge_classes(self):
+        return self._edges["classes"]
+
+    @property
+    def edge_data(self):
+        return self._edges["data"]
+
+    def set_nodes(self, ids, classes=None, data=None):
+        """
+        Replaces the nodes of the graph.
+
+        Parameters
+        ----------
+        ids : array_like of str
+        classes : array_like of str or str, optional
+            Either one class string per node or a single one for all of them.
+        data : dict of array_like, optional
+            Data columns, numeric or string, one value per node.
+        """
+        ids = _as_id_array(ids)
+        self._nodes = self._make_columns({"id": ids}, classes, data)
+
+    def set_edges(self, sources, targets, classes=None, data=None, directed=False):
+        """
+        Replaces the edges of the graph. If either the source or target node
+        of an edge is not already in the graph it will be added to the nodes.
+
+        Parameters
+        ----------
+        sources : array_like of str
+        targets : array_like of str
+        classes : array_like of str or str, optional
+            Either one class string per edge or a single one for all of them.
+        data : dict of array_like, optional
+            Data columns, numeric or string, one value per edge.
+        directed : bool
+            If True all edges will be given 'directed' as a class.
+        """
+        sources = _as_id_array(sources)
+        targets = _as_column(_as_id_array(targets), len(sources), "target")
+        if directed:
+            if classes is None:
+                classes = "directed"
+            else:
+                classes = np.char.add(np.asarray(classes).astype(str), " directed")
+        edges = self._make_columns(
+            {"source": sources, "target": targets}, classes, data
+        )
+
+        endpoints = np.unique(np.concatenate([sources, targets]))
+        missing = endpoints[~np.isin(endpoints, self.node_ids)]
+        with self.hold_sync():
+            if len(missing):
+                self._append_nodes(missing)
+            self._edges = edges
+
+    def clear(self):
+        """
+        Remove all the nodes and edges from the graph.
+        """
+        with self.hold_sync():
+            self._edges = self._make_columns(
+                {"source": _as_id_array([]), "target": _as_id_array([])}
+            )
+            self._nodes = self._make_columns({"id": _as_id_array([])})
+
+    def save(self, file_path):
+        """
+        Saves the graph to a compact binary snapshot, see Graph.save.
+
+        Parameters
+        ----------
+        file_path : str or path-like
+        """
+        tables = dict()
+        for name, columns in (("nodes", self._nodes), ("edges", self._edges)):
+            table = {key: value for key, value in columns.items() if key != "data"}
+            for key, value in columns["data"].items():
+                table[f"data.{key}"] = value
+            tables[name] = (len(columns["classes"]), table)
+        _snapshot.write(file_path, tables)
+
+    @classmethod
+    def load(cls, file_path, **kwargs):
+        """
+        Creates a graph from a snapshot written by ArrayGraph.save or
+        Graph.save. Numeric columns stay memory-mapped from the file.
+
+        Parameters
+        ----------
+        file_path : str or path-like
+        kwargs : passed to the ArrayGraph constructor.
+        """
+        tables = _snapshot.read(file_path)
+        nodes, edges = (_snapshot_arrays(tables[name]) for name in ("nodes", "edges"))
+        graph = cls(**kwargs)
+        with graph.hold_sync():
+            graph.set_nodes(nodes["id"], nodes.get("classes"), nodes["data"])
+            # the nodes of a snapshot include the endpoints of its edges
+            graph._edges = graph._make_columns(
+                {
+                    "source": _as_id_array(edges["source"]),
+                    "target": _as_id_array(edges["target"]),
+                },
+                edges.get("classes"),
+                edges["data"],
+            )
+        return graph
+
+    @classmethod
+    def from_arrow(cls, nodes_table, edges_table=None, directed=False, **kwargs):
+        """
+        Creates a graph from Apache Arrow tables, e.g. read from Parquet
+        files. Numeric columns are shared with the tables rather than copied
+        when they don't have nulls, and all of them are sent to the frontend
+        as binary buffers.
+
+        Parameters
+        ----------
+        nodes_table : pyarrow.Table
+            Has an "id" column, optionally a "classes" column, every other
+            column is node data.
+        edges_table : pyarrow.Table, optional
+            Has "source" and "target" columns, optionally a "classes" column,
+            every other column is edge data.
+        directed : bool
+            If True all edges will be given 'directed' as a class.
+        kwargs : passed to the ArrayGraph constructor.
+        """
+        if pa is None:
+            raise ModuleNotFoundError(
+                "ArrayGraph.from_arrow requires pyarrow to be installed."
+            )
+        nodes = _arrow_arrays(nodes_table, ("id",))
+        graph = cls(**kwargs)
+        with graph.hold_sync():
+            graph.set_nodes(nodes["id"], nodes.get("classes"), nodes["data"])
+            if edges_table is not None:
+                edges = _arrow_arrays(edges_table, ("source", "target"))
+                graph.set_edges(
+                    edges["source"],
+                    edges["target"],
+                    edges.get("classes"),
+                    edges["data"],
+                    directed=directed,
+                )
+        return graph
+
+    def to_arrow(self):
+        """
+        Returns the nodes and the edges of the graph as Apache Arrow tables,
+        in the format read by from_arrow. Numeric columns are not copied.
+
+        Returns
+        -------
+        (pyarrow.Table, pyarrow.Table)
+        """
+        if pa is None:
+            raise ModuleNotFoundError(
+                "ArrayGraph.to_arrow requires pyarrow to be installed."
+            )
+        tables = list()
+        for columns in (self._nodes, self._edges):
+            arrays = {k: pa.array(v) for k, v in columns.items() if k != "data"}
+            arrays.update({k: pa.array(v) for k, v in columns["data"].items()})
+            tables.append(pa.table(arrays))
+        return tuple(tables)
+
+    def _make_columns(self, columns, classes=None, data=None):
+        length = len(next(iter(columns.values())))
+        if classes is None:
+            classes = ""
+        if isinstance(classes, str):
+            columns["classes"] = np.full(length, classes)
+        else:
+            columns["classes"] = _as_column(classes, length, "classes").astype(str)
+        columns["data"] = {
+            name: _as_column(values, length, name)
+            for name, values in (data or {}).items()
+        }
+        return columns
+
+    def _append_nodes(self, ids):
+        nodes = self._nodes
+        length = len(nodes["id"]) + len(ids)
+        self._nodes = {
+            "id": np.concatenate([nodes["id"], ids]),
+            "classes": _pad_column(nodes["classes"], length),
+            "data": {
+                name: _pad_column(column, length)
+                for name, column in nodes["data"].items()
+            },
+        }
+
+
+def _event_payload(target, fields):
+    """
+    Returns the given fields of the JSON of the target of an event, like
+    eventPayload in src/widget.ts.
+    """
+    payload = dict()
+    for field in fields:
+        if field in ("id", "source", "target"):
+            field = f"data.{field}"
+        if field.startswith("data."):
+            key = field[len("data.") :]
+            data = payload.setdefault("data", dict())
+            if key in target.get("data", ()):
+                data[key] = target["data"][key]
+        elif field in target:
+            payload[field] = target[field]
+    return payload
+
+
+def _get_by_str(index, key, default=None):
+    """
+    Returns the value of an index of node ids for key, an id as sent by
+    the frontend: integer ids are sent as strings.
+    """
+    if key in index:
+        return index[key]
+    if isinstance(key, str) and key.lstrip("-").isdigit() and str(int(key)) == key:
+        return index.get(int(key), default)
+    return default
 
 
 class CytoscapeWidget(DOMWidget):
@@ -842,8 +3182,14 @@ class CytoscapeWidget(DOMWidget):
     _interaction_handlers = CytoInteractionDict({}).tag(
         sync=True, **interaction_serialization
     )
+    # throttling of the interaction events, by widget type and event type
+    _interaction_options = Dict().tag(sync=True)
 
-    graph = Instance(Graph, args=tuple()).tag(sync=True, **widget_serialization)
+    graph = Union([Instance(Graph, args=tuple()), Instance(ArrayGraph)]).tag(
+        sync=True, **widget_serialization
+    )
+    # ids of nodes and their flattened (x, y) positions, set by set_positions
+    _positions = Dict().tag(sync=True, **column_serialization)
 
     def __init__(self, graph=None, **kwargs):
         """
@@ -852,12 +3198,19 @@ class CytoscapeWidget(DOMWidget):
         Parameters
         ----------
         graph: graph: string, dict, pandas.DataFrame, networkx.Graph,
-               neo4j.Graph, Graph object, optional
+               neo4j.Graph, Graph or ArrayGraph object, optional
                The graph to initialize with. Equivalent to calling the
                appropriate ``CytoscapeWidget.graph.add_graph_from_` method.
         """
         super().__init__(**kwargs)
 
+        # the last positions sent by the frontend, and the futures of
+        # get_positions_async waiting for the next ones
+        self._rendered_positions = None
+        self._position_waiters = list()
+        # the options and the handler of each callback, by widget type and
+        # event type, merged into _interaction_options
+        self._callback_options = dict()
         self.on_msg(self._handle_interaction)
         self.graph = Graph()
 
@@ -867,7 +3220,7 @@ class CytoscapeWidget(DOMWidget):
             self.graph.add_graph_from_json(graph)
         elif pd and isinstance(graph, pd.DataFrame):
             self.graph.add_graph_from_df(graph, **kwargs)
-        elif isinstance(graph, Graph):
+        elif isinstance(graph, (Graph, ArrayGraph)):
             self.graph = graph
         elif py2neo and isinstance(graph, py2neo.Graph):
             self.graph.add_graph_from_neo4j(graph)
@@ -878,7 +3231,17 @@ class CytoscapeWidget(DOMWidget):
     # the value of `_interaction_handlers` through the traitlet and allow the
     # serialized version to propagate to the frontend, where the client code
     # will add event handlers to the DOM graph.
-    def on(self, widget_type, event_type, callback, remove=False):
+    def on(
+        self,
+        widget_type,
+        event_type,
+        callback,
+        remove=False,
+        throttle_ms=0,
+        coalesce=False,
+        fields=None,
+        resolve=False,
+    ):
         """
         Register a callback to execute when the user interacts with the graph.
 
@@ -901,7 +3264,50 @@ class CytoscapeWidget(DOMWidget):
             user-provided data in the node).
         remove : bool, optional
             Set to true to remove the callback from the list of callbacks.
+        throttle_ms : int, optional
+            If set, the frontend sends the events of this type at most once
+            every throttle_ms milliseconds, gathering the events of that
+            interval in a single message. The callbacks are then called
+            with a list of targets instead of a single one, so all the
+            callbacks of this widget and event type must be registered with
+            the same throttle_ms and coalesce.
+        coalesce : bool, optional
+            If true along with throttle_ms, only the last event of each
+            element in an interval is sent, e.g. the last position of a
+            node dragged around.
+        fields : iterable of str, optional
+            Keys of the JSON-dictionary of the target to pass to the callback
+            instead of the whole of it, e.g. ("id", "position").
+            "data.<key>" passes a single data key, and "id" is short for
+            "data.id". The frontend only sends the keys that the callbacks
+            of this widget and event type ask for.
+        resolve : bool, optional
+            If true, the callback is called with the Node or Edge widget of
+            the graph that has the id of the target instead, which only
+            requires the frontend to send its id. Targets that can't be
+            found are passed with their id and the fields.
         """
+        handlers = self._callback_options.setdefault((widget_type, event_type), dict())
+        if not remove:
+            throttling = (throttle_ms, bool(throttle_ms and coalesce))
+            for other, (options, _handler) in handlers.items():
+                other_throttling = (options["throttle_ms"], options["coalesce"])
+                if other != callback and other_throttling != throttling:
+                    raise ValueError(
+                        f"The callbacks of {widget_type} {event_type} events are "
+                        "registered with (throttle_ms, coalesce) = "
+                        f"{other_throttling}, not {throttling}."
+                    )
+            if resolve:
+                fields = [*(fields or ()), "id", "source", "target"]
+            elif fields is not None:
+                fields = list(fields)
+            event_options = {
+                "throttle_ms": throttling[0],
+                "coalesce": throttling[1],
+                "fields": fields,
+            }
+
         if widget_type not in self._interaction_handlers:
             self._interaction_handlers = dict(
                 [
@@ -928,16 +3334,68 @@ class CytoscapeWidget(DOMWidget):
                     ),
                 ]
             )
-        self._interaction_handlers[widget_type][event_type].register_callback(
-            callback, remove=remove
-        )
+        dispatcher = self._interaction_handlers[widget_type][event_type]
+        if callback in handlers:
+            dispatcher.register_callback(handlers.pop(callback)[1], remove=True)
+        if not remove:
+            handler = self._shaped_callback(callback, event_options["fields"], resolve)
+            dispatcher.register_callback(handler)
+            handlers[callback] = (event_options, handler)
+        self._merge_interaction_options(widget_type, event_type)
 
     on.__doc__ = on.__doc__ % (
         "\n            - ".join(MONITORED_USER_TYPES),
         "\n            - ".join(MONITORED_USER_INTERACTIONS),
     )
 
-    def _handle_interaction(self, _widget, content, _buffers):
+    def _merge_interaction_options(self, widget_type, event_type):
+        """
+        Sets the options of a widget and event type in _interaction_options
+        from the options of its callbacks: the frontend sends the fields
+        that any of them needs.
+        """
+        merged = dict()
+        handlers = self._callback_options[(widget_type, event_type)]
+        for options, _handler in handlers.values():
+            if options["throttle_ms"]:
+                merged["throttle_ms"] = options["throttle_ms"]
+                if options["coalesce"]:
+                    merged["coalesce"] = True
+        all_fields = [options["fields"] for options, _handler in handlers.values()]
+        if all_fields and None not in all_fields:
+            merged["fields"] = list(dict.fromkeys(chain.from_iterable(all_fields)))
+        options = {k: dict(v) for k, v in self._interaction_options.items()}
+        options.setdefault(widget_type, dict())[event_type] = merged
+        if not merged:
+            del options[widget_type][event_type]
+            if not options[widget_type]:
+                del options[widget_type]
+        self._interaction_options = options
+
+    def _shaped_callback(self, callback, fields, resolve):
+        """
+        Returns the handler of the events of a callback, which passes it
+        only the fields of the targets, or their widgets if resolve is true.
+        """
+        if fields is None:
+            return callback
+
+        def shape(target):
+            target = _event_payload(target, fields)
+            return self._resolve_target(target) if resolve else target
+
+        def handler(data):
+            # throttled events come in batches
+            if isinstance(data, list):
+                return callback([shape(target) for target in data])
+            return callback(shape(data))
+
+        return handler
+
+    def _handle_interaction(self, _widget, content, buffers):
+        if content.get("name") == "positions":
+            self._positions_received(buffers)
+            return
         handlers = self._interaction_handlers
         if (
             ("widget" in content)
@@ -945,7 +3403,35 @@ class CytoscapeWidget(DOMWidget):
             and (content["widget"] in handlers)
             and (content["event"] in handlers[content["widget"]])
         ):
-            handlers[content["widget"]][content["event"]](content["data"])
+            data = content["batch"] if "batch" in content else content["data"]
+            handlers[content["widget"]][content["event"]](data)
+
+    def _resolve_target(self, target):
+        """
+        Returns the Node or Edge widget of the graph with the id of the
+        target of an event, or target if there is none. The frontend sends
+        ids as strings, and edges without an id are found by their source
+        and target.
+        """
+        graph = self.graph
+        if not isinstance(graph, Graph):
+            return target
+        graph._materialize()
+        data = target.get("data", dict())
+        if "source" not in data:
+            node = _get_by_str(graph._node_index, data.get("id"))
+            return target if node is None else node.widget
+        edges = _get_by_str(graph._out_edges, data["source"], ())
+        edge_id = str(data.get("id"))
+        for edge in edges:
+            if "id" in edge.data and str(edge.data["id"]) == edge_id:
+                return edge.widget
+        # cytoscape gave the edge an id of its own
+        target_id = str(data.get("target"))
+        for edge in edges:
+            if "id" not in edge.data and str(edge.data["target"]) == target_id:
+                return edge.widget
+        return target
 
     def set_layout(self, **kwargs):
         """
@@ -984,6 +3470,96 @@ class CytoscapeWidget(DOMWidget):
         """
         self.send({"name": "layout"})
 
+    def set_positions(self, ids, xy):
+        """
+        Moves nodes to the given positions, e.g. computed by a layout in the
+        kernel. The positions are sent in a single message, as a binary
+        buffer, instead of in a message per node, and the frontend applies
+        them all at once. The layout runs from these positions when the
+        graph is displayed, set a "preset" layout to keep them as they are.
+        The position traits of the Node widgets are not changed.
+
+        Parameters
+        ----------
+        ids : array-like
+            Ids of the nodes to move.
+        xy : array-like of shape (len(ids), 2)
+            The x and y positions of the nodes.
+        """
+        if np is None:
+            raise ModuleNotFoundError(
+                "CytoscapeWidget.set_positions requires NumPy to be installed."
+            )
+        ids = _as_id_array(ids)
+        xy = np.asarray(xy, dtype="<f8")
+        if xy.shape != (len(ids), 2):
+            raise ValueError(
+                f"Expected positions of shape ({len(ids)}, 2), got {xy.shape}."
+            )
+        self._positions = {"ids": ids, "xy": xy.ravel()}
+
+    def get_positions(self):
+        """
+        Returns the positions of the nodes as rendered by the frontend, which
+        sends all of them in one binary message whenever a layout stops.
+        Positions of nodes moved since then by the user are not updated,
+        get_positions_async asks the frontend for the current ones.
+
+        Returns
+        -------
+        ids : numpy.ndarray
+            Ids of the nodes, empty if the graph hasn't been displayed.
+        xy : numpy.ndarray of shape (len(ids), 2)
+            The x and y positions of the nodes.
+        """
+        if np is None:
+            raise ModuleNotFoundError(
+                "CytoscapeWidget.get_positions requires NumPy to be installed."
+            )
+        if self._rendered_positions is None:
+            return np.array([], dtype=str), np.empty((0, 2))
+        return self._rendered_positions
+
+    async def get_positions_async(self):
+        """
+        Asks the frontend for the current positions of the nodes and returns
+        them once they are received, like get_positions.
+
+        The kernel only processes the reply once the current cell is done,
+        awaiting it in a cell would block forever. Run it as a task instead:
+
+        >>> task = asyncio.ensure_future(widget.get_positions_async())
+
+        and get ``task.result()`` in a later cell.
+        """
+        if np is None:
+            raise ModuleNotFoundError(
+                "CytoscapeWidget.get_positions_async requires NumPy to be installed."
+            )
+        future = asyncio.get_running_loop().create_future()
+        self._position_waiters.append(future)
+        self.send({"name": "get_positions"})
+        return await future
+
+    def _positions_received(self, buffers):
+        # sent whenever a layout stops, they can only be asked for with NumPy
+        if np is None:
+            return
+        offsets, text, xy = buffers
+        offsets = np.frombuffer(offsets, dtype="<u4").tolist()
+        text = bytes(text)
+        ids = np.array(
+            [text[start:end].decode() for start, end in zip(offsets, offsets[1:])],
+            dtype=str,
+        )
+        xy = np.frombuffer(xy, dtype="<f8").reshape(-1, 2).copy()
+        self._rendered_positions = (ids, xy)
+        waiters = self._position_waiters
+        self._position_waiters = list()
+        for future in waiters:
+            if not future.done():
+                future.set_result((ids, xy))
+
     def set_style(self, style):
         """
         Sets the layout of the current object. Change the parameters
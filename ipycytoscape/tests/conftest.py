@@ -9,6 +9,7 @@
 import pytest
 from ipykernel.comm import Comm
 from ipywidgets import Widget
+from ipywidgets import comm as widget_comm
 
 
 class MockComm(Comm):
@@ -44,6 +45,9 @@ undefined = object()
 def mock_comm():
     _widget_attrs["_comm_default"] = getattr(Widget, "_comm_default", undefined)
     Widget._comm_default = lambda self: MockComm()
+    # newer ipywidgets create their comms through ``ipywidgets.comm``
+    create_comm = getattr(widget_comm, "create_comm", undefined)
+    widget_comm.create_comm = lambda *args, **kwargs: MockComm(*args, **kwargs)
     _widget_attrs["_ipython_display_"] = Widget._ipython_display_
 
     def raise_not_implemented(*args, **kwargs):
@@ -57,3 +61,7 @@ def mock_comm():
             delattr(Widget, attr)
         else:
             setattr(Widget, attr, value)
+    if create_comm is undefined:
+        del widget_comm.create_comm
+    else:
+        widget_comm.create_comm = create_comm
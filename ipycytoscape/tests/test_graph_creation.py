@@ -7,9 +7,29 @@
 # The full license is in the file LICENSE, distributed with this software.
 
 
+import asyncio
+import datetime
+import io
+import json
+from decimal import Decimal
+
 import networkx as nx
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+import scipy.sparse
+from ipywidgets.widgets.widget import _remove_buffers
 
-from ipycytoscape.cytoscape import Edge, Graph, Node
+from ipycytoscape import cytoscape
+from ipycytoscape.cytoscape import (
+    ArrayGraph,
+    CytoscapeWidget,
+    Edge,
+    Graph,
+    Node,
+    register_serializer,
+)
 
 from ._util import compare_edges, compare_nodes
 
@@ -292,3 +312,1061 @@ class TestNetworkx:
         for expected, actual in zip(expected_nodes, graph.nodes):
             assert expected is actual
         compare_edges(expected_edges, graph.edges)
+
+    def test_processes(self):
+        G = nx.MultiDiGraph()
+        G.add_nodes_from(range(50), weight=1.5)
+        G.add_edges_from((i, (i * 7) % 50) for i in range(50))
+        G.add_edges_from((i, (i * 7) % 50) for i in range(0, 50, 5))
+
+        serial = Graph()
+        serial.add_graph_from_networkx(G)
+        pooled = Graph()
+        pooled.add_graph_from_networkx(G, processes=2)
+
+        compare_nodes(serial.nodes, pooled.nodes)
+        compare_edges(serial.edges, pooled.edges)
+        assert serial._adj == pooled._adj
+
+
+class TestJSON:
+    data = {
+        "directed": True,
+        "nodes": [
+            {"data": {"id": "0", "weight": 1.5}},
+            {"data": {"id": "1"}, "classes": "class1"},
+            {"data": {"id": "2"}, "position": {"x": 10, "y": 20}},
+        ],
+        "edges": [
+            {"data": {"source": "0", "target": "1"}},
+            {"data": {"source": "1", "target": "2", "weight": 123456789}},
+        ],
+    }
+
+    def test_streaming(self, tmp_path):
+        """
+        Test that parsing a file incrementally gives the same graph as
+        loading it at once, whatever the chunk size
+        """
+        json_file = tmp_path / "graph.json"
+        json_file.write_text(json.dumps(self.data, indent=4))
+        expected = Graph()
+        expected.add_graph_from_json(str(json_file))
+
+        for chunk_size in (1, 2, 100):
+            graph = Graph()
+            graph.add_graph_from_json(str(json_file), chunk_size=chunk_size)
+            compare_nodes(expected.nodes, graph.nodes)
+            compare_edges(expected.edges, graph.edges)
+            assert len(graph.nodes) == 3
+            assert len(graph.edges) == 2
+
+    def test_streaming_edges_first(self, tmp_path, monkeypatch):
+        """
+        Test that edges found before the nodes don't create the nodes
+        without their data, also when values span several reads
+        """
+        monkeypatch.setattr(cytoscape, "_JSON_READ_SIZE", 8)
+        json_file = tmp_path / "graph.json"
+        json_file.write_text(
+            json.dumps({"edges": self.data["edges"], "nodes": self.data["nodes"]})
+        )
+        graph = Graph()
+        graph.add_graph_from_json(str(json_file), chunk_size=1)
+
+        compare_nodes(
+            [Node(**node) for node in self.data["nodes"]],
+            graph.nodes,
+        )
+        assert len(graph.edges) == 2
+
+    def test_ndjson(self, tmp_path):
+        json_file = tmp_path / "graph.ndjson"
+        elements = self.data["nodes"] + [
+            {"group": "edges", **edge} for edge in self.data["edges"]
+        ]
+        json_file.write_text("\n".join(json.dumps(e) for e in elements) + "\n")
+        graph = Graph()
+        graph.add_graph_from_json(str(json_file), directed=True, chunk_size=2)
+
+        assert [node.data["id"] for node in graph.nodes] == ["0", "1", "2"]
+        compare_edges(
+            [
+                Edge(classes=" directed ", data={"source": "0", "target": "1"}),
+                Edge(
+                    classes=" directed ",
+                    data={"source": "1", "target": "2", "weight": 123456789},
+                ),
+            ],
+            graph.edges,
+        )
+
+    def test_ndjson_node_after_edge(self, tmp_path):
+        json_file = tmp_path / "graph.ndjson"
+        elements = [
+            {"data": {"id": "a"}},
+            {"group": "edges", "data": {"source": "a", "target": "b"}},
+            {"group": "nodes", "data": {"id": "b", "color": "red"}},
+            {"data": {"id": "a", "color": "blue"}},
+        ]
+        json_file.write_text("\n".join(json.dumps(e) for e in elements) + "\n")
+        graph = Graph()
+        graph.add_graph_from_json(str(json_file), chunk_size=1)
+
+        compare_nodes(
+            [
+                Node(data={"id": "a", "color": "blue"}),
+                Node(data={"id": "b", "color": "red"}),
+            ],
+            graph.nodes,
+        )
+        assert len(graph.edges) == 1
+
+
+class TestEdgeList:
+    def test_whitespace(self, tmp_path):
+        edgelist = tmp_path / "graph.edgelist"
+        edgelist.write_text("# a comment\na b\nb c  # inline\n\na b\nc a\n")
+        graph = Graph()
+        graph.add_graph_from_edgelist(edgelist)
+
+        assert [node.data["id"] for node in graph.nodes] == ["a", "b", "c"]
+        compare_edges(
+            [
+                Edge(data={"source": "a", "target": "b"}),
+                Edge(data={"source": "b", "target": "c"}),
+                Edge(data={"source": "c", "target": "a"}),
+            ],
+            graph.edges,
+        )
+        assert graph.edges[0].data["target"] is graph.edges[1].data["source"]
+
+    def test_csv(self, tmp_path):
+        edgelist = tmp_path / "graph.csv"
+        edgelist.write_text(
+            "from,to,weight,label\n0,1,0.5,first\n1,2,2,second\n0,1,1.5\n"
+        )
+        graph = Graph()
+        graph.add_graph_from_edgelist(
+            edgelist,
+            directed=True,
+            multiple_edges=True,
+            delimiter=",",
+            header=True,
+            chunk_size=1,
+        )
+
+        classes = " directed  multiple_edges "
+        compare_edges(
+            [
+                Edge(
+                    data={
+                        "source": "0",
+                        "target": "1",
+                        "weight": 0.5,
+                        "label": "first",
+                    },
+                    classes=classes,
+                ),
+                Edge(
+                    data={"source": "1", "target": "2", "weight": 2, "label": "second"},
+                    classes=classes,
+                ),
+                Edge(
+                    data={"source": "0", "target": "1", "weight": 1.5},
+                    classes=classes,
+                ),
+            ],
+            graph.edges,
+        )
+        assert graph._adj == {"0": {"1": 2}, "1": {"2": 1}, "2": {}}
+
+    def test_missing_target(self, tmp_path):
+        edgelist = tmp_path / "graph.edgelist"
+        edgelist.write_text("a b\nc\n")
+        with pytest.raises(ValueError):
+            Graph().add_graph_from_edgelist(edgelist)
+
+
+class FakeNeo4jNode(dict):
+    def __init__(self, identity, labels, **properties):
+        super().__init__(properties)
+        self.identity = identity
+        self.labels = labels
+
+
+class KNOWS(dict):
+    def __init__(self, identity, start_node, end_node, **properties):
+        super().__init__(properties)
+        self.identity = identity
+        self.start_node = start_node
+        self.end_node = end_node
+
+
+class FakeNeo4jDate:
+    """Stand-in for a Neo4j temporal value, which isn't a datetime."""
+
+    def __init__(self, text):
+        self.text = text
+
+    def iso_format(self):
+        return self.text
+
+
+class FakeNeo4jSubgraph:
+    def __init__(self, nodes, relationships):
+        self.nodes = nodes
+        self.relationships = relationships
+
+
+class FakeNeo4jRecord:
+    def __init__(self, *entities):
+        self.entities = entities
+
+    def to_subgraph(self):
+        nodes = list()
+        for rel in self.entities:
+            nodes.extend((rel.start_node, rel.end_node))
+        return FakeNeo4jSubgraph(nodes, list(self.entities))
+
+
+class TestNeo4j:
+    def people(self):
+        alice = FakeNeo4jNode(1, ["Person", "Actor"], name="Alice")
+        bob = FakeNeo4jNode(2, ["Person", "Director"], name="Bob", born=1970)
+        carol = FakeNeo4jNode(3, ["Person", "Actor"], name="Carol")
+        relationships = [
+            KNOWS(10, alice, bob, since=2001),
+            KNOWS(11, bob, carol),
+            KNOWS(12, alice, bob),
+        ]
+        return [alice, bob, carol], relationships
+
+    def test_subgraph(self):
+        nodes, relationships = self.people()
+        graph = Graph()
+        graph.add_graph_from_neo4j(FakeNeo4jSubgraph(nodes, relationships))
+
+        assert [node.data["label"] for node in graph.nodes] == [
+            "Actor",
+            "Director",
+            "Actor",
+        ]
+        assert graph.nodes[1].data == {
+            "id": 2,
+            "name": "Bob",
+            "born": 1970,
+            "tooltip": "Person,Director\nname:Bob\nborn:1970",
+            "label": "Director",
+        }
+        compare_edges(
+            [
+                Edge(
+                    data={"source": 1, "target": 2, "since": 2001, "name": "KNOWS"},
+                    classes=" directed  multiple_edges ",
+                ),
+                Edge(
+                    data={"source": 2, "target": 3, "name": "KNOWS"},
+                    classes=" directed  multiple_edges ",
+                ),
+                Edge(
+                    data={"source": 1, "target": 2, "name": "KNOWS"},
+                    classes=" directed  multiple_edges ",
+                ),
+            ],
+            graph.edges,
+        )
+        assert graph._adj[1] == {2: 2}
+
+    def test_cursor(self):
+        nodes, relationships = self.people()
+        subgraph = Graph()
+        subgraph.add_graph_from_neo4j(FakeNeo4jSubgraph(nodes, relationships))
+
+        # records share nodes and relationships, which are only added once
+        cursor = iter(
+            [
+                FakeNeo4jRecord(relationships[0]),
+                FakeNeo4jRecord(relationships[0], relationships[1]),
+                FakeNeo4jRecord(relationships[2]),
+            ]
+        )
+        paged = Graph()
+        paged.add_graph_from_neo4j(
+            cursor, chunk_size=1, label_ranks={"Actor": 0, "Director": 1}
+        )
+
+        compare_nodes(subgraph.nodes, paged.nodes)
+        compare_edges(subgraph.edges, paged.edges)
+        assert subgraph._adj == paged._adj
+
+    def test_types(self):
+        alice = FakeNeo4jNode(
+            1,
+            ["Person"],
+            born=FakeNeo4jDate("1970-01-01"),
+            score=Decimal("1.5"),
+            tags=["a", "b"],
+        )
+        graph = Graph()
+        graph.add_graph_from_neo4j(FakeNeo4jSubgraph([alice], []))
+
+        data = graph.nodes[0].data
+        assert data["born"] == "1970-01-01"
+        assert data["score"] == 1.5
+        assert data["tags"] == ["a", "b"]
+
+    def test_chunks_and_label_ranks(self):
+        nodes, relationships = self.people()
+        graph = Graph()
+        graph.add_graph_from_neo4j(
+            FakeNeo4jSubgraph(nodes, relationships),
+            chunk_size=2,
+            label_ranks={"Person": 0},
+        )
+
+        assert [node.data["label"] for node in graph.nodes] == ["Person"] * 3
+        assert len(graph.edges) == 3
+
+
+async def _aiter(elements, graph=None, sizes=None):
+    for element in elements:
+        if sizes is not None:
+            sizes.append(len(graph._pending_nodes) + len(graph._pending_edges))
+        yield element
+
+
+class TestAsyncIterable:
+    def test_elements(self):
+        elements = [
+            Node(data={"id": "a"}),
+            {"group": "nodes", "data": {"id": "b", "weight": 1}},
+            {"data": {"id": "c"}, "classes": "red"},
+            {"data": {"source": "a", "target": "b"}},
+            Edge(data={"source": "b", "target": "c"}),
+            {"group": "edges", "data": {"source": "c", "target": "d"}},
+        ]
+        graph = Graph()
+        asyncio.run(
+            graph.add_from_async_iterable(_aiter(elements), chunk_size=2, directed=True)
+        )
+
+        compare_nodes(
+            [
+                Node(data={"id": "a"}),
+                Node(data={"id": "b", "weight": 1}),
+                Node(data={"id": "c"}, classes="red"),
+                Node(data={"id": "d"}),
+            ],
+            graph.nodes,
+        )
+        compare_edges(
+            [
+                Edge(data={"source": "a", "target": "b"}, classes=" directed "),
+                Edge(data={"source": "b", "target": "c"}, classes=" directed "),
+                Edge(data={"source": "c", "target": "d"}, classes=" directed "),
+            ],
+            graph.edges,
+        )
+        assert "group" not in elements[1]["data"] and "group" in elements[1]
+
+    def test_flush_interval(self):
+        elements = [{"data": {"id": str(i)}} for i in range(6)]
+        # the elements are added to the graph as soon as they are received
+        graph = Graph()
+        sizes = list()
+        asyncio.run(
+            graph.add_from_async_iterable(
+                _aiter(elements, graph, sizes), flush_interval=0
+            )
+        )
+        assert sizes == [0, 1, 2, 3, 4, 5]
+        # or only at the end
+        graph = Graph()
+        sizes = list()
+        asyncio.run(
+            graph.add_from_async_iterable(
+                _aiter(elements, graph, sizes), flush_interval=60
+            )
+        )
+        assert sizes == [0] * 6
+        assert len(graph.nodes) == 6
+
+    def test_yields_to_event_loop(self):
+        ticks = list()
+
+        async def ticker():
+            while True:
+                ticks.append(len(ticks))
+                await asyncio.sleep(0)
+
+        async def main():
+            task = asyncio.ensure_future(ticker())
+            elements = ({"data": {"id": str(i)}} for i in range(100))
+            await Graph().add_from_async_iterable(
+                _aiter(elements), chunk_size=10, flush_interval=60
+            )
+            task.cancel()
+
+        asyncio.run(main())
+        # the ticker ran between the chunks, even though the source never
+        # gives control back to the event loop
+        assert len(ticks) >= 9
+
+
+GRAPHML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <key id="d0" for="node" attr.name="color" attr.type="string">
+    <default>yellow</default>
+  </key>
+  <key id="d1" for="edge" attr.name="weight" attr.type="double"/>
+  <key id="d2" for="all" attr.name="visible" attr.type="boolean"/>
+  <graph id="G" edgedefault="undirected">
+    <node id="n0"><data key="d0">green</data><data key="d2">true</data></node>
+    <node id="n1"/>
+    <node id="n2">
+      <graph id="n2:" edgedefault="directed">
+        <node id="n2::n0"/>
+      </graph>
+    </node>
+    <edge source="n0" target="n1"><data key="d1">1.5</data></edge>
+    <edge source="n1" target="n2" directed="true"/>
+    <edge source="n1" target="n0"/>
+  </graph>
+</graphml>
+"""
+
+
+class TestXML:
+    def test_graphml(self):
+        graph = Graph()
+        graph.add_graph_from_graphml(io.BytesIO(GRAPHML), chunk_size=2)
+
+        compare_nodes(
+            [
+                Node(data={"id": "n0", "color": "green", "visible": True}),
+                Node(data={"id": "n1", "color": "yellow"}),
+                Node(data={"id": "n2", "color": "yellow"}),
+                Node(data={"id": "n2::n0", "color": "yellow", "parent": "n2"}),
+            ],
+            graph.nodes,
+        )
+        # the last edge is the same as the first one in an undirected graph
+        compare_edges(
+            [
+                Edge(data={"source": "n0", "target": "n1", "weight": 1.5}),
+                Edge(data={"source": "n1", "target": "n2"}, classes=" directed "),
+            ],
+            graph.edges,
+        )
+
+    def test_gexf(self, tmp_path):
+        g = nx.DiGraph()
+        g.add_node(1, color="red", size=3, flag=True)
+        g.add_node(2, color="blue", size=4, viz={"position": {"x": 1.0, "y": 2.0}})
+        g.add_edge(1, 2, weight=2.5)
+        g.add_edge(2, 3)
+        nx.write_gexf(g, tmp_path / "graph.gexf")
+        graph = Graph()
+        graph.add_graph_from_gexf(tmp_path / "graph.gexf")
+
+        compare_nodes(
+            [
+                Node(
+                    data={
+                        "id": "1",
+                        "label": "1",
+                        "color": "red",
+                        "size": 3,
+                        "flag": True,
+                    }
+                ),
+                Node(
+                    data={"id": "2", "label": "2", "color": "blue", "size": 4},
+                    position={"x": 1.0, "y": 2.0},
+                ),
+                Node(data={"id": "3", "label": "3"}),
+            ],
+            graph.nodes,
+        )
+        compare_edges(
+            [
+                Edge(
+                    data={"source": "1", "target": "2", "weight": 2.5},
+                    classes=" directed ",
+                ),
+                Edge(data={"source": "2", "target": "3"}, classes=" directed "),
+            ],
+            graph.edges,
+        )
+        assert graph._adj == {"1": {"2": 1}, "2": {"3": 1}, "3": {}}
+
+    def test_graphml_node_after_edge(self):
+        graphml = b"""<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <key id="d0" for="node" attr.name="color" attr.type="string"/>
+  <graph edgedefault="undirected">
+    <node id="a"/>
+    <edge source="a" target="b"/>
+    <node id="b"><data key="d0">red</data></node>
+  </graph>
+</graphml>"""
+        graph = Graph()
+        graph.add_graph_from_graphml(io.BytesIO(graphml), chunk_size=1)
+
+        compare_nodes(
+            [Node(data={"id": "a"}), Node(data={"id": "b", "color": "red"})],
+            graph.nodes,
+        )
+        assert graph._adj == {"a": {"b": 1}, "b": {"a": 1}}
+
+    def test_parents_first(self):
+        graphml = b"""<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <key id="d0" for="node" attr.name="color" attr.type="string"/>
+  <graph edgedefault="undirected">
+    <node id="p">
+      <data key="d0">red</data>
+      <graph><node id="c"/></graph>
+    </node>
+  </graph>
+</graphml>"""
+        gexf = b"""<gexf xmlns="http://gexf.net/1.3" version="1.3">
+  <graph>
+    <nodes>
+      <node id="p" label="P"><nodes><node id="c" label="C"/></nodes></node>
+    </nodes>
+  </graph>
+</gexf>"""
+        graph = Graph()
+        graph.add_graph_from_graphml(io.BytesIO(graphml), chunk_size=1)
+        compare_nodes(
+            [
+                Node(data={"id": "p", "color": "red"}),
+                Node(data={"id": "c", "parent": "p"}),
+            ],
+            graph.nodes,
+        )
+
+        graph = Graph()
+        graph.add_graph_from_gexf(io.BytesIO(gexf))
+        compare_nodes(
+            [
+                Node(data={"id": "p", "label": "P"}),
+                Node(data={"id": "c", "label": "C", "parent": "p"}),
+            ],
+            graph.nodes,
+        )
+
+
+class TestPandas:
+    def test_groups_and_tooltips(self):
+        """
+        Test that every row becomes one node, child of the node of its group,
+        with the attributes of the row as its name
+        """
+        df = pd.DataFrame(
+            {
+                "robot": ["r2d2", "c3po", "wall-e"],
+                "universe": ["star wars", "star wars", "pixar"],
+                "cooleness_lvl": [10, 8, 9],
+            }
+        )
+        graph = Graph()
+        graph.add_graph_from_df(df, ["universe"], ["robot", "cooleness_lvl"])
+
+        expected_nodes = [
+            Node(data={"id": "parent-0", "name": ("pixar",)}),
+            Node(data={"id": "parent-1", "name": ("star wars",)}),
+            Node(
+                data={
+                    "id": 0,
+                    "parent": "parent-1",
+                    "name": "robot: r2d2\ncooleness_lvl: 10\n",
+                }
+            ),
+            Node(
+                data={
+                    "id": 1,
+                    "parent": "parent-1",
+                    "name": "robot: c3po\ncooleness_lvl: 8\n",
+                }
+            ),
+            Node(
+                data={
+                    "id": 2,
+                    "parent": "parent-0",
+                    "name": "robot: wall-e\ncooleness_lvl: 9\n",
+                }
+            ),
+        ]
+        assert len(graph.nodes) == len(expected_nodes)
+        compare_nodes(expected_nodes, graph.nodes)
+        compare_edges([], graph.edges)
+
+    def test_missing_group(self):
+        """
+        Test that rows with a missing group value are added without a parent
+        """
+        df = pd.DataFrame({"a": ["x", None], "b": [1, 2]})
+        graph = Graph()
+        graph.add_graph_from_df(df, ["a"], ["b"])
+
+        assert [node.data.get("parent") for node in graph.nodes] == [
+            None,
+            "parent-0",
+            None,
+        ]
+
+
+class TestArrow:
+    def tables(self):
+        nodes = pa.table(
+            {
+                "id": ["a", "b", "c"],
+                "classes": ["red", "", "blue"],
+                "weight": [1.5, 2.5, None],
+                "rank": pa.array([1, 2, 3], type=pa.int32()),
+            }
+        )
+        edges = pa.table(
+            {"source": ["a", "b", "c"], "target": ["b", "c", "d"], "label": ["x"] * 3}
+        )
+        return nodes, edges
+
+    def test_graph(self):
+        nodes, edges = self.tables()
+        graph = Graph()
+        graph.add_graph_from_arrow(nodes, edges, directed=True)
+
+        compare_nodes(
+            [
+                Node(data={"id": "a", "weight": 1.5, "rank": 1}, classes="red"),
+                Node(data={"id": "b", "weight": 2.5, "rank": 2}),
+                Node(data={"id": "c", "rank": 3}, classes="blue"),
+                Node(data={"id": "d"}),
+            ],
+            graph.nodes,
+        )
+        compare_edges(
+            [
+                Edge(
+                    data={"source": "a", "target": "b", "label": "x"},
+                    classes=" directed ",
+                ),
+                Edge(
+                    data={"source": "b", "target": "c", "label": "x"},
+                    classes=" directed ",
+                ),
+                Edge(
+                    data={"source": "c", "target": "d", "label": "x"},
+                    classes=" directed ",
+                ),
+            ],
+            graph.edges,
+        )
+
+    def test_graph_round_trip(self):
+        graph = Graph()
+        graph.add_graph_from_arrow(*self.tables())
+        graph.nodes[0].position = {"x": 1.0, "y": 2.0}
+
+        nodes, edges = graph.to_arrow()
+        assert nodes.column("rank").to_pylist() == [1, 2, 3, None]
+        assert nodes.column("position.x").to_pylist() == [1.0, None, None, None]
+        copy = Graph()
+        copy.add_graph_from_arrow(nodes, edges)
+        compare_nodes(graph.nodes, copy.nodes)
+        compare_edges(graph.edges, copy.edges)
+        assert copy._adj == graph._adj
+
+        # values of mixed types are stored as JSON
+        graph.nodes[1].data["rank"] = "second"
+        nodes, _edges = graph.to_arrow()
+        assert nodes.column("rank").to_pylist() == ["1", '"second"', "3", None]
+
+    def test_array_graph(self):
+        nodes, edges = self.tables()
+        graph = ArrayGraph.from_arrow(nodes, edges.slice(0, 2))
+
+        assert graph.node_ids.tolist() == ["a", "b", "c"]
+        assert graph.node_classes.tolist() == ["red", "", "blue"]
+        assert graph.node_data["rank"].dtype == np.int32
+        assert np.isnan(graph.node_data["weight"][2])
+        # numeric columns without nulls are views of the arrow buffers
+        assert np.shares_memory(
+            graph.node_data["rank"], nodes.column("rank").chunk(0).to_numpy()
+        )
+
+        nodes, edges = graph.to_arrow()
+        assert nodes.column("rank").type == pa.int32()
+        assert edges.column("source").to_pylist() == ["a", "b"]
+        assert edges.column("label").to_pylist() == ["x", "x"]
+
+
+class TestSparse:
+    def graph_from_edges(self, ids, edges, directed, multiple_edges):
+        graph = Graph()
+        graph.add_nodes([Node(data={"id": node_id}) for node_id in ids])
+        graph.add_edges(
+            [
+                Edge(data={"source": source, "target": target})
+                for source, target in edges
+            ],
+            directed,
+            multiple_edges,
+        )
+        return graph
+
+    @pytest.mark.parametrize("non_empty", [False, True])
+    def test_directed(self, non_empty):
+        matrix = scipy.sparse.csr_array([[0, 2, 0], [0, 0, 1], [1, 0, 1]])
+        graph = Graph()
+        if non_empty:
+            graph.add_node(Node(data={"id": "other"}))
+        graph.add_graph_from_sparse(matrix, ids=["a", "b", "c"], directed=True)
+
+        expected = self.graph_from_edges(
+            ["other", "a", "b", "c"] if non_empty else ["a", "b", "c"],
+            [("a", "b"), ("a", "b"), ("b", "c"), ("c", "a"), ("c", "c")],
+            directed=True,
+            multiple_edges=True,
+        )
+        compare_nodes(expected.nodes, graph.nodes)
+        compare_edges(expected.edges, graph.edges)
+        assert graph._adj == expected._adj
+        assert graph._radj == expected._radj
+
+    def test_undirected(self):
+        matrix = scipy.sparse.coo_array([[1, 1, 0], [1, 0, 1], [0, 1, 0]])
+        graph = Graph()
+        graph.add_graph_from_sparse(matrix)
+
+        expected = self.graph_from_edges(
+            ["0", "1", "2"],
+            [("0", "0"), ("0", "1"), ("1", "2")],
+            directed=False,
+            multiple_edges=False,
+        )
+        compare_nodes(expected.nodes, graph.nodes)
+        compare_edges(expected.edges, graph.edges)
+        assert graph._adj == expected._adj
+        assert graph._radj == expected._radj
+
+        graph.remove_edge(graph.edges[2])
+        assert graph._adj == {"0": {"0": 1, "1": 1}, "1": {"0": 1}, "2": {}}
+
+    def test_round_trip(self):
+        graph = self.graph_from_edges(
+            ["a", "b", "c"],
+            [("a", "b"), ("a", "b"), ("b", "c")],
+            directed=True,
+            multiple_edges=True,
+        )
+        graph.add_edge(Edge(data={"source": "c", "target": "a"}))
+
+        matrix, ids = graph.to_sparse()
+        assert ids.tolist() == ["a", "b", "c"]
+        assert matrix.toarray().tolist() == [[0, 2, 1], [0, 0, 1], [1, 0, 0]]
+
+        copy = Graph()
+        copy.add_graph_from_sparse(matrix, ids, directed=True)
+        assert copy._adj == graph._adj
+
+    def test_round_trip_self_loops(self):
+        """
+        Test that undirected self loops are counted once, including with
+        multiple edges, and that NumPy ids are synced as Python values
+        """
+        matrix = scipy.sparse.csr_array([[1, 2, 0], [2, 0, 0], [0, 0, 3]])
+        graph = Graph()
+        graph.add_graph_from_sparse(matrix, ids=np.arange(3))
+
+        assert [type(node.data["id"]) for node in graph.nodes] == [int] * 3
+        json.dumps([node.get_state() for node in graph.nodes])
+        result, ids = graph.to_sparse()
+        assert ids.tolist() == [0, 1, 2]
+        assert result.toarray().tolist() == matrix.toarray().tolist()
+
+        graph.remove_edge_by_id(2, 2)
+        assert graph._adj[2] == {}
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            Graph().add_graph_from_sparse(scipy.sparse.csr_array((2, 3)))
+        with pytest.raises(ValueError):
+            Graph().add_graph_from_sparse(scipy.sparse.csr_array([[0, -1], [0, 0]]))
+        with pytest.raises(ValueError):
+            Graph().add_graph_from_sparse(scipy.sparse.csr_array((2, 2)), ids=["a"])
+
+
+class TestExporters:
+    def graph(self):
+        graph = Graph()
+        graph.add_graph_from_json(
+            {
+                "nodes": [
+                    {"data": {"id": "a", "name": "first"}, "classes": "red"},
+                    {"data": {"id": "b"}, "position": {"x": 1.0, "y": 2.0}},
+                    {"data": {"id": "c", "name": "third"}},
+                ],
+                "edges": [
+                    {"data": {"source": "a", "target": "b", "weight": 2}},
+                    {"data": {"source": "b", "target": "c"}, "classes": "dashed"},
+                ],
+            },
+            directed=True,
+        )
+        return graph
+
+    def test_to_json(self):
+        graph = self.graph()
+        # user edits made on the widgets are exported
+        graph.nodes[2].position = {"x": 3.0, "y": 4.0}
+        graph.edges[0].classes += " bold"
+
+        elements = graph.to_json()
+        assert elements["nodes"] == [
+            {"data": {"id": "a", "name": "first"}, "classes": "red"},
+            {"data": {"id": "b"}, "position": {"x": 1.0, "y": 2.0}},
+            {"data": {"id": "c", "name": "third"}, "position": {"x": 3.0, "y": 4.0}},
+        ]
+        assert elements["edges"][0] == {
+            "data": {"source": "a", "target": "b", "weight": 2},
+            "classes": " directed  bold",
+        }
+        copy = Graph()
+        copy.add_graph_from_json(json.loads(json.dumps(elements)))
+        compare_nodes(graph.nodes, copy.nodes)
+        compare_edges(graph.edges, copy.edges)
+        assert copy._adj == graph._adj
+
+    def test_to_networkx(self):
+        graph = self.graph()
+        g = graph.to_networkx()
+
+        assert isinstance(g, nx.DiGraph) and not g.is_multigraph()
+        assert dict(g.nodes(data=True)) == {
+            "a": {"name": "first", "classes": "red"},
+            "b": {"position": {"x": 1.0, "y": 2.0}},
+            "c": {"name": "third"},
+        }
+        assert list(g.edges(data=True)) == [
+            ("a", "b", {"weight": 2, "classes": " directed "}),
+            ("b", "c", {"classes": "dashed directed "}),
+        ]
+        copy = Graph()
+        copy.add_graph_from_networkx(g)
+        compare_nodes(graph.nodes, copy.nodes)
+        compare_edges(graph.edges, copy.edges)
+        assert copy._adj == graph._adj
+
+        assert isinstance(
+            graph.to_networkx(directed=False, multiple_edges=True), nx.MultiGraph
+        )
+
+    def test_to_dataframe(self):
+        nodes, edges = self.graph().to_dataframe()
+
+        assert nodes["id"].tolist() == ["a", "b", "c"]
+        assert nodes["classes"].tolist() == ["red", "", ""]
+        assert nodes["position.x"].tolist()[1] == 1.0
+        assert nodes["name"].isna().tolist() == [False, True, False]
+        assert edges[["source", "target", "weight"]].values.tolist()[0] == ["a", "b", 2]
+
+
+class TestArrayGraph:
+    def test_columns(self):
+        """
+        Test that nodes and edges are stored as columns, including the
+        nodes implied by the edge endpoints
+        """
+        graph = ArrayGraph(["0", "1"], [0, 1], [1, 2], directed=True)
+
+        np.testing.assert_array_equal(graph.node_ids, ["0", "1", "2"])
+        np.testing.assert_array_equal(graph.node_classes, ["", "", ""])
+        np.testing.assert_array_equal(graph.edge_sources, ["0", "1"])
+        np.testing.assert_array_equal(graph.edge_targets, ["1", "2"])
+        np.testing.assert_array_equal(graph.edge_classes, ["directed", "directed"])
+
+    def test_data_columns(self):
+        graph = ArrayGraph()
+        graph.set_nodes(["a", "b"], data={"weight": [1, 2]})
+        graph.set_edges(["a"], ["c"], data={"label": ["a-c"]})
+
+        np.testing.assert_array_equal(graph.node_ids, ["a", "b", "c"])
+        np.testing.assert_array_equal(graph.node_data["weight"], [1, 2, np.nan])
+        np.testing.assert_array_equal(graph.edge_data["label"], ["a-c"])
+
+        with pytest.raises(ValueError):
+            graph.set_edges(["a", "b"], ["c"])
+
+    def test_binary_serialization(self):
+        """
+        Test that every column is sent as a binary buffer
+        """
+        graph = ArrayGraph(["α", "b"])
+        graph.set_nodes(graph.node_ids, data={"size": np.array([1.5, 2.5])})
+        state, buffer_paths, buffers = _remove_buffers(graph.get_state("_nodes"))
+
+        assert ["_nodes", "data", "size", "buffer"] in buffer_paths
+        assert state["_nodes"]["data"]["size"] == {"dtype": "float64"}
+        ids = buffers[buffer_paths.index(["_nodes", "id", "buffer"])]
+        offsets = buffers[buffer_paths.index(["_nodes", "id", "offsets"])]
+        assert bytes(ids).decode("utf-8") == "αb"
+        assert list(np.frombuffer(offsets, dtype="<u4")) == [0, 2, 3]
+
+    def test_widget(self):
+        graph = ArrayGraph(["a"])
+        assert CytoscapeWidget(graph).graph is graph
+        assert isinstance(CytoscapeWidget().graph, Graph)
+
+
+class TestSnapshot:
+    def test_round_trip(self, tmp_path):
+        graph = Graph()
+        graph.add_nodes(
+            [
+                Node(data={"id": 0, "weight": 1.5, "tags": ["a"]}, classes="big"),
+                Node(data={"id": 1, "label": "β"}, position={"x": 10.0, "y": 2.0}),
+            ]
+        )
+        graph.add_edges(
+            [
+                Edge(data={"source": 0, "target": 1, "count": 2}),
+                Edge(data={"source": 0, "target": 1}),
+                Edge(data={"source": 1, "target": 2}),
+            ],
+            directed=True,
+            multiple_edges=True,
+        )
+        graph.save(tmp_path / "graph.cyto")
+        loaded = Graph.load(tmp_path / "graph.cyto")
+
+        assert [node.data for node in loaded.nodes] == [
+            node.data for node in graph.nodes
+        ]
+        assert [node.classes for node in loaded.nodes] == ["big", "", ""]
+        assert loaded.nodes[1].position == {"x": 10.0, "y": 2.0}
+        assert loaded.nodes[0].position == {}
+        assert [edge.data for edge in loaded.edges] == [
+            edge.data for edge in graph.edges
+        ]
+        assert [edge.classes for edge in loaded.edges] == [
+            edge.classes for edge in graph.edges
+        ]
+        assert loaded._adj == graph._adj
+
+        loaded.remove_edge_by_id(0, 1)
+        assert loaded._adj[0] == {}
+
+    def test_indexes(self, tmp_path):
+        graph = Graph()
+        graph.add_graph_from_json(
+            {
+                "nodes": [{"data": {"id": "ä"}}, {"data": {"id": "b"}}],
+                "edges": [
+                    {"data": {"id": "e0", "source": "ä", "target": "b"}},
+                    {"data": {"source": "b", "target": "b"}},
+                ],
+            }
+        )
+        graph.save(tmp_path / "graph.cyto")
+        loaded = Graph.load(tmp_path / "graph.cyto")
+
+        assert loaded._adj == graph._adj == {"ä": {"b": 1}, "b": {"ä": 1, "b": 1}}
+        assert loaded._radj == graph._radj
+        assert loaded._edge_index == {"e0": loaded._edge_index["e0"]}
+        assert [
+            [edge.data["target"] for edge in loaded._out_edges[node_id]]
+            for node_id in ("ä", "b")
+        ] == [["b"], ["b"]]
+        assert list(loaded._in_edges) == ["b"]
+
+        loaded.remove_node_by_id("b")
+        assert loaded._adj == {"ä": {}}
+        assert loaded._out_edges == loaded._in_edges == loaded._edge_index == {}
+
+    def test_array_graph(self, tmp_path):
+        graph = ArrayGraph()
+        graph.set_nodes(["a", "b"], data={"weight": np.array([1.0, 2.0])})
+        graph.set_edges(["a"], ["b"], data={"label": ["a-b"]}, directed=True)
+        graph.save(tmp_path / "graph.cyto")
+        loaded = ArrayGraph.load(tmp_path / "graph.cyto")
+
+        # a read only view of the memory-mapped file, not a copy
+        assert not loaded.node_data["weight"].flags.writeable
+        np.testing.assert_array_equal(loaded.node_ids, ["a", "b"])
+        np.testing.assert_array_equal(loaded.node_data["weight"], [1.0, 2.0])
+        np.testing.assert_array_equal(loaded.edge_classes, ["directed"])
+        np.testing.assert_array_equal(loaded.edge_data["label"], ["a-b"])
+
+    def test_not_a_snapshot(self, tmp_path):
+        (tmp_path / "graph.json").write_text("{}")
+        with pytest.raises(ValueError):
+            Graph.load(tmp_path / "graph.json")
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class TestSerializers:
+    def test_importers(self):
+        values = {
+            "count": np.int64(3),
+            "flag": np.bool_(True),
+            "vector": np.arange(3),
+            "when": datetime.datetime(2020, 1, 2, 3, 4),
+            "day": np.datetime64("2020-01-02"),
+            "price": Decimal("2.5"),
+            "nested": {"weights": (np.float32(0.5),)},
+        }
+        expected = {
+            "count": 3,
+            "flag": True,
+            "vector": [0, 1, 2],
+            "when": "2020-01-02T03:04:00",
+            "day": "2020-01-02",
+            "price": 2.5,
+            "nested": {"weights": (0.5,)},
+        }
+
+        graph = Graph()
+        graph.add_graph_from_json({"nodes": [{"data": {"id": "a", **values}}]})
+        g = nx.Graph()
+        g.add_node("b", **values)
+        graph.add_graph_from_networkx(g)
+
+        for node in graph.nodes:
+            data = dict(node.data)
+            del data["id"]
+            assert data == expected
+            assert type(data["count"]) is int and type(data["flag"]) is bool
+            json.dumps(data)
+
+    def test_arrow(self):
+        graph = Graph()
+        graph.add_graph_from_arrow(
+            pa.table(
+                {
+                    "id": ["a"],
+                    "day": pa.array([datetime.date(2020, 1, 2)]),
+                    "price": pa.array([Decimal("2.50")]),
+                }
+            )
+        )
+
+        assert graph.nodes[0].data == {"id": "a", "day": "2020-01-02", "price": 2.5}
+
+    def test_register(self, monkeypatch):
+        monkeypatch.setattr(cytoscape, "_SERIALIZERS", dict(cytoscape._SERIALIZERS))
+        monkeypatch.setattr(cytoscape, "_serializer_cache", dict())
+        graph = Graph()
+        graph.add_graph_from_json({"nodes": [{"data": {"id": "a", "at": Point(1, 2)}}]})
+        # unknown types are converted to strings
+        assert isinstance(graph.nodes[0].data["at"], str)
+
+        register_serializer(Point, lambda point: [point.x, point.y])
+        graph.add_graph_from_json({"nodes": [{"data": {"id": "b", "at": Point(1, 2)}}]})
+        assert graph.nodes[1].data["at"] == [1, 2]
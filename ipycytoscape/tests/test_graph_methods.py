@@ -7,11 +7,18 @@
 # The full license is in the file LICENSE, distributed with this software.
 
 
+import asyncio
 import copy
+import gc
+import json
+import tracemalloc
 
+import networkx as nx
+import numpy as np
 import pytest
 
-from ipycytoscape.cytoscape import Edge, Graph, Node
+from ipycytoscape import cytoscape
+from ipycytoscape.cytoscape import CytoscapeWidget, Edge, Graph, Node
 
 from ._util import compare_edges, compare_nodes
 
@@ -213,6 +220,49 @@ class TestGraphRemoveMethods:
         compare_edges(expected_edges_multiple[1:], graph.edges)
         compare_nodes(expected_nodes[1:], graph.nodes)
 
+    def test_remove_keeps_indexes(self):
+        """
+        Test that the id and edge indexes follow removals, so that incoming
+        edges of a directed graph are found without scanning the graph
+        """
+        graph = Graph()
+        graph.add_edges(
+            [Edge(data={"source": str(i), "target": "hub"}) for i in range(5)],
+            directed=True,
+        )
+        graph.add_edge(Edge(data={"source": "hub", "target": "0"}), directed=True)
+
+        graph.remove_node_by_id("hub")
+        assert [edge.data for edge in graph.edges] == []
+        assert "hub" not in graph._node_index
+        assert graph._out_edges == {} and graph._in_edges == {}
+        assert graph._adj == {str(i): {} for i in range(5)}
+        assert graph._radj == {str(i): {} for i in range(5)}
+
+        with pytest.raises(ValueError):
+            graph.remove_node_by_id("hub")
+        with pytest.raises(ValueError):
+            graph.remove_edge_by_id("0", "1")
+
+    def test_remove_star_leaves(self):
+        """
+        Test that removing the leaves of a star only touches their own edge,
+        and leaves the edges of the hub to the other leaves indexed
+        """
+        graph = Graph()
+        graph.add_edges(
+            [Edge(data={"source": "hub", "target": str(i)}) for i in range(5)]
+        )
+        for i in range(3):
+            graph.remove_node_by_id(str(i))
+
+        remaining = [edge.data["target"] for edge in graph.edges]
+        assert remaining == ["3", "4"]
+        assert [edge.data["target"] for edge in graph._out_edges["hub"]] == remaining
+        assert list(graph._in_edges) == ["3", "4"]
+        assert graph._adj == {"hub": {"3": 1, "4": 1}, "3": {"hub": 1}, "4": {"hub": 1}}
+        assert graph._incident_edges("hub") == list(graph._out_edges["hub"])
+
 
 class TestGraphAddMethods:
     def test_add_nodes(self):
@@ -352,3 +402,660 @@ class TestGraphAddMethods:
         graph.add_edge(copy.copy(edge_inv), multiple_edges=True)
         compare_edges(expected_edges_multiple, graph.edges)
         compare_nodes(expected_nodes, graph.nodes)
+
+
+def _sent_messages(widget):
+    return [kwargs["data"] for _, kwargs in widget.comm.log_send]
+
+
+def _displayed_graph():
+    """A graph whose elements are synced as they are added, as when displayed"""
+    graph = Graph()
+    graph._handle_custom_msg({"name": "materialize"}, [])
+    graph.comm.log_send.clear()
+    return graph
+
+
+def _apply_adj_patches(adj, patches):
+    """Python version of GraphModel.applyAdjPatches in src/graph.ts"""
+    for op, *args in patches:
+        if op == "add":
+            adj[str(args[0])] = {}
+        elif op == "remove":
+            del adj[str(args[0])]
+        else:
+            source, target, delta = (str(args[0]), str(args[1]), args[2])
+            count = adj[source].get(target, 0) + delta
+            if count > 0:
+                adj[source][target] = count
+            else:
+                del adj[source][target]
+
+
+class TestGraphBatch:
+    def test_batch_sends_one_message(self, mock_comm):
+        """
+        Test that a batch of changes is sent to the frontend in a single
+        state update, followed by a single patch of the graph structure
+        """
+        graph = _displayed_graph()
+        with graph.batch():
+            graph.add_nodes([Node(data={"id": str(i)}) for i in range(10)])
+            for i in range(9):
+                graph.add_edge(Edge(data={"source": str(i), "target": str(i + 1)}))
+            graph.remove_node_by_id("0")
+
+        update, patch = _sent_messages(graph)
+        assert set(update["state"]) == {"nodes", "edges"}
+        assert len(update["state"]["nodes"]) == 9
+        assert len(update["state"]["edges"]) == 8
+        assert patch["method"] == "custom"
+        assert patch["content"]["name"] == "adj_patch"
+
+    def test_importers_send_one_message(self, mock_comm):
+        graph = _displayed_graph()
+        graph.add_graph_from_json(
+            {
+                "nodes": [{"data": {"id": "0"}}, {"data": {"id": "1"}}],
+                "edges": [{"data": {"source": "0", "target": "1"}}],
+            }
+        )
+        assert [msg["method"] for msg in _sent_messages(graph)] == [
+            "update",
+            "custom",
+        ]
+
+
+class TestAdjacencyPatches:
+    def test_patches_rebuild_adjacency(self, mock_comm):
+        """
+        Test that applying the patches reproduces _adj, including removals
+        and a clear which sends the whole dictionary again
+        """
+        graph = _displayed_graph()
+        adj = dict(graph._adj)
+        graph.add_edges(
+            [Edge(data={"source": "0", "target": "1"}) for _ in range(2)],
+            multiple_edges=True,
+        )
+        graph.add_edge(Edge(data={"source": "1", "target": "2"}), directed=True)
+        graph.remove_edge(graph.edges[0])
+        graph.remove_node_by_id("2")
+        for msg in _sent_messages(graph):
+            if msg["method"] == "custom":
+                _apply_adj_patches(adj, msg["content"]["patches"])
+        assert adj == graph._adj == {"0": {"1": 1}, "1": {"0": 1}}
+
+        graph.comm.log_send.clear()
+        with graph.batch():
+            graph.clear()
+            graph.add_edge(Edge(data={"source": "a", "target": "b"}))
+        (update,) = _sent_messages(graph)
+        assert update["state"]["_adj"] == {"a": {"b": 1}, "b": {"a": 1}}
+
+    def test_deferred_until_displayed(self, mock_comm):
+        """
+        Test that _adj isn't sent before a frontend displays the graph, and
+        is then sent whole
+        """
+        graph = Graph()
+        graph.comm.log_send.clear()
+        graph.add_edge(Edge(data={"source": "a", "target": "b"}))
+        graph.add_edge(Edge(data={"source": "b", "target": "c"}))
+        assert not any(
+            "_adj" in msg.get("state", {}) or msg["method"] == "custom"
+            for msg in _sent_messages(graph)
+        )
+
+        graph.comm.log_send.clear()
+        graph._handle_custom_msg({"name": "materialize"}, [])
+        (update, *_) = _sent_messages(graph)
+        assert update["state"]["_adj"] == graph._adj
+        assert graph._adj == {"a": {"b": 1}, "b": {"a": 1, "c": 1}, "c": {"b": 1}}
+
+    def test_bytes_sent_grow_linearly(self, mock_comm):
+        """
+        Test that building a 10k edges graph in many steps sends the graph
+        structure as patches instead of re-sending the whole of it each time
+        """
+        n_nodes = 1000
+        graph = _displayed_graph()
+        graph.comm.log_send.clear()
+        # bytes that re-sending the whole of _adj after every step would cost
+        full_sync_bytes = 0
+        # 10 steps of 1000 edges each, connecting every node to its k-th neighbour
+        for k in range(1, 11):
+            graph.add_edges(
+                [
+                    Edge(data={"source": str(i), "target": str((i + k) % n_nodes)})
+                    for i in range(n_nodes)
+                ]
+            )
+            full_sync_bytes += len(json.dumps(graph._adj))
+        assert len(graph.edges) == 10000
+
+        messages = _sent_messages(graph)
+        assert not any("_adj" in msg.get("state", {}) for msg in messages)
+        adj = {}
+        adj_bytes = 0
+        for msg in messages:
+            if msg["method"] == "custom":
+                adj_bytes += len(json.dumps(msg))
+                _apply_adj_patches(adj, msg["content"]["patches"])
+        assert adj == graph._adj
+        # two increments per undirected edge, plus the new nodes
+        assert adj_bytes / len(graph.edges) < 70
+        assert adj_bytes < full_sync_bytes / 1.5
+
+
+class TestLazyElements:
+    def test_importers_defer_widgets(self, mock_comm):
+        """
+        Test that importers create no widgets and send no state until the
+        elements are accessed, which then sends them in one update
+        """
+        graph = Graph()
+        graph.comm.log_send.clear()
+        graph.add_graph_from_networkx(nx.complete_graph(20))
+
+        assert not any(msg["method"] == "update" for msg in _sent_messages(graph))
+        for name in ("nodes", "edges"):
+            for element in graph._elements(name):
+                assert isinstance(element, cytoscape._ElementRecord)
+
+        assert len(graph.nodes) == 20
+        assert len(graph.edges) == 190
+        assert all(isinstance(node, Node) for node in graph.nodes)
+        assert graph._node_index["3"].widget is graph.nodes[3]
+        (update,) = [msg for msg in _sent_messages(graph) if msg["method"] == "update"]
+        assert set(update["state"]) == {"nodes", "edges"}
+
+    def test_remove_pending(self, mock_comm):
+        graph = Graph()
+        graph.add_graph_from_json(
+            {
+                "nodes": [{"data": {"id": i}} for i in "012"],
+                "edges": [{"data": {"source": "0", "target": "1"}}],
+            }
+        )
+        graph.remove_node_by_id("1")
+        assert all(
+            isinstance(node, cytoscape._ElementRecord)
+            for node in graph._elements("nodes")
+        )
+        assert [node.data["id"] for node in graph.nodes] == ["0", "2"]
+        assert len(graph.edges) == 0
+        assert graph._adj == {"0": {}, "2": {}}
+
+    def test_materialized_widgets_sync(self, mock_comm):
+        """
+        Test that widgets created from pending elements carry their state
+        from the start and sync later changes
+        """
+        graph = Graph()
+        graph.add_graph_from_json({"nodes": [{"data": {"id": "0"}, "classes": "a"}]})
+        (node,) = graph.nodes
+        assert node.classes == "a"
+
+        node.comm.log_send.clear()
+        node.data["label"] = "zero"
+        ((_, kwargs),) = node.comm.log_send
+        assert kwargs["data"]["content"]["set"] == {"label": "zero"}
+        assert graph._node_index["0"].data["label"] == "zero"
+
+    def test_displayed_graph(self, mock_comm):
+        """
+        Test that once the frontend asked for the elements, new ones are
+        materialized as soon as they are added
+        """
+        graph = Graph()
+        graph.add_node(Node(data={"id": "0"}))
+        graph._handle_custom_msg({"name": "materialize"}, [])
+        assert len(graph._trait_values["nodes"]) == 1
+
+        graph.add_graph_from_json({"nodes": [{"data": {"id": "1"}}]})
+        assert not graph._pending_nodes
+        assert len(graph._trait_values["nodes"]) == 2
+
+
+class TestElementRecords:
+    def test_memory_per_element(self):
+        """
+        Test that an imported graph stays within a fixed memory budget per
+        element, widgets take about 5 KB each
+        """
+        n_nodes = 5000
+        g = nx.path_graph(n_nodes)
+        graph = Graph()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            graph.add_graph_from_networkx(g)
+            gc.collect()
+            used = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        assert used / (2 * n_nodes - 1) < 1024
+
+    def test_widgets_are_views(self, mock_comm):
+        """
+        Test that changes made through the widgets are seen by the graph
+        """
+        graph = Graph()
+        graph.add_graph_from_json(
+            {"nodes": [], "edges": [{"data": {"source": "0", "target": "1"}}]},
+            directed=True,
+        )
+        (edge,) = graph.edges
+        edge.classes += " highlighted"
+        assert next(iter(graph._out_edges["0"])).classes == edge.classes
+
+        node = graph.nodes[0]
+        node.data = {"id": "0", "label": "zero"}
+        assert graph._node_index["0"].data["label"] == "zero"
+        graph.remove_node(node)
+        assert [node.data["id"] for node in graph.nodes] == ["1"]
+        assert len(graph.edges) == 0
+
+
+class TestUpsert:
+    def test_pending_elements(self):
+        graph = Graph()
+        graph.add_graph_from_json(
+            {
+                "nodes": [{"data": {"id": "0", "weight": 1}}, {"data": {"id": "1"}}],
+                "edges": [{"data": {"id": "e0", "source": "0", "target": "1"}}],
+            }
+        )
+        graph.upsert_nodes(
+            [
+                {"data": {"id": "0", "label": "zero"}, "classes": "red"},
+                {"data": {"id": "2"}},
+                {"data": {"id": "2", "label": "two"}},
+            ]
+        )
+        graph.upsert_edges(
+            [
+                {"data": {"id": "e0", "weight": 3}},
+                {"data": {"source": "1", "target": "2"}},
+            ]
+        )
+
+        compare_nodes(
+            [
+                Node(data={"id": "0", "weight": 1, "label": "zero"}, classes="red"),
+                Node(data={"id": "1"}),
+                Node(data={"id": "2", "label": "two"}),
+            ],
+            graph.nodes,
+        )
+        compare_edges(
+            [
+                Edge(data={"id": "e0", "source": "0", "target": "1", "weight": 3}),
+                Edge(data={"source": "1", "target": "2"}),
+            ],
+            graph.edges,
+        )
+        with pytest.raises(ValueError):
+            graph.upsert_edges([{"data": {"id": "e0", "source": "2"}}])
+
+    def test_edge_index(self):
+        """Test that the edge id index follows additions and removals"""
+        graph = Graph()
+        graph.add_graph_from_json(
+            {
+                "nodes": [{"data": {"id": "0"}}],
+                "edges": [
+                    {"data": {"id": "e0", "source": "0", "target": "1"}},
+                    {"data": {"source": "1", "target": "2"}},
+                ],
+            }
+        )
+        assert list(graph._edge_index) == ["e0"]
+
+        graph.remove_node_by_id("0")
+        assert graph._edge_index == {}
+        graph.upsert_edges([{"data": {"id": "e0", "source": "1", "target": "0"}}])
+        assert graph._edge_index["e0"].data["source"] == "1"
+        graph.clear()
+        assert graph._edge_index == {}
+
+    def test_single_delta(self, mock_comm):
+        """
+        Test that the changes of element widgets are sent in one message on
+        the graph, with only the changed keys, rather than by each widget
+        """
+        graph = _displayed_graph()
+        graph.add_nodes([Node(data={"id": str(i), "weight": i}) for i in range(3)])
+        for node in graph.nodes:
+            node.comm.log_send.clear()
+        graph.comm.log_send.clear()
+
+        graph.upsert_nodes(
+            [
+                {"data": {"id": "0", "weight": 0, "label": "zero"}},
+                {"data": {"id": "1"}, "classes": "red"},
+                {"data": {"id": "2", "weight": 2}},
+                {"data": {"id": "3"}},
+            ]
+        )
+
+        nodes = graph.nodes
+        assert all(not node.comm.log_send for node in nodes[:3])
+        assert nodes[0].data == {"id": "0", "weight": 0, "label": "zero"}
+        assert nodes[1].classes == "red"
+        assert graph._node_index["0"].data["label"] == "zero"
+        update, patch, deltas = _sent_messages(graph)
+        assert len(update["state"]["nodes"]) == 4
+        assert patch["content"]["name"] == "adj_patch"
+        assert deltas["content"] == {
+            "name": "element_deltas",
+            "deltas": [
+                [nodes[0].model_id, {"data": {"label": "zero"}}],
+                [nodes[1].model_id, {"classes": "red"}],
+            ],
+        }
+
+
+class TestDataPatch:
+    def test_changed_keys(self, mock_comm):
+        """
+        Test that changing keys of the data only sends the changed and
+        deleted keys, while observers are still notified
+        """
+        node = Node(data={"id": "0", "tooltip": "x" * 1000, "a": 1, "b": 2})
+        changes = list()
+        node.observe(changes.append, names="data")
+        node.comm.log_send.clear()
+
+        node.data.update(a=3, c=4)
+        del node.data["b"]
+
+        assert _sent_messages(node) == [
+            {
+                "method": "custom",
+                "content": {
+                    "name": "patch",
+                    "trait": "data",
+                    "set": {"a": 3, "c": 4},
+                    "unset": [],
+                },
+            },
+            {
+                "method": "custom",
+                "content": {
+                    "name": "patch",
+                    "trait": "data",
+                    "set": {},
+                    "unset": ["b"],
+                },
+            },
+        ]
+        assert len(changes) == 2
+        assert node.data == {"id": "0", "tooltip": "x" * 1000, "a": 3, "c": 4}
+
+    def test_whole_data(self, mock_comm):
+        """Test that assigning the data or holding the sync sends it whole"""
+        node = Node(data={"id": "0"})
+        node.comm.log_send.clear()
+
+        node.data = {"id": "0", "a": 1}
+        with node.hold_sync():
+            node.data["b"] = 2
+
+        # the logged states are the data itself, not copies of it
+        assert [message["state"].keys() for message in _sent_messages(node)] == [
+            {"data"},
+            {"data"},
+        ]
+        assert node.data == {"id": "0", "a": 1, "b": 2}
+
+    def test_replaced_data(self, mock_comm):
+        """Test that changing data that was replaced since sends nothing"""
+        node = Node(data={"id": "0"})
+        changes = list()
+        node.observe(changes.append, names="data")
+        old = node.data
+        node.data = {"id": "0", "a": 1}
+        node.comm.log_send.clear()
+
+        old["stale"] = 1
+
+        assert _sent_messages(node) == []
+        assert len(changes) == 1
+        assert node.data == {"id": "0", "a": 1}
+
+
+class TestPositions:
+    def test_one_binary_message(self, mock_comm):
+        graph = _displayed_graph()
+        graph.add_graph_from_json({"nodes": [{"data": {"id": i}} for i in range(3)]})
+        widget = CytoscapeWidget(graph)
+        widget.comm.log_send.clear()
+        xy = np.arange(6).reshape(3, 2)
+
+        widget.set_positions(np.arange(3), xy)
+
+        (kwargs,) = [kwargs for _, kwargs in widget.comm.log_send]
+        positions = kwargs["data"]["state"]["_positions"]
+        assert positions["ids"]["dtype"] == "str"
+        assert positions["xy"]["dtype"] == "float64"
+        assert len(kwargs["buffers"]) == 3
+        assert np.frombuffer(kwargs["buffers"][-1], "<f8").tolist() == list(range(6))
+        # the widgets aren't changed
+        assert all(not node.position for node in graph.nodes)
+
+    def test_shape(self):
+        widget = CytoscapeWidget()
+        with pytest.raises(ValueError):
+            widget.set_positions(["a", "b"], [[0, 0]])
+
+    def test_set_without_numpy(self, monkeypatch):
+        monkeypatch.setattr(cytoscape, "np", None)
+        widget = CytoscapeWidget()
+        with pytest.raises(ImportError, match="NumPy"):
+            widget.set_positions(["a"], [[0, 0]])
+        assert widget._positions == {}
+
+    def _reply(self, widget, ids, xy):
+        """Sends positions like CytoscapeView.sendPositions in src/widget.ts"""
+        encoded = [str(i).encode() for i in ids]
+        offsets = np.cumsum([0] + [len(i) for i in encoded], dtype="<u4")
+        widget._handle_custom_msg(
+            {"name": "positions"},
+            [
+                memoryview(offsets),
+                memoryview(b"".join(encoded)),
+                memoryview(np.asarray(xy, dtype="<f8")),
+            ],
+        )
+
+    def test_get_positions(self):
+        widget = CytoscapeWidget()
+        ids, xy = widget.get_positions()
+        assert ids.shape == (0,) and xy.shape == (0, 2)
+
+        self._reply(widget, ["a", "é"], [[1, 2], [3, 4]])
+        ids, xy = widget.get_positions()
+        assert ids.tolist() == ["a", "é"]
+        assert xy.tolist() == [[1, 2], [3, 4]]
+
+    def test_get_positions_async(self, mock_comm):
+        widget = CytoscapeWidget()
+        widget.comm.log_send.clear()
+
+        async def request():
+            task = asyncio.ensure_future(widget.get_positions_async())
+            await asyncio.sleep(0)
+            assert not task.done()
+            self._reply(widget, ["a"], [[1, 2]])
+            return await task
+
+        ids, xy = asyncio.run(request())
+        assert ids.tolist() == ["a"] and xy.tolist() == [[1, 2]]
+        assert _sent_messages(widget)[0]["content"] == {"name": "get_positions"}
+
+    def test_without_numpy(self, monkeypatch):
+        monkeypatch.setattr(cytoscape, "np", None)
+        widget = CytoscapeWidget()
+        # positions sent after a layout are ignored
+        self._reply(widget, ["a"], [[1, 2]])
+        assert widget._rendered_positions is None
+        with pytest.raises(ImportError, match="NumPy"):
+            widget.get_positions()
+        with pytest.raises(ImportError, match="NumPy"):
+            asyncio.run(widget.get_positions_async())
+
+
+class TestInteractions:
+    def test_throttle_options(self):
+        widget = CytoscapeWidget()
+        widget.on("node", "mousemove", print, throttle_ms=50, coalesce=True)
+        widget.on("node", "click", print)
+        assert widget._interaction_options == {
+            "node": {"mousemove": {"throttle_ms": 50, "coalesce": True}}
+        }
+
+        # callbacks are all called with batches of the same events
+        with pytest.raises(ValueError):
+            widget.on("node", "mousemove", repr)
+        with pytest.raises(ValueError):
+            widget.on("node", "mousemove", repr, throttle_ms=100, coalesce=True)
+        widget.on("node", "mousemove", print, throttle_ms=100)
+        assert widget._interaction_options == {
+            "node": {"mousemove": {"throttle_ms": 100}}
+        }
+
+        widget.on("node", "mousemove", print, remove=True)
+        widget.on("node", "click", print, remove=True)
+        assert widget._interaction_options == {}
+        widget.on("node", "mousemove", repr)
+
+    def test_fields(self):
+        """
+        Test that the frontend sends the fields of all the callbacks, and
+        that each callback gets the fields it asked for
+        """
+        widget = CytoscapeWidget()
+        full, slim, positions = list(), list(), list()
+        widget.on("node", "click", full.append)
+        widget.on("node", "click", slim.append, fields=["id"])
+        assert widget._interaction_options == {}
+
+        widget.on("node", "click", full.append, remove=True)
+        widget.on("node", "click", positions.append, fields=["id", "position"])
+        assert widget._interaction_options == {
+            "node": {"click": {"fields": ["id", "position"]}}
+        }
+        target = {"data": {"id": "a"}, "position": {"x": 1, "y": 2}}
+        widget._handle_custom_msg(
+            {"event": "click", "widget": "node", "data": target}, []
+        )
+        assert slim == [{"data": {"id": "a"}}]
+        assert positions == [target]
+        assert full == []
+
+    def test_batch(self):
+        widget = CytoscapeWidget()
+        received = list()
+        widget.on("node", "tapdrag", received.append, throttle_ms=50)
+
+        widget._handle_custom_msg(
+            {"event": "tapdrag", "widget": "node", "data": {"data": {"id": "a"}}},
+            [],
+        )
+        widget._handle_custom_msg(
+            {
+                "event": "tapdrag",
+                "widget": "node",
+                "batch": [{"data": {"id": "a"}}, {"data": {"id": "b"}}],
+            },
+            [],
+        )
+
+        assert received == [
+            {"data": {"id": "a"}},
+            [{"data": {"id": "a"}}, {"data": {"id": "b"}}],
+        ]
+
+    def test_resolve(self, mock_comm):
+        graph = _displayed_graph()
+        graph.add_graph_from_json(
+            {
+                "nodes": [{"data": {"id": "a"}}, {"data": {"id": "b"}}],
+                "edges": [{"data": {"id": "ab", "source": "a", "target": "b"}}],
+            }
+        )
+        widget = CytoscapeWidget(graph)
+        received = list()
+        widget.on("node", "tap", received.append, fields=["position"], resolve=True)
+        widget.on("edge", "tap", received.append, resolve=True)
+        assert widget._interaction_options["node"] == {
+            "tap": {"fields": ["position", "id", "source", "target"]}
+        }
+
+        for widget_type, data in [
+            ("node", {"id": "b"}),
+            ("edge", {"id": "ab", "source": "a"}),
+            ("node", {"id": "c"}),
+        ]:
+            widget._handle_custom_msg(
+                {"event": "tap", "widget": widget_type, "data": {"data": data}}, []
+            )
+
+        nodes, edges = graph.nodes, graph.edges
+        assert received[0] is nodes[1]
+        assert received[1] is edges[0]
+        assert received[2] == {"data": {"id": "c"}}
+
+    def test_resolve_one_callback(self, mock_comm):
+        """Test that resolving targets for a callback doesn't affect the others"""
+        graph = _displayed_graph()
+        graph.add_graph_from_json({"nodes": [{"data": {"id": "a"}}]})
+        widget = CytoscapeWidget(graph)
+        plain, resolved = list(), list()
+        widget.on("node", "tap", plain.append)
+        widget.on("node", "tap", resolved.append, resolve=True)
+        assert widget._interaction_options == {}
+
+        target = {"data": {"id": "a", "label": "A"}, "classes": ""}
+        widget._handle_custom_msg(
+            {"event": "tap", "widget": "node", "data": target}, []
+        )
+        assert plain == [target]
+        assert resolved == [graph.nodes[0]]
+
+    def test_resolve_int_ids(self, mock_comm):
+        graph = _displayed_graph()
+        graph.add_graph_from_json(
+            {
+                "nodes": [{"data": {"id": 1}}, {"data": {"id": 2}}],
+                "edges": [
+                    {"data": {"id": 12, "source": 1, "target": 2}},
+                    {"data": {"source": 2, "target": 1}},
+                ],
+            },
+            directed=True,
+        )
+        widget = CytoscapeWidget(graph)
+        received = list()
+        widget.on("node", "tap", received.append, resolve=True)
+        widget.on("edge", "tap", received.append, resolve=True)
+
+        # the ids as sent by the frontend, which gives id-less edges its own
+        for widget_type, data in [
+            ("node", {"id": "2"}),
+            ("edge", {"id": "12", "source": "1", "target": "2"}),
+            ("edge", {"id": "4ef0a3c1", "source": "2", "target": "1"}),
+            ("edge", {"id": "4ef0a3c1", "source": "1", "target": "1"}),
+        ]:
+            widget._handle_custom_msg(
+                {"event": "tap", "widget": widget_type, "data": {"data": data}}, []
+            )
+
+        nodes, edges = graph.nodes, graph.edges
+        assert received[0] is nodes[1]
+        assert received[1] is edges[0]
+        assert received[2] is edges[1]
+        assert received[3] == {"data": {"id": "4ef0a3c1", "source": "1", "target": "1"}}
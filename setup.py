@@ -66,7 +66,7 @@ setup_args = dict(
     version=version,
     scripts=glob(path.join("scripts", "*")),
     cmdclass=cmdclass,
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     author="Mariana Meireles",
     author_email="mariana.meireles@quantstack.net",
     url="https://github.com/cytoscape/ipycytoscape",
@@ -105,10 +105,13 @@ setup_args = dict(
             "nbclassic>=0.2.8",
             "nbval",
             "networkx",
+            "numpy",
             "pandas",
             "pre-commit",
+            "pyarrow",
             "pytest>4.6",
             "pytest-cov",
+            "scipy",
         ],
         "examples": [
             "pandas",
@@ -25,6 +25,28 @@ export class ElementModel extends WidgetModel {
       data: {},
     };
   }
+
+  initialize(attributes: any, options: any) {
+    super.initialize(attributes, options);
+    this.on('msg:custom', this.processMessage.bind(this));
+  }
+
+  /**
+   * Apply a patch of the changed and deleted keys of a dict attribute. The
+   * attribute is updated silently and the views apply the patch itself
+   * rather than the whole dict, see ElementView.
+   */
+  private processMessage(command: any) {
+    if (command.name === 'patch') {
+      const value = { ...this.get(command.trait), ...command.set };
+      for (const key of command.unset) {
+        delete value[key];
+      }
+      this.set(command.trait, value, { silent: true });
+      this.trigger(`patch:${command.trait}`, command);
+    }
+  }
+
   asCyObj() {
     return {
       data: this.get('data'),
@@ -113,9 +135,71 @@ export class GraphModel extends WidgetModel {
       _model_module_version: GraphModel.model_module_version,
       nodes: [],
       edges: [],
+      _adj: {},
     };
   }
 
+  initialize(attributes: any, options: any) {
+    super.initialize(attributes, options);
+    this.on('msg:custom', this.processMessage.bind(this));
+  }
+
+  private processMessage(command: any, buffers: any) {
+    if (command.name === 'adj_patch') {
+      this.applyAdjPatches(command.patches);
+    } else if (command.name === 'element_deltas') {
+      this.applyElementDeltas(command.deltas);
+    }
+  }
+
+  /**
+   * Update the nodes and edges changed by Graph.upsert_nodes/upsert_edges.
+   * Each delta holds the changed data keys and the other changed attributes
+   * of one element, whose Python side is already up to date.
+   */
+  async applyElementDeltas(deltas: any[]) {
+    const models = await Promise.all(
+      deltas.map(([modelId]) => this.widget_manager.get_model(modelId))
+    );
+    models.forEach((model, i) => {
+      if (!model) {
+        return;
+      }
+      const delta = deltas[i][1];
+      for (const name of Object.keys(delta)) {
+        if (name === 'data') {
+          model.set('data', { ...model.get('data'), ...delta.data });
+        } else {
+          model.set(name, delta[name]);
+        }
+      }
+    });
+  }
+
+  /**
+   * Update the adjacency dictionary in place, without receiving the whole
+   * of it again. See Graph._patch_adj for the format of the patches.
+   */
+  applyAdjPatches(patches: any[]) {
+    const adj = this.get('_adj');
+    for (const [op, ...args] of patches) {
+      if (op === 'add') {
+        adj[args[0]] = {};
+      } else if (op === 'remove') {
+        delete adj[args[0]];
+      } else if (op === 'increment') {
+        const [source, target, delta] = args;
+        const count = (adj[source][target] || 0) + delta;
+        if (count > 0) {
+          adj[source][target] = count;
+        } else {
+          delete adj[source][target];
+        }
+      }
+    }
+    this.trigger('change:_adj', this, adj);
+  }
+
   static serializers: ISerializers = {
     nodes: { deserialize: widgets.unpack_models },
     edges: { deserialize: widgets.unpack_models },
@@ -126,6 +210,116 @@ export class GraphModel extends WidgetModel {
   static model_module_version = MODULE_VERSION;
 }
 
+type Column = ArrayLike<number> | string[];
+
+interface IColumns {
+  [name: string]: Column | { [name: string]: Column };
+}
+
+const TYPED_ARRAYS: { [dtype: string]: any } = {
+  int8: Int8Array,
+  int16: Int16Array,
+  int32: Int32Array,
+  uint8: Uint8Array,
+  uint16: Uint16Array,
+  uint32: Uint32Array,
+  float32: Float32Array,
+  float64: Float64Array,
+  bool: Uint8Array,
+};
+
+function toTypedArray(view: DataView, ctor: any): any {
+  // copy when the buffer is not aligned for the element size
+  const buffer =
+    view.byteOffset % ctor.BYTES_PER_ELEMENT === 0
+      ? view.buffer
+      : view.buffer.slice(view.byteOffset, view.byteOffset + view.byteLength);
+  const offset = buffer === view.buffer ? view.byteOffset : 0;
+  return new ctor(buffer, offset, view.byteLength / ctor.BYTES_PER_ELEMENT);
+}
+
+export function deserializeColumn(value: any): Column {
+  if (value.dtype === 'str') {
+    const offsets = toTypedArray(value.offsets, Uint32Array);
+    const bytes = toTypedArray(value.buffer, Uint8Array);
+    const decoder = new TextDecoder();
+    const strings = new Array<string>(offsets.length - 1);
+    for (let i = 0; i < strings.length; i++) {
+      strings[i] = decoder.decode(bytes.subarray(offsets[i], offsets[i + 1]));
+    }
+    return strings;
+  }
+  return toTypedArray(value.buffer, TYPED_ARRAYS[value.dtype]);
+}
+
+export function deserializeColumns(value: any): IColumns {
+  const columns: IColumns = {};
+  for (const name of Object.keys(value || {})) {
+    if (name === 'data') {
+      const data: { [name: string]: Column } = {};
+      for (const key of Object.keys(value.data)) {
+        data[key] = deserializeColumn(value.data[key]);
+      }
+      columns.data = data;
+    } else {
+      columns[name] = deserializeColumn(value[name]);
+    }
+  }
+  return columns;
+}
+
+export class ArrayGraphModel extends WidgetModel {
+  defaults() {
+    return {
+      ...super.defaults(),
+      _model_name: 'ArrayGraphModel',
+      _model_module: ArrayGraphModel.model_module,
+      _model_module_version: ArrayGraphModel.model_module_version,
+      _nodes: {},
+      _edges: {},
+    };
+  }
+
+  /**
+   * Build the cytoscape.js element definitions out of the synced columns.
+   */
+  asCyObjs(): any[] {
+    const nodes = this.get('_nodes');
+    const edges = this.get('_edges');
+    const elements: any[] = [];
+    const build = (group: string, columns: any, keys: string[]) => {
+      if (!columns[keys[0]]) {
+        return;
+      }
+      const data = columns.data || {};
+      const names = Object.keys(data);
+      for (let i = 0; i < columns[keys[0]].length; i++) {
+        const ele: any = { group: group, data: {} };
+        for (const key of keys) {
+          ele.data[key] = columns[key][i];
+        }
+        for (const name of names) {
+          ele.data[name] = data[name][i];
+        }
+        ele.classes = columns.classes ? columns.classes[i] : '';
+        elements.push(ele);
+      }
+    };
+    build('nodes', nodes, ['id']);
+    build('edges', edges, ['source', 'target']);
+    return elements;
+  }
+
+  static serializers: ISerializers = {
+    _nodes: { deserialize: deserializeColumns },
+    _edges: { deserialize: deserializeColumns },
+    ...WidgetModel.serializers,
+  };
+
+  static model_module = MODULE_NAME;
+  static model_module_version = MODULE_VERSION;
+}
+
 export class ElementView extends WidgetView {
   cytoscapeView: CytoscapeView;
   protected elem: NodeSingular | EdgeSingular;
@@ -148,6 +342,12 @@ export class ElementView extends WidgetView {
     this.model.on('change:data', () => {
       this.elem.data(this.model.get('data'));
     });
+    this.model.on('patch:data', (patch: any) => {
+      this.elem.data(patch.set);
+      if (patch.unset.length) {
+        this.elem.removeData(patch.unset.join(' '));
+      }
+    });
     this.model.on('change:pannable', () => {
       // I think @types/cytoscape is missing panify and unpanify
       this.model.get('pannable')
@@ -35,7 +35,12 @@ import klay from 'cytoscape-klay';
 import 'tippy.js/themes/material.css';
 
 // eslint-disable-next-line @typescript-eslint/no-unused-vars
-import { NodeModel, EdgeModel } from './graph';
+import {
+  NodeModel,
+  EdgeModel,
+  ArrayGraphModel,
+  deserializeColumns,
+} from './graph';
 
 cytoscape.use(popper);
 cytoscape.use(dagre);
@@ -61,6 +66,8 @@ export class CytoscapeModel extends DOMWidgetModel {
       zoom: 0,
       rendered_position: {},
       tooltip_source: '',
+      _positions: {},
+      _interaction_options: {},
 
       graph: null,
     };
@@ -73,6 +80,7 @@ export class CytoscapeModel extends DOMWidgetModel {
 
   static serializers: ISerializers = {
     graph: { deserialize: widgets.unpack_models },
+    _positions: { deserialize: deserializeColumns },
     ...DOMWidgetModel.serializers,
   };
 
@@ -81,6 +89,10 @@ export class CytoscapeModel extends DOMWidgetModel {
       this.forEachView((view) => {
         view.cytoscape_obj.layout(this.get('cytoscape_layout')).run();
       });
+    } else if (command.name === 'get_positions') {
+      this.forEachView((view) => {
+        view.sendPositions();
+      });
     }
   }
 
@@ -107,6 +119,8 @@ export class CytoscapeView extends DOMWidgetView {
   nodeViews: any = [];
   edgeViews: any = [];
   monitored: any = {};
+  // throttled events waiting to be sent, by widget and event type
+  eventQueues: { [key: string]: Map<any, any> } = {};
 
   render() {
     this.el.classList.add('custom-widget');
@@ -114,29 +128,43 @@ export class CytoscapeView extends DOMWidgetView {
     this.displayed.then(() => {
       this.init_render();
       this.cytoscape_obj.startBatch();
-      this.nodeViews = new widgets.ViewList(
-        this.addNodeModel,
-        this.removeNodeView,
-        this
-      );
-      this.nodeViews.update(this.model.get('graph').get('nodes'));
-
-      this.edgeViews = new widgets.ViewList(
-        this.addEdgeModel,
-        this.removeEdgeView,
-        this
-      );
-      this.edgeViews.update(this.model.get('graph').get('edges'));
+      if (this.model.get('graph') instanceof ArrayGraphModel) {
+        this.cytoscape_obj.add(this.model.get('graph').asCyObjs());
+      } else {
+        // the kernel only creates the element widgets of large graphs once
+        // they are needed, ask for them now that the graph is displayed
+        this.model.get('graph').send({ name: 'materialize' }, {});
+        this.nodeViews = new widgets.ViewList(
+          this.addNodeModel,
+          this.removeNodeView,
+          this
+        );
+        this.nodeViews.update(this.model.get('graph').get('nodes'));
+
+        this.edgeViews = new widgets.ViewList(
+          this.addEdgeModel,
+          this.removeEdgeView,
+          this
+        );
+        this.edgeViews.update(this.model.get('graph').get('edges'));
+      }
       this.cytoscape_obj.endBatch();
+      this._updatePositions();
       this.cytoscape_obj
         .elements()
         .layout(this.model.get('cytoscape_layout'))
         .run();
     });
 
-    this.model
-      .get('graph')
-      .on_some_change(['nodes', 'edges'], this._updateViewLists, this);
+    if (this.model.get('graph') instanceof ArrayGraphModel) {
+      this.model
+        .get('graph')
+        .on_some_change(['_nodes', '_edges'], this._updateArrayGraph, this);
+    } else {
+      this.model
+        .get('graph')
+        .on_some_change(['nodes', 'edges'], this._updateViewLists, this);
+    }
 
     //Python attributes that must be sync. with frontend
     this.model.on('change:min_zoom', this._updateMinZoom, this);
@@ -166,6 +194,7 @@ export class CytoscapeView extends DOMWidgetView {
     this.model.on('change:auto_unselectify', this._updateAutoUnselectify, this);
     this.model.on('change:cytoscape_layout', this._updateLayout, this);
     this.model.on('change:cytoscape_style', this._updateStyle, this);
+    this.model.on('change:_positions', this._updatePositions, this);
     this.model.on('change:elements', this.value_changed, this);
     this.model.on('change:pixel_ratio', this.value_changed, this);
     this.model.on(
@@ -199,6 +228,17 @@ export class CytoscapeView extends DOMWidgetView {
     console.log('whole cytoscape relayout');
   }
 
+  private _updateArrayGraph() {
+    this.cytoscape_obj.batch(() => {
+      this.cytoscape_obj.elements().remove();
+      this.cytoscape_obj.add(this.model.get('graph').asCyObjs());
+    });
+    this.cytoscape_obj
+      .elements()
+      .layout(this.model.get('cytoscape_layout'))
+      .run();
+  }
+
   listenForUserEvents() {
     const new_monitored = this.model.get('_interaction_handlers');
     // If the plot hasn't been displayed yet, we can't add handlers yet. By
@@ -221,17 +261,78 @@ export class CytoscapeView extends DOMWidgetView {
             this.monitored[widgtype] = [evnttype];
           }
           this.cytoscape_obj.on(evnttype, widgtype, (e: any) => {
-            this.send({
-              event: evnttype,
-              widget: widgtype,
-              data: e.target.json(),
-            });
+            this.sendEvent(widgtype, evnttype, e.target);
           });
         }
       }
     }
   }
 
+  /**
+   * Send an interaction event to the kernel, or queue it when its type is
+   * throttled: the queued events are sent in a single message throttle_ms
+   * after the first one, keeping only the last event of each element if
+   * they are coalesced.
+   */
+  sendEvent(widget: string, event: string, target: any) {
+    const options = ((this.model.get('_interaction_options') || {})[widget] ||
+      {})[event];
+    // the fields asked by all the callbacks, which the kernel passes to
+    // each of them along with resolving their targets
+    const data = this.eventPayload(target, options && options.fields);
+    if (!options || !options.throttle_ms) {
+      this.send({ event: event, widget: widget, data: data });
+      return;
+    }
+    const key = `${widget}:${event}`;
+    if (!this.eventQueues[key]) {
+      const pending = new Map<any, any>();
+      this.eventQueues[key] = pending;
+      setTimeout(() => {
+        delete this.eventQueues[key];
+        this.send({
+          event: event,
+          widget: widget,
+          batch: Array.from(pending.values()),
+        });
+      }, options.throttle_ms);
+    }
+    const queue = this.eventQueues[key];
+    const id = options.coalesce ? target.id() : queue.size;
+    // a coalesced event replaces the previous one of its element, and moves
+    // after the others
+    queue.delete(id);
+    queue.set(id, data);
+  }
+
+  /**
+   * The JSON of the target of an event, or only the given fields of it,
+   * which are keys of the JSON or "data.<key>" for single data keys.
+   */
+  eventPayload(target: any, fields?: string[]): any {
+    if (!fields) {
+      return target.json();
+    }
+    const payload: any = {};
+    let json: any = null;
+    for (let field of fields) {
+      if (field === 'id' || field === 'source' || field === 'target') {
+        field = `data.${field}`;
+      }
+      if (field.startsWith('data.')) {
+        const key = field.slice('data.'.length);
+        payload.data = payload.data || {};
+        payload.data[key] = target.data(key);
+      } else if (field === 'position' && target.isNode()) {
+        payload.position = target.position();
+      } else {
+        json = json || target.json();
+        payload[field] = json[field];
+      }
+    }
+    return payload;
+  }
+
   init_render() {
     if (this.model.get('graph') !== null) {
       this.is_rendered = true;
@@ -266,6 +367,11 @@ export class CytoscapeView extends DOMWidgetView {
       // const monitored = this.model.get('monitored');
       this.listenForUserEvents();
 
+      // send the positions computed by layouts back to the kernel
+      this.cytoscape_obj.on('layoutstop', () => {
+        this.sendPositions();
+      });
+
       this.cytoscape_obj.on('click', (e: any) => {
         const node = e.target;
         const ref = node.popperRef();
@@ -345,6 +451,54 @@ export class CytoscapeView extends DOMWidgetView {
     this.cytoscape_obj.style(this.model.get('cytoscape_style'));
   }
 
+  /**
+   * Move the nodes to the positions set by set_positions in the kernel, in a
+   * single batch.
+   */
+  private _updatePositions() {
+    const positions = this.model.get('_positions');
+    if (!this.cytoscape_obj || !positions.ids) {
+      return;
+    }
+    const index = new Map<string, number>();
+    for (let i = 0; i < positions.ids.length; i++) {
+      index.set(positions.ids[i], i);
+    }
+    const xy = positions.xy;
+    // nodes for which no position is returned don't move
+    this.cytoscape_obj.nodes().positions(((node: cytoscape.NodeSingular) => {
+      const i = index.get(node.id());
+      return i === undefined ? undefined : { x: xy[2 * i], y: xy[2 * i + 1] };
+    }) as any);
+  }
+
+  /**
+   * Send the ids and positions of all the nodes to the kernel in a single
+   * message, as binary buffers: the utf-8 encoded ids with their offsets,
+   * and the flattened (x, y) positions.
+   */
+  sendPositions() {
+    if (!this.cytoscape_obj) {
+      return;
+    }
+    const nodes = this.cytoscape_obj.nodes();
+    const encoder = new TextEncoder();
+    const encoded = nodes.map((node) => encoder.encode(node.id()));
+    const offsets = new Uint32Array(encoded.length + 1);
+    for (let i = 0; i < encoded.length; i++) {
+      offsets[i + 1] = offsets[i] + encoded[i].length;
+    }
+    const ids = new Uint8Array(offsets[encoded.length]);
+    const xy = new Float64Array(2 * encoded.length);
+    nodes.forEach((node, i) => {
+      ids.set(encoded[i], offsets[i]);
+      const position = node.position();
+      xy[2 * i] = position.x;
+      xy[2 * i + 1] = position.y;
+    });
+    this.send({ name: 'positions' }, [offsets.buffer, ids.buffer, xy.buffer]);
+  }
+
   private _resize() {
     if (this.cytoscape_obj) {
       this.cytoscape_obj.resize();